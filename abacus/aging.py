@@ -0,0 +1,143 @@
+"""Aging of open receivable and payable items.
+
+Open items are taken from `SubLedger` (see `abacus.subledger`) or from
+dated entries to control account with counterparty dimension. Items
+are kept as columns sorted by due date, so for any as-of date the
+boundaries of every bucket are found with bisect, bucket totals come
+from prefix sums and counterparty rows from one pass over bucket
+slices, with no date arithmetic per item. Reports are cached by as-of
+date and bucket days.
+
+Example:
+
+```python
+aging = Aging.from_entries("ar", store.yield_entries(), by="customer")
+report = aging.report("2024-03-31")  # computed
+report = aging.report("2024-03-31")  # same object from cache
+report.totals  # [current, 1-30, 31-60, 61-90, 90+]
+print(report)
+```
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date as Date
+from itertools import accumulate
+from typing import ClassVar, Iterable
+
+from abacus.core import AbacusError, Amount, Entry, Statement
+from abacus.subledger import SubLedger
+
+__all__ = ["Aging", "AgingReport", "bucket_labels"]
+
+DAYS = (30, 60, 90)
+
+
+def bucket_labels(days: tuple[int, ...] = DAYS) -> list[str]:
+    """Bucket names like "current", "1-30", "31-60", "61-90", "90+"."""
+    if not days:
+        raise AbacusError("Days must not be empty.")
+    starts = (1,) + tuple(d + 1 for d in days[:-1])
+    return ["current"] + [f"{a}-{b}" for a, b in zip(starts, days)] + [f"{days[-1]}+"]
+
+
+@dataclass
+class AgingReport(Statement):
+    """Open amounts by counterparty and bucket of days past due date."""
+
+    as_of: str
+    days: tuple[int, ...]
+    rows: dict[str, list[Amount]]
+    totals: list[Amount]
+    default_header: ClassVar[str] = "Aging"
+
+    @property
+    def labels(self) -> list[str]:
+        return bucket_labels(self.days)
+
+    @property
+    def viewer(self):
+        from abacus.viewers import AgingViewer
+
+        return AgingViewer(self)
+
+    def total(self) -> Amount:
+        return sum(self.totals)
+
+    @property
+    def amount_fields(self) -> tuple[str, ...]:
+        return (*self.labels, "total")
+
+    def fields(self) -> tuple[str, ...]:
+        return ("counterparty", *self.amount_fields)
+
+    def records(self) -> Iterable[tuple]:
+        for name, buckets in self.rows.items():
+            yield (name, *buckets, sum(buckets))
+
+
+@dataclass
+class Aging:
+    """Open items as columns sorted by due date.
+
+    `due` holds day ordinals of due dates, `amounts` and `owners` hold
+    open amount and counterparty position in `counterparties` for the
+    same item.
+    """
+
+    counterparties: list[str] = field(default_factory=list)
+    due: list[int] = field(default_factory=list)
+    amounts: list[Amount] = field(default_factory=list)
+    owners: list[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._prefix = [0, *accumulate(self.amounts)]
+        self._reports: dict[tuple[str, tuple[int, ...]], AgingReport] = {}
+
+    @classmethod
+    def from_subledger(cls, subledger: SubLedger):
+        positions = {name: i for i, name in enumerate(subledger.items)}
+        items = sorted(
+            (Date.fromisoformat(item.due_date).toordinal(), item.amount, positions[c])
+            for c, item in subledger.all_open_items()
+        )
+        due, amounts, owners = map(list, zip(*items)) if items else ([], [], [])
+        return cls(list(positions), due, amounts, owners)
+
+    @classmethod
+    def from_entries(
+        cls, control: str, entries: Iterable[Entry], by: str, debit: bool = True
+    ):
+        """Match payments to invoices by counterparty in `by` dimension,
+        oldest first, and keep items that are not paid."""
+        return cls.from_subledger(SubLedger.from_entries(control, entries, by, debit))
+
+    def bounds(self, as_of: str, days: tuple[int, ...]) -> list[int]:
+        """Item positions where buckets start, from the oldest bucket
+        to current. Items due after as-of date are current."""
+        if not days or list(days) != sorted(set(days)) or days[0] <= 0:
+            raise AbacusError(f"Days must be positive and increasing, got {days}.")
+        end = Date.fromisoformat(as_of).toordinal()
+        # item is in bucket k if it is more than days[k-1] days past due
+        cutoffs = [end - d for d in reversed(days)] + [end]
+        return [0] + [bisect_left(self.due, c) for c in cutoffs] + [len(self.due)]
+
+    def report(self, as_of: str, days: tuple[int, ...] = DAYS) -> AgingReport:
+        key = (as_of, tuple(days))
+        if key not in self._reports:
+            self._reports[key] = self._compute(as_of, tuple(days))
+        return self._reports[key]
+
+    def _compute(self, as_of: str, days: tuple[int, ...]) -> AgingReport:
+        bounds = self.bounds(as_of, days)
+        n = len(days) + 2
+        prefix = self._prefix
+        # ranges from bounds are ordered from oldest to current bucket
+        ranges = list(zip(bounds, bounds[1:]))[::-1]
+        totals = [prefix[hi] - prefix[lo] for lo, hi in ranges]
+        rows = {name: [0] * n for name in self.counterparties}
+        names = self.counterparties
+        for k, (lo, hi) in enumerate(ranges):
+            for owner, amount in zip(self.owners[lo:hi], self.amounts[lo:hi]):
+                rows[names[owner]][k] += amount
+        return AgingReport(as_of, days, rows, totals)
@@ -0,0 +1,151 @@
+"""Budget and variance of actual amounts against budget.
+
+Budget holds planned changes of account balances by period, in the same
+format as `AccountBalances` JSON for each period:
+
+```json
+{"2024-01": {"sales": 1000.00, "rent": 250.00},
+ "2024-02": {"sales": 1200.00, "rent": 250.00}}
+```
+
+With `by` dimension, for example `by="cost_centre"`, budget has one more
+level of keys for dimension values: `{"shop": {"2024-01": {...}}, ...}`.
+
+Actual changes for all periods and dimension values are collected in one
+pass over entries, so the ledger is not rebuilt for every cost centre.
+"""
+
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import ClassVar, Iterable
+
+from abacus.core import (
+    AbacusError,
+    AccountBalances,
+    Amount,
+    Chart,
+    Entry,
+    Precision,
+    Statement,
+    account_signs,
+    add_signed,
+    month,
+)
+
+__all__ = ["Budget", "VarianceReport", "VarianceRow"]
+
+# budget key: dimension value (None without `by`) and period
+Key = tuple[str | None, str]
+
+
+@dataclass
+class Budget:
+    """Planned changes of account balances by dimension value and period."""
+
+    items: dict[Key, AccountBalances] = field(default_factory=dict)
+    by: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict, precision: Precision = Precision(), by=None):
+        items: dict[Key, AccountBalances]
+        if by is None:
+            items = {
+                (None, p): AccountBalances.from_decimals(b, precision)
+                for p, b in d.items()
+            }
+        else:
+            items = {
+                (group, p): AccountBalances.from_decimals(b, precision)
+                for group, periods in d.items()
+                for p, b in periods.items()
+            }
+        return cls(items, by)
+
+    @classmethod
+    def load(cls, path: Path | str, precision: Precision = Precision(), by=None):
+        """Load budget from JSON file where amounts are decimal values."""
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+            d = json.loads(text, parse_float=Decimal)
+            return cls.from_dict(d, precision, by)
+        except OSError as e:
+            raise AbacusError(f"Cannot read budget file {path}: {e.strerror}.")
+        except (AttributeError, TypeError, ValueError):
+            raise AbacusError(f"Cannot read budget from {path}.")
+
+
+@dataclass
+class VarianceRow:
+    group: str | None
+    period: str
+    account: str
+    budget: Amount
+    actual: Amount
+
+    @property
+    def variance(self) -> Amount:
+        return self.actual - self.budget
+
+
+@dataclass
+class VarianceReport(Statement):
+    """Budget, actual amount and variance by dimension value, period and account."""
+
+    rows: list[VarianceRow]
+    by: str | None = None
+    default_header: ClassVar[str] = "Budget variance"
+
+    @property
+    def viewer(self):
+        from abacus.viewers import VarianceViewer
+
+        return VarianceViewer(self)
+
+    @classmethod
+    def from_entries(
+        cls, chart: Chart, budget: Budget, entries: Iterable[Entry], period=month
+    ):
+        """Compare budget with actual changes of account balances from entries.
+        Entries to or from income summary account are closing entries
+        and are skipped."""
+        ledger = chart.ledger()
+        signs = account_signs(ledger)
+        for balances in budget.items.values():
+            for name in balances:
+                if name not in signs:
+                    raise AbacusError(f"Account {name} not in chart.")
+        isa = chart.income_summary_account
+        skip = {isa, chart.null_account}
+        by = budget.by
+        actual: dict[Key, dict[str, Amount]] = {}
+        for entry in entries:
+            if entry.debit == isa or entry.credit == isa:
+                continue
+            for name in (entry.debit, entry.credit):
+                if name not in signs:
+                    raise AbacusError(f"Account {name} not in chart.")
+            group = (entry.dimensions or {}).get(by) if by else None
+            add_signed(actual.setdefault((group, period(entry)), {}), (entry,))
+        rows = []
+        # periods with budget only, actual amounts outside budget are not compared
+        for key in sorted(budget.items, key=lambda k: (k[0] or "", k[1])):
+            planned = budget.items[key]
+            delta = actual.get(key, {})
+            names = list(planned) + [
+                n for n in delta if n not in planned and n not in skip and delta[n]
+            ]
+            for name in names:
+                fact = signs[name] * delta.get(name, 0)
+                rows.append(VarianceRow(*key, name, planned.get(name, 0), fact))
+        return cls(rows, by)
+
+    def fields(self) -> tuple[str, ...]:
+        names = ("period", "account", "budget", "actual", "variance")
+        return (self.by, *names) if self.by else names
+
+    def records(self) -> Iterable[tuple]:
+        for r in self.rows:
+            values = (r.period, r.account, r.budget, r.actual, r.variance)
+            yield (r.group, *values) if self.by else values
@@ -0,0 +1,154 @@
+"""Cash flow statement by direct and indirect method.
+
+`CashFlow` observes entries while they are posted to ledger,
+so the cash flow statement needs no extra pass over entries:
+
+```python
+cash_flow = CashFlow(chart, cash=["cash"], investing=["ppe"], financing=["loan"])
+ledger = chart.ledger().post_many(cash_flow.observe(entries))
+cash_flow.direct()  # cash received and paid by counterparty account
+cash_flow.indirect()  # current profit and changes in balance sheet accounts
+```
+
+Capital accounts are financing activities, other accounts are operating
+activities unless listed in `investing` or `financing`. Entries to or from
+income summary account are closing entries and are not observed.
+Cash received or paid in compound entries is shown against null account
+in direct method.
+"""
+
+from dataclasses import dataclass, field
+from typing import ClassVar, Iterable
+
+from abacus.core import (
+    AbacusError,
+    AccountBalances,
+    Amount,
+    Capital,
+    Chart,
+    ContraCapital,
+    ContraExpense,
+    ContraIncome,
+    Entry,
+    Expense,
+    Income,
+    Statement,
+)
+
+__all__ = ["CashFlow", "CashFlowStatement"]
+
+
+@dataclass
+class CashFlowStatement(Statement):
+    operating: AccountBalances
+    investing: AccountBalances
+    financing: AccountBalances
+    default_header: ClassVar[str] = "Cash flow statement"
+
+    @property
+    def viewer(self):
+        from abacus.viewers import CashFlowViewer
+
+        return CashFlowViewer(self)
+
+    def net_change(self) -> Amount:
+        return sum(
+            sum(section.values())
+            for section in (self.operating, self.investing, self.financing)
+        )
+
+
+@dataclass
+class CashFlow:
+    """Collect cash flows while entries are posted to ledger."""
+
+    chart: Chart
+    cash: list[str]
+    investing: list[str] = field(default_factory=list)
+    financing: list[str] = field(default_factory=list)
+    # cash received (positive) or paid (negative) by counterparty account
+    flows: dict[str, Amount] = field(default_factory=dict)
+    # debits are positive and credits are negative
+    changes: dict[str, Amount] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._ledger = self.chart.ledger()
+        for name in self.cash + self.investing + self.financing:
+            if name not in self._ledger:
+                raise AbacusError(f"Account {name} not in chart.")
+
+    def observe(self, entries: Iterable[Entry]) -> Iterable[Entry]:
+        """Yield `entries` unchanged, collecting cash flows on the way.
+
+        Cash flows of the batch are recorded after the last entry was
+        taken and only if all accounts are in chart, so a batch that
+        `Ledger.post_many` rejects leaves cash flows unchanged."""
+        isa = self.chart.income_summary_account
+        cash = set(self.cash)
+        known = self._ledger
+        flows: dict[str, Amount] = {}
+        changes: dict[str, Amount] = {}
+        valid = True
+        for entry in entries:
+            yield entry
+            dr, cr, amount = entry.debit, entry.credit, entry.amount
+            if dr not in known or cr not in known:
+                valid = False
+            if not valid or dr == isa or cr == isa:
+                continue
+            changes[dr] = changes.get(dr, 0) + amount
+            changes[cr] = changes.get(cr, 0) - amount
+            if dr in cash and cr not in cash:
+                flows[cr] = flows.get(cr, 0) + amount
+            elif cr in cash and dr not in cash:
+                flows[dr] = flows.get(dr, 0) - amount
+        if valid:
+            for target, delta in ((self.flows, flows), (self.changes, changes)):
+                for name, amount in delta.items():
+                    target[name] = target.get(name, 0) + amount
+
+    def section(self, name: str) -> str:
+        if name in self.investing:
+            return "investing"
+        if name in self.financing:
+            return "financing"
+        if isinstance(self._ledger[name], (Capital, ContraCapital)):
+            return "financing"
+        return "operating"
+
+    def _statement(self, items: Iterable[tuple[str, Amount]]) -> CashFlowStatement:
+        sections: dict[str, AccountBalances] = dict(
+            operating=AccountBalances(),
+            investing=AccountBalances(),
+            financing=AccountBalances(),
+        )
+        for name, amount in items:
+            sections[self.section(name)][name] = amount
+        return CashFlowStatement(**sections)
+
+    def direct(self) -> CashFlowStatement:
+        """Cash flows classified by counterparty account of cash postings."""
+        return self._statement(self.flows.items())
+
+    def is_profit_account(self, name: str) -> bool:
+        cls = (Income, Expense, ContraIncome, ContraExpense)
+        return isinstance(self._ledger[name], cls)
+
+    def current_profit(self) -> Amount:
+        return -sum(
+            amount
+            for name, amount in self.changes.items()
+            if self.is_profit_account(name)
+        )
+
+    def indirect(self) -> CashFlowStatement:
+        """Current profit adjusted by changes in non-cash balance sheet accounts."""
+        profit_line = [("current_profit", self.current_profit())]
+        items = [
+            (name, -amount)
+            for name, amount in self.changes.items()
+            if amount and name not in self.cash and not self.is_profit_account(name)
+        ]
+        statement = self._statement(items)
+        statement.operating = AccountBalances(dict(profit_line, **statement.operating))
+        return statement
@@ -0,0 +1,220 @@
+"""Consolidated statements for a group of entities.
+
+Each entity has its own chart and entries. Entity entries are summed into
+signed balances of group accounts, one entity per worker process, and
+only these condensed balances are sent back and merged. Intercompany
+balances are eliminated on the merged balances, and consolidated
+statements are made from condensed ledger, so closing runs once for
+the group and not for every entity.
+
+Example:
+
+```python
+group = Chart(assets=["cash", "due_from"], capital=["equity"], liabilities=["due_to"])
+consolidation = Consolidation(
+    group,
+    entities=[
+        Entity("parent", parent_chart, "parent.linejson"),
+        Entity("sub", sub_chart, "sub.linejson", mapping={"loan_from_parent": "due_to"}),
+    ],
+    eliminations=[Elimination("due_from", "due_to")],
+)
+result = consolidation.run(max_workers=8)
+result.balance_sheet, result.income_statement, result.unmatched
+```
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from abacus.core import (
+    AbacusError,
+    Amount,
+    BalanceSheet,
+    Chart,
+    Entry,
+    IncomeStatement,
+    Ledger,
+    Pipeline,
+    add_signed,
+    signed_ledger,
+)
+from abacus.entries_store import LineJSON
+
+__all__ = ["Consolidation", "ConsolidationResult", "Elimination", "Entity"]
+
+
+@dataclass
+class Entity:
+    """Entity with own chart and entries from store file or a list.
+
+    `mapping` renames entity accounts to group accounts, accounts not
+    in `mapping` keep their names. Several entity accounts may map to
+    the same group account.
+    """
+
+    name: str
+    chart: Chart
+    entries: Path | str | list[Entry]
+    mapping: dict[str, str] = field(default_factory=dict)
+
+    def yield_entries(self) -> Iterable[Entry]:
+        if isinstance(self.entries, list):
+            return self.entries
+        return LineJSON.load(self.entries).yield_entries()
+
+    def group_name(self, name: str) -> str:
+        return self.mapping.get(name, name)
+
+
+def entity_balances(entity: Entity) -> dict[str, Amount]:
+    """Signed balances of group accounts for `entity`, debits are positive.
+
+    Closing entries (to or from income summary account) are skipped,
+    so income and expense balances are kept for consolidated income
+    statement. Runs in worker process, returns group account balances
+    only.
+    """
+    chart = entity.chart
+    isa = chart.income_summary_account
+    known = set(chart.ledger().keys())
+    balances: dict[str, Amount] = {}
+    failed = []
+    for entry in entity.yield_entries():
+        if entry.debit == isa or entry.credit == isa:
+            continue
+        if entry.debit not in known or entry.credit not in known:
+            failed.append(entry)
+            continue
+        add_signed(balances, (entry,))
+    if failed:
+        raise AbacusError([f"Entity {entity.name}:", *failed])
+    result: dict[str, Amount] = {}
+    for name, amount in balances.items():
+        if name == chart.null_account:
+            continue
+        key = entity.group_name(name)
+        result[key] = result.get(key, 0) + amount
+    return result
+
+
+@dataclass
+class Elimination:
+    """Intercompany balances to eliminate against each other, for example
+    receivable and payable or intercompany sales and purchases.
+
+    One account must have debit balance and the other credit balance.
+    The smaller of the two balances is eliminated, the difference is
+    left in group accounts and reported as unmatched.
+    """
+
+    debit_account: str
+    credit_account: str
+    title: str = ""
+
+    def entry(self, balances: dict[str, Amount]) -> Entry | None:
+        """Eliminating entry for signed `balances` or None if nothing to eliminate."""
+        debit_balance = balances.get(self.debit_account, 0)
+        credit_balance = -balances.get(self.credit_account, 0)
+        amount = min(debit_balance, credit_balance)
+        if amount <= 0:
+            return None
+        return Entry(self.credit_account, self.debit_account, amount)
+
+    def difference(self, balances: dict[str, Amount]) -> Amount:
+        """Balance left after elimination, zero if intercompany balances match."""
+        return balances.get(self.debit_account, 0) + balances.get(
+            self.credit_account, 0
+        )
+
+
+@dataclass
+class ConsolidationResult:
+    chart: Chart
+    # signed balances of group accounts by entity, before eliminations
+    entities: dict[str, dict[str, Amount]]
+    eliminating_entries: list[Entry]
+    # elimination title or account pair and difference left after elimination
+    unmatched: dict[str, Amount]
+
+    def balances(self) -> dict[str, Amount]:
+        """Signed consolidated balances after eliminations."""
+        result: dict[str, Amount] = {}
+        for balances in self.entities.values():
+            for name, amount in balances.items():
+                result[name] = result.get(name, 0) + amount
+        return add_signed(result, self.eliminating_entries)
+
+    def ledger(self) -> Ledger:
+        """Condensed group ledger, balances are posted against null account
+        as debits, positive or negative."""
+        return signed_ledger(self.chart, self.balances())
+
+    @property
+    def balance_sheet(self) -> BalanceSheet:
+        return BalanceSheet.new(Pipeline(self.chart, self.ledger()).close().ledger)
+
+    @property
+    def income_statement(self) -> IncomeStatement:
+        ledger = Pipeline(self.chart, self.ledger()).close_first().ledger
+        return IncomeStatement.new(ledger)
+
+
+@dataclass
+class Consolidation:
+    chart: Chart
+    entities: list[Entity] = field(default_factory=list)
+    eliminations: list[Elimination] = field(default_factory=list)
+
+    def check_mapping(self):
+        """Raise AbacusError if an entity account maps to account not in group chart."""
+        group = set(self.chart.ledger().keys())
+        messages = []
+        for entity in self.entities:
+            skip = {entity.chart.income_summary_account, entity.chart.null_account}
+            for name in entity.chart.ledger().keys():
+                if name in skip:
+                    continue
+                if (key := entity.group_name(name)) not in group:
+                    messages.append(
+                        f"Entity {entity.name}: account {name} maps to {key}, "
+                        "not in group chart."
+                    )
+        if messages:
+            raise AbacusError(messages)
+
+    def entity_balances(self, max_workers: int | None = None):
+        """Balances by entity, computed in `max_workers` processes.
+        With `max_workers=1` entities are processed in this process."""
+        names = [entity.name for entity in self.entities]
+        if len(set(names)) != len(names):
+            raise AbacusError("Entity names must be unique.")
+        results: Iterator[dict[str, Amount]]
+        if max_workers == 1 or len(self.entities) < 2:
+            results = map(entity_balances, self.entities)
+            return dict(zip(names, results))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(entity_balances, self.entities)
+            return dict(zip(names, results))
+
+    def run(self, max_workers: int | None = None) -> ConsolidationResult:
+        self.check_mapping()
+        by_entity = self.entity_balances(max_workers)
+        merged: dict[str, Amount] = {}
+        for balances in by_entity.values():
+            for name, amount in balances.items():
+                merged[name] = merged.get(name, 0) + amount
+        entries = []
+        unmatched = {}
+        for rule in self.eliminations:
+            if entry := rule.entry(merged):
+                entries.append(entry)
+                # later rules see balances after this elimination
+                merged[entry.debit] += entry.amount
+                merged[entry.credit] -= entry.amount
+            if difference := rule.difference(merged):
+                label = rule.title or f"{rule.debit_account}/{rule.credit_account}"
+                unmatched[label] = difference
+        return ConsolidationResult(self.chart, by_entity, entries, unmatched)
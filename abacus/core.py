@@ -17,23 +17,31 @@ Implemented in this module:
 Assumptions and simplifications:
 
 1. no sub-accounts — there is only one level of account hierarchy in chart
+   (see `abacus.hierarchy` for sub-accounts with rolled up balances)
 2. account names must be globally unique
-3. no cashflow statement
-4. one currency
+3. no cashflow statement in core report
+   (see `abacus.cashflow` for direct and indirect method)
+4. one currency (see `abacus.currency` for multicurrency ledger)
 5. no checks for account non-negativity
+
+Amounts are integers in minor currency units (like cents).
+Use `Precision` to convert decimal values to amounts and back.
 """
 import json
 from abc import ABC, abstractmethod
 from collections import UserDict
-from copy import deepcopy
+from contextlib import contextmanager
+from copy import copy
 from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from enum import Enum
 from pathlib import Path
-from typing import ClassVar, Iterable, Type
+from typing import ClassVar, Container, Iterable, Type
 
 __all__ = [
     "AbacusError",
     "Amount",
+    "Precision",
     "Chart",
     "Entry",
     "T",
@@ -50,10 +58,55 @@ class AbacusError(Exception):
     """Custom error for this project."""
 
 
-# FIXME: can use decimal.Decimal
 Amount = int
 
 
+@dataclass(frozen=True)
+class Precision:
+    """Number of decimal places in amounts and rounding rule.
+
+    Amounts are kept as integers in minor units, so summation in ledger
+    stays integer arithmetic. Decimals are used only to read and write amounts.
+
+    Example:
+
+    ```python
+    Precision(2).to_amount("10.505") == 1051
+    Precision(2).format(1051) == "10.51"
+    ```
+    """
+
+    places: int = 0
+    rounding: str = ROUND_HALF_UP
+
+    def to_amount(self, value: Decimal | int | str | float) -> Amount:
+        """Convert decimal value to amount in minor units."""
+        if isinstance(value, int):
+            return value * 10**self.places
+        if isinstance(value, float):
+            value = str(value)
+        try:
+            d = Decimal(value).scaleb(self.places)
+            # nan and infinity are valid decimals, but not amounts
+            if d.is_finite():
+                return int(d.quantize(Decimal(1), rounding=self.rounding))
+        except InvalidOperation:
+            pass
+        raise AbacusError(f"Invalid amount: {value}")
+
+    def to_decimal(self, amount: Amount) -> Decimal:
+        """Convert amount in minor units to decimal value."""
+        return Decimal(amount).scaleb(-self.places)
+
+    def format(self, amount: Amount) -> str:
+        """Format amount in minor units as string with decimal places."""
+        if not self.places:
+            return str(amount)
+        units, cents = divmod(abs(amount), 10**self.places)
+        sign = "-" if amount < 0 else ""
+        return f"{sign}{units}.{cents:0{self.places}d}"
+
+
 class T(Enum):
     """Five types of accounts and standard prefixes for account names."""
 
@@ -313,6 +366,7 @@ class Chart:
     liabilities: list[str | Account] = field(default_factory=list)
     income: list[str | Account] = field(default_factory=list)
     expenses: list[str | Account] = field(default_factory=list)
+    precision: Precision = Precision()
 
     def __post_init__(self):
         self.validate()
@@ -364,7 +418,13 @@ class Chart:
 @dataclass
 class Entry:
     """Double entry with account name to be debited,
-       account name to be credited and transaction amount.
+       account name to be credited and transaction amount in minor units.
+
+    Optional `currency` is set for entries not in functional currency.
+    Optional `dimensions` are tags like cost centre or project
+    (see `abacus.cube` for balances by dimensions).
+    Optional `date` is ISO date string like "2024-01-31".
+    Optional fields are omitted in JSON when not set.
 
     Example:
 
@@ -376,9 +436,12 @@ class Entry:
     debit: str
     credit: str
     amount: Amount
+    currency: str | None = None
+    dimensions: dict[str, str] | None = None
+    date: str | None = None
 
     def to_json(self):
-        return json.dumps(self.__dict__)
+        return json.dumps({k: v for k, v in self.__dict__.items() if v is not None})
 
     @classmethod
     def from_string(cls, line: str):
@@ -394,22 +457,82 @@ class AccountBalances(UserDict[str, Amount]):
     def total(self):
         return sum(self.values())
 
-    def json(self):
-        return json.dumps(self.data, indent=4, ensure_ascii=False)
+    def json(self, precision: Precision = Precision(), indent: int | None = 4):
+        """Balances as JSON with decimal values, the format `load()` reads."""
+        items = [
+            f"{json.dumps(name, ensure_ascii=False)}: {precision.format(value)}"
+            for name, value in self.items()
+        ]
+        if indent is None or not items:
+            return "{" + ", ".join(items) + "}"
+        pad = " " * indent
+        return "{\n" + ",\n".join(pad + item for item in items) + "\n}"
+
+    def save(self, path: Path | str, precision: Precision = Precision()):
+        Path(path).write_text(self.json(precision), encoding="utf-8")
 
-    def save(self, path: Path | str):
-        Path(path).write_text(self.json(), encoding="utf-8")
+    @classmethod
+    def load(cls, path: Path | str, precision: Precision = Precision()):
+        """Load balances from JSON file where balances are decimal values."""
+        d = json.loads(Path(path).read_text(encoding="utf-8"), parse_float=Decimal)
+        return cls.from_decimals(d, precision)
 
     @classmethod
-    def load(cls, path: Path | str):
-        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+    def from_decimals(cls, d: dict, precision: Precision = Precision()):
+        """Convert balances from decimal values to minor units."""
+        return cls({name: precision.to_amount(value) for name, value in d.items()})
+
+    def to_decimals(self, precision: Precision) -> dict[str, Decimal]:
+        return {name: precision.to_decimal(value) for name, value in self.items()}
 
 
 def starting_entries(chart: Chart, balances: AccountBalances):
     return CompoundEntry.from_balances(chart, balances).to_entries(chart.null_account)
 
 
+@dataclass(eq=False)
+class Savepoint:
+    """Ledger state to return to with `Ledger.rollback()`.
+
+    For accounts changed, replaced or deleted after the savepoint was made
+    holds the account object before its first change, its number of debit
+    and credit postings and whether it was shared with other ledgers,
+    or None for accounts added after the savepoint. Accounts not changed
+    are not recorded, so a savepoint costs nothing for a large ledger.
+    """
+
+    accounts: dict[str, tuple[TAccount, int, int, bool] | None] = field(
+        default_factory=dict
+    )
+
+
 class Ledger(UserDict[str, TAccount]):
+    """Accounts by name.
+
+    Ledger may share accounts with its snapshots (see `snapshot()`),
+    so accounts should be changed through ledger methods like `post_many()`,
+    that copy a shared account before its first change.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # names of accounts shared with snapshots or parent ledger
+        self._shared: set[str] = set()
+        # savepoints that are not rolled back or released yet
+        self._savepoints: list[Savepoint] = []
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key: str, value: TAccount):
+        if self._savepoints:
+            self._record(key)
+        self._shared.discard(key)
+        self.data[key] = value
+
+    def __delitem__(self, key: str):
+        if self._savepoints:
+            self._record(key)
+        self._shared.discard(key)
+        del self.data[key]
+
     @classmethod
     def new(cls, chart: Chart, balances: AccountBalances | None):
         """Create a new ledger from chart, possibly using starting balances."""
@@ -429,18 +552,149 @@ class Ledger(UserDict[str, TAccount]):
         return self.post_many(entries=[entry])
 
     def post_many(self, entries: Iterable[Entry]):
-        """Post several double entries to ledger."""
+        """Post several double entries to ledger.
+
+        Posting is atomic: if any entry has an account not in ledger,
+        entries are still checked to the end to report all failed entries,
+        but ledger is returned to the state before the call.
+        """
+        data, shared = self.data, self._shared
+        # postings in accounts before their first change, to undo on failure
+        undo: dict[str, tuple[int, int]] = {}
         failed = []
         for entry in entries:
-            try:
-                self.data[entry.debit].debit(amount=entry.amount)
-                self.data[entry.credit].credit(amount=entry.amount)
-            except KeyError:
+            dr, cr = entry.debit, entry.credit
+            if dr not in data or cr not in data:
                 failed.append(entry)
+                continue
+            if failed:
+                continue
+            for name in (dr, cr):
+                if name not in undo:
+                    if self._savepoints:
+                        self._record(name)
+                    account = self._own(name) if shared else data[name]
+                    undo[name] = (len(account.debits), len(account.credits))
+            data[dr].debit(amount=entry.amount)
+            data[cr].credit(amount=entry.amount)
         if failed:
+            self.truncate(undo)
             raise AbacusError(failed)
         return self
 
+    def lengths(self) -> dict[str, tuple[int, int]]:
+        """Number of debit and credit postings in each account."""
+        return {
+            name: (len(account.debits), len(account.credits))
+            for name, account in self.data.items()
+        }
+
+    def truncate(self, lengths: dict[str, tuple[int, int]]):
+        """Remove postings made after `lengths` were taken."""
+        for name, (n_debits, n_credits) in lengths.items():
+            account = self.data[name]
+            if len(account.debits) == n_debits and len(account.credits) == n_credits:
+                continue
+            account = self._own(name)
+            del account.debits[n_debits:]
+            del account.credits[n_credits:]
+
+    def _own(self, name: str) -> TAccount:
+        """Copy account shared with other ledgers before changing it."""
+        if name in self._shared:
+            account = copy(self.data[name])
+            account.debits = list(account.debits)
+            account.credits = list(account.credits)
+            self.data[name] = account
+            self._shared.discard(name)
+        return self.data[name]
+
+    def snapshot(self):
+        """Return ledger that shares all accounts with this ledger.
+
+        Snapshot is cheap to create: only the dictionary of accounts
+        is copied. An account is copied when it is first changed in either
+        ledger, so changes to snapshot do not affect this ledger
+        and the other way round.
+        """
+        ledger = self.__class__()
+        ledger.data = dict(self.data)
+        ledger._shared = set(self.data)
+        self._shared = set(self.data)
+        return ledger
+
+    def _record(self, name: str):
+        """Record account state in active savepoints before its first change."""
+        account = self.data.get(name)
+        state = None
+        if account is not None:
+            shared = name in self._shared
+            state = (account, len(account.debits), len(account.credits), shared)
+        for savepoint in self._savepoints:
+            savepoint.accounts.setdefault(name, state)
+
+    def savepoint(self) -> Savepoint:
+        """Remember ledger state to return to with `rollback()`.
+        Accounts are recorded as they are changed until the savepoint
+        is rolled back or released with `release()`."""
+        savepoint = Savepoint()
+        self._savepoints.append(savepoint)
+        return savepoint
+
+    def release(self, savepoint: Savepoint):
+        """Stop recording changes for `savepoint`."""
+        if savepoint in self._savepoints:
+            self._savepoints.remove(savepoint)
+        return self
+
+    def rollback(self, savepoint: Savepoint):
+        """Return ledger to `savepoint`: postings made after it are removed,
+        accounts added after it are deleted, and accounts replaced or deleted
+        after it are put back."""
+        for name, state in savepoint.accounts.items():
+            current = self.data.pop(name, None)
+            in_place = current is not None and name not in self._shared
+            self._shared.discard(name)
+            if state is None:
+                continue
+            account, n_debits, n_credits, shared = state
+            if shared:
+                # shared account is copied before change, so it is not changed
+                self._shared.add(name)
+            elif account is current and in_place:
+                del account.debits[n_debits:]
+                del account.credits[n_credits:]
+            else:
+                # account may be shared with a snapshot made after savepoint
+                account = copy(account)
+                account.debits = account.debits[:n_debits]
+                account.credits = account.credits[:n_credits]
+            self.data[name] = account
+        return self.release(savepoint)
+
+    @contextmanager
+    def transaction(self):
+        """Post entries inside `with` block so that all are kept or none.
+        Transactions may be nested, a failed inner transaction is rolled back
+        to its start and the error is passed to outer block.
+
+        Example:
+
+        ```python
+        with ledger.transaction():
+            ledger.post_many(entries)
+            ledger.post("cash", "equity", 100)
+        ```
+        """
+        savepoint = self.savepoint()
+        try:
+            yield self
+        except BaseException:
+            self.rollback(savepoint)
+            raise
+        finally:
+            self.release(savepoint)
+
     @property
     def balances(self):
         """Return account balances."""
@@ -466,6 +720,56 @@ class Ledger(UserDict[str, TAccount]):
         )
 
 
+# Signed balances hold debit balances as positive and credit balances
+# as negative amounts, so balance changes from entries are just summed.
+
+PROFIT_TYPES = (Income, Expense, ContraIncome, ContraExpense)
+
+
+def account_signs(ledger: Ledger) -> dict[str, int]:
+    """Return 1 for debit accounts and -1 for credit accounts by account name.
+    Multiply signed balance by the sign to get account balance and back."""
+    return {
+        name: 1 if isinstance(account, DebitAccount) else -1
+        for name, account in ledger.items()
+    }
+
+
+def check_accounts(entries: list[Entry], accounts: Container[str]) -> None:
+    """Raise AbacusError with all entries that have an account not in
+    `accounts`. Called before a batch is applied, so it is applied whole
+    or not at all."""
+    failed = [e for e in entries if e.debit not in accounts or e.credit not in accounts]
+    if failed:
+        raise AbacusError(failed)
+
+
+def add_signed(
+    balances: dict[str, Amount], entries: Iterable[Entry]
+) -> dict[str, Amount]:
+    """Add entries to signed `balances` in place and return them."""
+    for entry in entries:
+        balances[entry.debit] = balances.get(entry.debit, 0) + entry.amount
+        balances[entry.credit] = balances.get(entry.credit, 0) - entry.amount
+    return balances
+
+
+def signed_ledger(
+    chart: Chart, balances: dict[str, Amount], ledger: Ledger | None = None
+) -> Ledger:
+    """Condensed ledger with signed `balances` posted against null account
+    as debits, positive or negative. Balances are posted to empty `ledger`
+    if given, or to new ledger from `chart`."""
+    null = chart.null_account
+    entries = [Entry(name, null, amount) for name, amount in balances.items() if amount]
+    return (ledger if ledger is not None else chart.ledger()).post_many(entries)
+
+
+def month(entry: Entry) -> str:
+    """Return month like "2024-01" for dated entry and empty string otherwise."""
+    return entry.date[:7] if entry.date else ""
+
+
 def contra_pairs(chart: Chart, contra_t: Type[ContraAccount]) -> list[tuple[str, str]]:
     """Return list of account and contra account name pairs for a given type of contra account."""
     attr = {
@@ -488,7 +792,7 @@ class Pipeline:
 
     def __init__(self, chart: Chart, ledger: Ledger):
         self.chart = chart
-        self.ledger = deepcopy(ledger)
+        self.ledger = ledger.snapshot()
         self.closing_entries: list[Entry] = []
 
     def append_and_post(self, entry: Entry):
@@ -595,7 +899,7 @@ class Report:
         tv = self.trial_balance.viewer
         bv = self.balance_sheet.viewer
         iv = self.income_statement.viewer
-        print_viewers(self.rename_dict, tv, bv, iv)
+        print_viewers(self.rename_dict, tv, bv, iv, self.chart.precision)
 
 
 class Statement(ABC):
@@ -0,0 +1,104 @@
+"""Account balances by entry dimensions like cost centre, project or region.
+
+`Cube` keeps one cell per account and combination of dimension values.
+Balances by some dimensions and statements filtered by dimension values
+are computed from the cells, there is no need to read entries again.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from abacus.core import (
+    AbacusError,
+    AccountBalances,
+    Amount,
+    Chart,
+    Entry,
+    Ledger,
+    account_signs,
+    check_accounts,
+)
+
+__all__ = ["Cube"]
+
+Key = tuple[str | None, ...]
+
+
+@dataclass
+class Cube:
+    """Aggregation of entries by account and dimension values.
+
+    Cells hold debit amounts as positive and credit amounts as negative values.
+    Entries without some dimension get `None` as the value of that dimension.
+
+    Example:
+
+    ```python
+    cube = Cube(chart, ("cost_centre", "region"))
+    cube.post_many(entries)
+    cube.balances(by=["cost_centre"])  # {("sales",): {...}, ("admin",): {...}}
+    cube.ledger(where={"region": "EU"})  # ledger to use in Report
+    ```
+    """
+
+    chart: Chart
+    dimensions: tuple[str, ...]
+    cells: dict[tuple[str, Key], Amount] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.dimensions = tuple(self.dimensions)
+        self._signs = account_signs(self.chart.ledger())
+
+    @classmethod
+    def from_entries(cls, chart: Chart, dimensions: Iterable[str], entries):
+        """Build cube from entries in one pass, for example from store
+        entries after new dimensions were added."""
+        return cls(chart, tuple(dimensions)).post_many(entries)
+
+    def key(self, entry: Entry) -> Key:
+        if not entry.dimensions:
+            return (None,) * len(self.dimensions)
+        return tuple(entry.dimensions.get(d) for d in self.dimensions)
+
+    def post_many(self, entries: Iterable[Entry]):
+        """Add entries to cells."""
+        entries = list(entries)
+        check_accounts(entries, self._signs)
+        cells = self.cells
+        for entry in entries:
+            key = self.key(entry)
+            dr, cr = (entry.debit, key), (entry.credit, key)
+            cells[dr] = cells.get(dr, 0) + entry.amount
+            cells[cr] = cells.get(cr, 0) - entry.amount
+        return self
+
+    def _positions(self, names: Iterable[str]) -> list[int]:
+        try:
+            return [self.dimensions.index(name) for name in names]
+        except ValueError:
+            raise AbacusError(f"Cube has dimensions {self.dimensions}, got {names}.")
+
+    def _select(self, where: dict[str, str] | None):
+        where = where or {}
+        conditions = list(zip(self._positions(where.keys()), where.values()))
+        for (name, key), amount in self.cells.items():
+            if all(key[i] == value for i, value in conditions):
+                yield name, key, amount
+
+    def balances(
+        self, by: Iterable[str] = (), where: dict[str, str] | None = None
+    ) -> dict[Key, AccountBalances]:
+        """Return account balances grouped by values of `by` dimensions,
+        using only cells that match `where` dimension values."""
+        positions = self._positions(by)
+        result: dict[Key, AccountBalances] = {}
+        for name, key, amount in self._select(where):
+            group = tuple(key[i] for i in positions)
+            balances = result.setdefault(group, AccountBalances())
+            balances[name] = balances.get(name, 0) + self._signs[name] * amount
+        return result
+
+    def ledger(self, where: dict[str, str] | None = None) -> Ledger:
+        """Return condensed ledger for entries that match `where` dimension values."""
+        balances = self.balances(where=where).get((), AccountBalances())
+        return Ledger.new(self.chart, balances)
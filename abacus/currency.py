@@ -0,0 +1,165 @@
+"""Multicurrency ledger and revaluation of balances to functional currency.
+
+Entries with `currency` set are posted to a separate ledger for that currency,
+entries without currency go to functional currency ledger.
+Revaluation translates balances of all accounts in all currencies
+to functional currency in one pass over (account, currency) balances
+and creates foreign exchange gain or loss entries for monetary accounts.
+
+Exchange rates are functional currency units per one unit of other currency.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
+
+from abacus.core import (
+    AbacusError,
+    AccountBalances,
+    Amount,
+    Asset,
+    Chart,
+    ContraAsset,
+    ContraLiability,
+    Entry,
+    Ledger,
+    Liability,
+    Precision,
+    account_signs,
+    check_accounts,
+)
+
+__all__ = ["MultiCurrencyLedger", "Revaluation"]
+
+Rates = dict[str, Decimal | str | int]
+
+
+@dataclass
+class Revaluation:
+    """Account balances translated to functional currency and
+    foreign exchange gain or loss entries.
+
+    Balances are translated at book rates, entries bring monetary accounts
+    to closing rates. Rounding difference is attributed to FX account.
+    """
+
+    balances: AccountBalances
+    entries: list[Entry]
+
+    def ledger(self, chart: Chart) -> Ledger:
+        """Create functional currency ledger to use for closing and reports."""
+        return Ledger.new(chart, self.balances).post_many(self.entries)
+
+
+@dataclass
+class MultiCurrencyLedger:
+    """Ledgers by currency for the same chart of accounts."""
+
+    chart: Chart
+    functional: str
+    ledgers: dict[str, Ledger] = field(default_factory=dict)
+    precisions: dict[str, Precision] = field(default_factory=dict)
+
+    def ledger(self, currency: str | None = None) -> Ledger:
+        currency = currency or self.functional
+        if currency not in self.ledgers:
+            self.ledgers[currency] = self.chart.ledger()
+        return self.ledgers[currency]
+
+    def precision(self, currency: str) -> Precision:
+        return self.precisions.get(currency, self.chart.precision)
+
+    def post_many(self, entries: Iterable[Entry]):
+        """Post entries to ledgers by entry currency."""
+        entries = list(entries)
+        # ledgers of all currencies have the same accounts
+        check_accounts(entries, self.ledger())
+        batches: dict[str, list[Entry]] = {}
+        for entry in entries:
+            batches.setdefault(entry.currency or self.functional, []).append(entry)
+        for currency, batch in batches.items():
+            self.ledger(currency).post_many(batch)
+        return self
+
+    def balances(self) -> dict[str, dict[str, Amount]]:
+        """Return nonzero balances by account and currency."""
+        result: dict[str, dict[str, Amount]] = {}
+        for currency, ledger in self.ledgers.items():
+            for name, balance in ledger.balances.nonzero().items():
+                result.setdefault(name, {})[currency] = balance
+        return result
+
+    def scale(self, rates: Rates, currency: str) -> Decimal:
+        """Return factor to translate amount in `currency` minor units
+        to functional currency minor units."""
+        if currency == self.functional:
+            return Decimal(1)
+        try:
+            rate = Decimal(rates[currency])
+        except KeyError:
+            raise AbacusError(f"No exchange rate for {currency}.")
+        places = self.precision(self.functional).places
+        return rate.scaleb(places - self.precision(currency).places)
+
+    def monetary_accounts(self) -> list[str]:
+        ledger = self.ledger()
+        return [
+            name
+            for cls in (Asset, ContraAsset, Liability, ContraLiability)
+            for name in ledger.subset(cls).keys()
+        ]
+
+    def revalue(
+        self,
+        rates: Rates,
+        fx_account: str,
+        book_rates: Rates | None = None,
+        monetary: Iterable[str] | None = None,
+    ) -> Revaluation:
+        """Translate balances to functional currency at `book_rates`
+        and revalue `monetary` accounts at closing `rates`.
+
+        Default book rates are closing rates, default monetary accounts
+        are assets and liabilities including contra accounts.
+        """
+        if book_rates is None:
+            book_rates = rates
+        if monetary is None:
+            monetary = self.monetary_accounts()
+        monetary = set(monetary)
+        base = self.ledger()
+        if fx_account not in base:
+            raise AbacusError(f"FX account {fx_account} not in chart.")
+        # debit balances are positive and credit balances are negative
+        sign = account_signs(base)
+        book: dict[str, Decimal] = {}
+        closing: dict[str, Decimal] = {}
+        for currency, ledger in self.ledgers.items():
+            book_scale = self.scale(book_rates, currency)
+            closing_scale = self.scale(rates, currency)
+            for name, balance in ledger.balances.items():
+                if not balance:
+                    continue
+                b = sign[name] * balance
+                book[name] = book.get(name, Decimal(0)) + b * book_scale
+                if name in monetary:
+                    closing[name] = closing.get(name, Decimal(0)) + b * closing_scale
+        rounding = self.precision(self.functional).rounding
+        book_amounts = {name: _round(x, rounding) for name, x in book.items()}
+        residual = sum(book_amounts.values())
+        book_amounts[fx_account] = book_amounts.get(fx_account, 0) - residual
+        entries = []
+        for name, x in closing.items():
+            diff = _round(x, rounding) - book_amounts[name]
+            if diff > 0:
+                entries.append(Entry(name, fx_account, diff))
+            elif diff < 0:
+                entries.append(Entry(fx_account, name, -diff))
+        balances = AccountBalances(
+            {name: sign[name] * amount for name, amount in book_amounts.items()}
+        )
+        return Revaluation(balances, entries)
+
+
+def _round(x: Decimal, rounding: str) -> Amount:
+    return int(x.quantize(Decimal(1), rounding=rounding))
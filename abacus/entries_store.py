@@ -1,12 +1,112 @@
 """Write and read accounting entries from a file."""
 
-from dataclasses import dataclass
+import csv
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, TextIO
 
-from abacus.core import Chart, Entry
+from abacus.core import AbacusError, Chart, Entry, Precision
 
-__all__ = ["LineJSON"]
+__all__ = ["LineJSON", "PostingIndex", "read_csv"]
+
+Span = tuple[int, int]
+
+
+def read_csv(file: TextIO, precision: Precision = Precision()) -> Iterable[Entry]:
+    """Yield entries from CSV file with debit, credit, amount
+    and optional date columns. Amounts are in major units like "10.50"."""
+    for i, row in enumerate(csv.DictReader(file), start=2):
+        try:
+            yield Entry(
+                debit=row["debit"].strip(),
+                credit=row["credit"].strip(),
+                amount=precision.to_amount(row["amount"].strip()),
+                date=row.get("date") or None,
+            )
+        except (KeyError, AttributeError, AbacusError):
+            raise AbacusError(f"Cannot read entry from line {i}: {row}")
+
+
+@dataclass
+class PostingIndex:
+    """Byte positions of store lines by account name.
+
+    Index file has a line per entry with start and end positions of the entry
+    in the store, debit and credit account names separated by tabs.
+    After every write a line like `#\t<size>\t<mtime_ns>` records the state
+    of the store. Index is appended together with the store and rebuilt
+    when the store was changed without the index, for example rewritten
+    outside abacus.
+    """
+
+    path: Path
+    spans: dict[str, list[Span]] = field(default_factory=dict)
+    end: int = 0
+    # size and modification time of store when index was last written
+    state: tuple[int, int] | None = None
+
+    def add(self, start: int, end: int, entry: Entry) -> str:
+        self.spans.setdefault(entry.debit, []).append((start, end))
+        if entry.credit != entry.debit:
+            self.spans.setdefault(entry.credit, []).append((start, end))
+        self.end = end
+        return f"{start}\t{end}\t{entry.debit}\t{entry.credit}\n"
+
+    def read(self) -> bool:
+        """Read index file, return False if the file is missing or inconsistent."""
+        self.spans, self.end, self.state = {}, 0, None
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.startswith("#"):
+                        _, size, mtime = line.rstrip("\n").split("\t")
+                        self.state = int(size), int(mtime)
+                        continue
+                    start, end, debit, credit = line.rstrip("\n").split("\t")
+                    if int(start) != self.end:
+                        return False
+                    self.add(int(start), int(end), Entry(debit, credit, 0))
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def update(self, store: "LineJSON"):
+        """Add store lines after index end to index."""
+        lines = []
+        with open(store.path, "rb") as file:
+            file.seek(self.end)
+            start = self.end
+            for line in file:
+                end = start + len(line)
+                entry = Entry.from_string(line.decode("utf-8"))
+                lines.append(self.add(start, end, entry))
+                start = end
+        lines.append(self.state_line(store))
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+        return self
+
+    def state_line(self, store: "LineJSON") -> str:
+        self.state = store.state()
+        return "#\t{}\t{}\n".format(*self.state)
+
+    @classmethod
+    def load(cls, store: "LineJSON") -> "PostingIndex":
+        """Load index for `store`, rebuild it if index does not match the store."""
+        index = cls(store.index_path)
+        state = store.state()
+        if not index.read() or index.state != state or index.end != state[0]:
+            index = cls.rebuild(store)
+        return index
+
+    @classmethod
+    def rebuild(cls, store: "LineJSON") -> "PostingIndex":
+        index = cls(store.index_path)
+        index.path.write_text("", encoding="utf-8")
+        return index.update(store)
+
+    def __getitem__(self, account_name: str) -> list[Span]:
+        return self.spans.get(account_name, [])
 
 
 @dataclass
@@ -25,10 +125,54 @@ class LineJSON:
     def _open(self, mode: str):
         return open(self.path, mode, newline="\n", encoding="utf-8")
 
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name("." + self.path.name + ".index")
+
+    @property
+    def reports_path(self) -> Path:
+        return self.path.with_name("." + self.path.name + ".reports")
+
+    def state(self) -> tuple[int, int]:
+        """Size and modification time of store file, they change on every append."""
+        stat = self.path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
     def append_many(self, entries: list[Entry]) -> None:
-        with self._open("a") as file:
+        """Append entries to store and to posting index, if index file exists."""
+        index = PostingIndex(self.index_path)
+        index_lines = []
+        with open(self.path, "ab") as file:
+            start = file.tell()
             for entry in entries:
-                file.write(entry.to_json() + "\n")
+                line = (entry.to_json() + "\n").encode("utf-8")
+                file.write(line)
+                index_lines.append(index.add(start, start + len(line), entry))
+                start += len(line)
+        if self.index_path.exists():
+            index_lines.append(index.state_line(self))
+            with open(self.index_path, "a", encoding="utf-8") as file:
+                file.writelines(index_lines)
+
+    def unlink(self):
+        """Delete store, posting index and report cache files."""
+        self.path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+        self.reports_path.unlink(missing_ok=True)
+
+    def index(self) -> PostingIndex:
+        return PostingIndex.load(self)
+
+    def yield_entries_at(self, spans: Iterable[Span]) -> Iterable[Entry]:
+        """Read entries at given positions in store."""
+        with open(self.path, "rb") as file:
+            for start, end in spans:
+                file.seek(start)
+                yield Entry.from_string(file.read(end - start).decode("utf-8"))
+
+    def yield_account_entries(self, account_name: str) -> Iterable[Entry]:
+        """Read entries that debit or credit `account_name` using posting index."""
+        return self.yield_entries_at(self.index()[account_name])
 
     def yield_entries(self) -> Iterable[Entry]:
         with self._open("r") as file:
@@ -0,0 +1,216 @@
+"""Write statements as JSON, CSV, Arrow IPC or Parquet without viewers.
+
+Statements are turned into flat records: trial balance rows are
+`(account, debit, credit)`, rows of other statements are
+`(section, account, amount)`. Records are written one by one
+(JSON, CSV) or in record batches (Arrow, Parquet), so large statements
+are not copied into intermediate tables.
+
+Amounts are written in major units with chart precision, for example
+`10.50` for 1050 minor units and `Precision(2)`.
+
+Arrow and Parquet formats need `pyarrow` package (`pip install pyarrow`).
+"""
+
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Mapping, TextIO
+
+from abacus.core import (
+    AbacusError,
+    Amount,
+    BalanceSheet,
+    IncomeStatement,
+    Precision,
+    Statement,
+    TrialBalance,
+)
+
+__all__ = ["FORMATS", "fields", "records", "write", "write_json", "write_csv"]
+
+FORMATS = ("json", "csv", "arrow", "parquet")
+
+# columns written as amounts, other columns are strings
+AMOUNT_FIELDS = ("amount", "debit", "credit", "budget", "actual", "variance")
+
+# rows in one Arrow record batch
+BATCH_SIZE = 65_536
+
+
+def sections(statement: Statement) -> Mapping[str, Mapping[str, Amount]]:
+    match statement:
+        case BalanceSheet():
+            return dict(
+                assets=statement.assets,
+                capital=statement.capital,
+                liabilities=statement.liabilities,
+            )
+        case IncomeStatement():
+            return dict(income=statement.income, expenses=statement.expenses)
+        case _:
+            # CashFlowStatement and other statements with `viewer.to_dict()`
+            try:
+                return statement.viewer.to_dict()
+            except AttributeError:
+                raise AbacusError(f"Cannot export {type(statement).__name__}.")
+
+
+def fields(statement: Statement) -> tuple[str, ...]:
+    """Return column names of `records(statement)`."""
+    if hasattr(statement, "fields"):
+        return statement.fields()  # type: ignore
+    if isinstance(statement, TrialBalance):
+        return ("account", "debit", "credit")
+    return ("section", "account", "amount")
+
+
+def records(statement: Statement) -> Iterator[tuple]:
+    """Yield statement rows with amounts in minor units."""
+    if hasattr(statement, "records"):
+        yield from statement.records()  # type: ignore
+        return
+    if isinstance(statement, TrialBalance):
+        for name, (debit, credit) in statement.items():
+            yield name, debit, credit
+        return
+    for section, balances in sections(statement).items():
+        for name, amount in balances.items():
+            yield section, name, amount
+
+
+def write_json(
+    statement: Statement, stream: TextIO, precision: Precision = Precision()
+):
+    """Write statement as JSON object, for example
+    `{"assets": {"cash": 10.50}, ...}` or `{"cash": [10.50, 0], ...}`
+    for trial balance."""
+    fmt = precision.format
+    if hasattr(statement, "records"):
+        return write_json_records(statement, stream, precision)
+    stream.write("{")
+    if isinstance(statement, TrialBalance):
+        for i, (name, (debit, credit)) in enumerate(statement.items()):
+            comma = ", " if i else ""
+            stream.write(f"{comma}{json.dumps(name)}: [{fmt(debit)}, {fmt(credit)}]")
+    else:
+        for i, (section, balances) in enumerate(sections(statement).items()):
+            stream.write(f'{", " if i else ""}{json.dumps(section)}: {{')
+            for j, (name, amount) in enumerate(balances.items()):
+                stream.write(f'{", " if j else ""}{json.dumps(name)}: {fmt(amount)}')
+            stream.write("}")
+    stream.write("}\n")
+
+
+def write_json_records(statement, stream: TextIO, precision: Precision):
+    """Write statement with own `records()` as JSON list of objects."""
+    names = [json.dumps(name) for name in fields(statement)]
+    stream.write("[")
+    for i, row in enumerate(records(statement)):
+        values = [
+            precision.format(x) if isinstance(x, int) else json.dumps(x) for x in row
+        ]
+        items = ", ".join(f"{k}: {v}" for k, v in zip(names, values))
+        stream.write(f'{", " if i else ""}{{{items}}}')
+    stream.write("]\n")
+
+
+def write_csv(statement: Statement, stream: TextIO, precision: Precision = Precision()):
+    """Write statement as CSV with header row."""
+    fmt = precision.format
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(fields(statement))
+    writer.writerows(
+        tuple(fmt(x) if isinstance(x, int) else x for x in row)
+        for row in records(statement)
+    )
+
+
+def import_pyarrow():
+    try:
+        import pyarrow  # type: ignore
+    except ImportError:
+        raise AbacusError("Arrow and Parquet output needs pyarrow package.")
+    return pyarrow
+
+
+def batches(statement: Statement, precision: Precision, size: int = BATCH_SIZE):
+    pa = import_pyarrow()
+    names = fields(statement)
+    if precision.places:
+        amount_type = pa.decimal128(38, precision.places)
+
+        def convert(n):
+            return precision.to_decimal(n)
+
+    else:
+        amount_type = pa.int64()
+
+        def convert(n):
+            return n
+
+    amount_fields = getattr(statement, "amount_fields", AMOUNT_FIELDS)
+    types = [amount_type if name in amount_fields else pa.string() for name in names]
+    schema = pa.schema(list(zip(names, types)))
+
+    def generate():
+        rows = records(statement)
+        while chunk := list(islice(rows, size)):
+            columns = list(zip(*chunk))
+            arrays = [
+                pa.array(
+                    column if t == pa.string() else [convert(x) for x in column], t
+                )
+                for column, t in zip(columns, types)
+            ]
+            yield pa.record_batch(arrays, schema=schema)
+
+    return schema, generate()
+
+
+def write_arrow(statement: Statement, path: Path | str, precision: Precision):
+    """Write statement to Arrow IPC stream file batch by batch."""
+    pa = import_pyarrow()
+    schema, record_batches = batches(statement, precision)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for batch in record_batches:
+                writer.write_batch(batch)
+
+
+def write_parquet(statement: Statement, path: Path | str, precision: Precision):
+    """Write statement to Parquet file batch by batch."""
+    import_pyarrow()
+    import pyarrow.parquet as pq  # type: ignore
+
+    schema, record_batches = batches(statement, precision)
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for batch in record_batches:
+            writer.write_batch(batch)
+
+
+def write(
+    statement: Statement,
+    format: str,
+    stream: TextIO | None = None,
+    path: Path | str | None = None,
+    precision: Precision = Precision(),
+):
+    """Write statement in one of `FORMATS`. JSON and CSV are written to
+    `stream`, Arrow and Parquet need a file `path`."""
+    if format not in FORMATS:
+        raise AbacusError(f"Format must be one of {FORMATS}, got {format}.")
+    if format in ("arrow", "parquet"):
+        if path is None:
+            raise AbacusError(f"Output file is required for {format} format.")
+        writer = write_arrow if format == "arrow" else write_parquet
+        return writer(statement, path, precision)
+    if path is not None:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            return write(statement, format, stream=f, precision=precision)
+    if stream is None:
+        raise AbacusError("Output stream or file is required.")
+    if format == "json":
+        return write_json(statement, stream, precision)
+    return write_csv(statement, stream, precision)
@@ -0,0 +1,170 @@
+"""Sub-accounts with balances rolled up to every level of account hierarchy.
+
+Account names in chart may contain levels separated by colon,
+for example "cash:bank_a:eur" is a sub-account of "cash:bank_a",
+which in turn is a sub-account of "cash". Entries are posted to leaf accounts
+and balances of all parent levels are updated on every posting,
+so statements at chosen depth use these totals and not the leaf accounts.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from abacus.core import (
+    AbacusError,
+    Account,
+    AccountBalances,
+    Amount,
+    Chart,
+    Entry,
+    Ledger,
+    Report,
+    T,
+    account_signs,
+)
+
+__all__ = ["Rollup"]
+
+SEPARATOR = ":"
+
+
+def parents(name: str) -> list[str]:
+    """Return account name and its parent names, for example
+    "cash:bank_a:eur" -> ["cash", "cash:bank_a", "cash:bank_a:eur"]."""
+    parts = name.split(SEPARATOR)
+    return [SEPARATOR.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def truncate(name: str, depth: int) -> str:
+    """Return parent of account name at `depth` (top level is depth 1)."""
+    return SEPARATOR.join(name.split(SEPARATOR)[:depth])
+
+
+def regular_accounts(chart: Chart) -> dict[str, tuple[T, list[str]]]:
+    """Return regular account names with their types and contra account names."""
+    return {
+        account.name: (t, account.contra_accounts)
+        for t, items in [
+            (T.Asset, chart.assets),
+            (T.Capital, chart.capital),
+            (T.Liability, chart.liabilities),
+            (T.Income, chart.income),
+            (T.Expense, chart.expenses),
+        ]
+        for account in chart.pure_accounts(items)
+    }
+
+
+@dataclass
+class Rollup:
+    """Ledger of leaf accounts with totals for every level of account hierarchy.
+
+    Totals are kept with debit balances positive and credit balances negative.
+    Contra accounts that share parent name with a regular account are netted
+    with that account at parent level.
+
+    Example:
+
+    ```python
+    chart = Chart(assets=["cash:bank_a:eur", "cash:bank_a:usd"], capital=["equity"])
+    rollup = Rollup.new(chart).post_many([Entry("cash:bank_a:eur", "equity", 100)])
+    rollup.balances(depth=2)  # {"cash:bank_a": 100, "equity": 100, ...}
+    ```
+    """
+
+    chart: Chart
+    ledger: Ledger
+    totals: dict[str, Amount] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.validate()
+
+    @classmethod
+    def new(cls, chart: Chart):
+        return cls(chart, chart.ledger())
+
+    @classmethod
+    def from_ledger(cls, chart: Chart, ledger: Ledger):
+        """Create rollup from existing ledger using account balances."""
+        rollup = cls(chart, ledger)
+        signs = account_signs(ledger)
+        for name, account in ledger.items():
+            if b := account.balance():
+                rollup.add(name, signs[name] * b)
+        return rollup
+
+    def validate(self):
+        leaves = set(self.ledger.keys())
+        types: dict[str, T] = {}
+        for name, (t, _) in regular_accounts(self.chart).items():
+            for parent in parents(name):
+                if parent != name and parent in leaves:
+                    raise AbacusError(f"Account {parent} has sub-accounts.")
+                if types.setdefault(parent, t) != t:
+                    raise AbacusError(
+                        f"Account {parent} has sub-accounts of two types."
+                    )
+        return self
+
+    def add(self, name: str, amount: Amount):
+        for parent in parents(name):
+            self.totals[parent] = self.totals.get(parent, 0) + amount
+
+    def post_many(self, entries: Iterable[Entry]):
+        """Post entries to leaf accounts and update totals at all levels."""
+        entries = list(entries)
+        self.ledger.post_many(entries)
+        for entry in entries:
+            self.add(entry.debit, entry.amount)
+            self.add(entry.credit, -entry.amount)
+        return self
+
+    def post(self, debit: str, credit: str, amount: Amount):
+        return self.post_many([Entry(debit, credit, amount)])
+
+    def chart_at(self, depth: int) -> Chart:
+        """Return chart where account names are cut to `depth` levels.
+        Contra accounts are kept if they do not merge into a regular account."""
+        regulars = regular_accounts(self.chart)
+        nodes = {truncate(name, depth) for name in regulars}
+        accounts: dict[str, tuple[T, list[str]]] = {}
+        for name, (t, contra_names) in regulars.items():
+            _, contras = accounts.setdefault(truncate(name, depth), (t, []))
+            for contra_name in contra_names:
+                node = truncate(contra_name, depth)
+                if node not in nodes and node not in contras:
+                    contras.append(node)
+        kwargs: dict[str, list[str | Account]] = dict(
+            assets=[], capital=[], liabilities=[], income=[], expenses=[]
+        )
+        key = {
+            T.Asset: "assets",
+            T.Capital: "capital",
+            T.Liability: "liabilities",
+            T.Income: "income",
+            T.Expense: "expenses",
+        }
+        for name, (t, contras) in accounts.items():
+            kwargs[key[t]].append(Account(name, contras))
+        return Chart(
+            income_summary_account=self.chart.income_summary_account,
+            retained_earnings_account=self.chart.retained_earnings_account,
+            null_account=self.chart.null_account,
+            precision=self.chart.precision,
+            **kwargs,  # type: ignore
+        )
+
+    def balances(self, depth: int) -> AccountBalances:
+        """Return account balances at `depth` using rolled up totals."""
+        return self.balances_for(self.chart_at(depth))
+
+    def balances_for(self, chart: Chart) -> AccountBalances:
+        signs = account_signs(chart.ledger())
+        return AccountBalances(
+            {name: self.totals.get(name, 0) * sign for name, sign in signs.items()}
+        )
+
+    def report(self, depth: int) -> Report:
+        """Create report with accounts at `depth` levels of hierarchy."""
+        chart = self.chart_at(depth)
+        return Report(chart, Ledger.new(chart, self.balances_for(chart)))
@@ -0,0 +1,229 @@
+"""Post entries from many sources concurrently with asyncio.
+
+Producers (files, sockets, queues) put entries to a bounded queue,
+so fast producers wait when the writer falls behind. A single consumer
+validates entries against chart, groups them in batches and writes each
+batch to store and to ledger at once.
+
+Example:
+
+```python
+ingestor = Ingestor(chart, store=LineJSON.load())
+metrics = asyncio.run(ingestor.run(from_file("bank.csv"), from_file("pos.linejson")))
+metrics.throughput()  # entries per second
+```
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+from abacus.core import AbacusError, Chart, Entry, Ledger, Precision
+from abacus.entries_store import LineJSON, read_csv
+from abacus.validation import Validator
+
+__all__ = [
+    "Ingestor",
+    "IngestMetrics",
+    "from_file",
+    "from_iterable",
+    "from_queue",
+    "from_stream",
+]
+
+# marks end of producers in the queue
+DONE = None
+
+
+@dataclass
+class IngestMetrics:
+    received: int = 0
+    posted: int = 0
+    rejected: int = 0
+    batches: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    def elapsed(self) -> float:
+        end = time.monotonic() if self.finished is None else self.finished
+        return end - self.started
+
+    def throughput(self) -> float:
+        """Posted entries per second."""
+        elapsed = self.elapsed()
+        return self.posted / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"Posted {self.posted} of {self.received} entries "
+            f"in {self.batches} batches, rejected {self.rejected}, "
+            f"{self.throughput():.0f} entries per second, "
+            f"max queue depth {self.max_queue_depth}."
+        )
+
+
+@dataclass
+class Ingestor:
+    """Validate and post entries from several producers in batches.
+
+    Entries are written to `store` and posted to `ledger` if given.
+    Entries that fail `validator` checks (by default, accounts not in chart
+    or amounts that are not positive integers) are kept in `rejected` with the reason
+    and are not posted.
+    """
+
+    chart: Chart
+    store: LineJSON | None = None
+    ledger: Ledger | None = None
+    maxsize: int = 10_000
+    batch_size: int = 1_000
+    flush_interval: float = 0.5
+    metrics: IngestMetrics = field(default_factory=IngestMetrics)
+    rejected: list[tuple[Entry, str]] = field(default_factory=list)
+    validator: Validator | None = None
+
+    def __post_init__(self):
+        if self.validator is None:
+            # same rules as `ledger post`: accounts in chart, positive amounts
+            self.validator = Validator.from_chart(self.chart)
+        self.queue: asyncio.Queue | None = None
+
+    def validate(self, entry: Entry) -> str | None:
+        """Return reason to reject entry or None if entry is valid."""
+        messages = self.validator.messages(  # type: ignore
+            [entry.debit, entry.credit], [entry.amount]
+        )
+        return " ".join(messages) or None
+
+    async def put(self, entry: Entry):
+        """Put entry to queue, waiting if the queue is full."""
+        if self.queue is None:
+            raise AbacusError("Ingestor is not running.")
+        await self.queue.put(entry)
+        self.metrics.received += 1
+        depth = self.queue.qsize()
+        self.metrics.queue_depth = depth
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, depth)
+
+    async def feed(self, source: AsyncIterable[Entry]):
+        async for entry in source:
+            await self.put(entry)
+
+    async def write(self, batch: list[Entry]):
+        valid = []
+        for entry in batch:
+            reason = self.validate(entry)
+            if reason is None:
+                valid.append(entry)
+            else:
+                self.rejected.append((entry, reason))
+        if valid:
+            if self.store is not None:
+                # file write does not block other producers
+                await asyncio.to_thread(self.store.append_many, valid)
+            if self.ledger is not None:
+                self.ledger.post_many(valid)
+        self.metrics.posted += len(valid)
+        self.metrics.rejected += len(batch) - len(valid)
+        self.metrics.batches += 1
+
+    async def consume(self):
+        """Take entries from queue and write them in batches. A batch is
+        written when it is full or when no entry came in `flush_interval`."""
+        queue = self.queue
+        assert queue is not None
+        batch: list[Entry] = []
+        while True:
+            try:
+                entry = await asyncio.wait_for(queue.get(), self.flush_interval)
+            except asyncio.TimeoutError:
+                if batch:
+                    await self.write(batch)
+                    batch = []
+                continue
+            self.metrics.queue_depth = queue.qsize()
+            if entry is DONE:
+                break
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                await self.write(batch)
+                batch = []
+        if batch:
+            await self.write(batch)
+
+    @staticmethod
+    async def stop(tasks: list[asyncio.Task]):
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, *sources: AsyncIterable[Entry]) -> IngestMetrics:
+        """Read all `sources` concurrently and post their entries."""
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self.metrics = IngestMetrics()
+        consumer = asyncio.create_task(self.consume())
+        tasks = [asyncio.create_task(self.feed(source)) for source in sources]
+        producers = asyncio.gather(*tasks)
+        try:
+            await asyncio.wait(
+                {consumer, producers}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if consumer.done():
+                # writing failed, producers may wait on full queue forever
+                producers.cancel()
+                await self.stop(tasks)
+                consumer.result()
+            else:
+                # a failed producer completes `producers` while others run,
+                # stop them so that every received entry is written
+                await self.stop(tasks)
+                await self.queue.put(DONE)
+                await consumer
+                producers.result()
+        finally:
+            self.metrics.finished = time.monotonic()
+            self.queue = None
+        return self.metrics
+
+
+async def from_iterable(entries: Iterable[Entry]) -> AsyncIterator[Entry]:
+    for entry in entries:
+        yield entry
+
+
+async def from_queue(queue: asyncio.Queue) -> AsyncIterator[Entry]:
+    """Yield entries from `queue` until None is received."""
+    while (entry := await queue.get()) is not None:
+        yield entry
+
+
+async def from_stream(reader: asyncio.StreamReader) -> AsyncIterator[Entry]:
+    """Yield entries from JSON lines read from socket or other stream."""
+    while line := await reader.readline():
+        if line.strip():
+            yield Entry.from_string(line.decode("utf-8"))
+
+
+async def from_file(
+    path: Path | str, precision: Precision = Precision(), chunk: int = 1_000
+) -> AsyncIterator[Entry]:
+    """Yield entries from CSV file or file with JSON lines.
+    File is opened and read in a worker thread, `chunk` entries
+    at a time, so reading does not block the event loop."""
+    path = Path(path)
+    file = await asyncio.to_thread(open, path, "r", newline="", encoding="utf-8")
+    try:
+        if path.suffix == ".csv":
+            entries = read_csv(file, precision)
+        else:
+            entries = (Entry.from_string(line) for line in file if line.strip())
+        while batch := await asyncio.to_thread(lambda: list(islice(entries, chunk))):
+            for entry in batch:
+                yield entry
+    finally:
+        await asyncio.to_thread(file.close)
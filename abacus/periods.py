@@ -0,0 +1,165 @@
+"""Comparative statements for several periods computed in one pass over entries.
+
+Entries are grouped into periods by date, for each period only changes
+in account balances are kept. Balances at period end are cumulative sums
+of the changes. Statements for a column of a report are made from
+condensed ledger with these balances, so closing runs on balances
+and not on entries.
+"""
+
+from calendar import month_abbr
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Iterable
+
+from abacus.core import (
+    AbacusError,
+    AccountBalances,
+    Amount,
+    BalanceSheet,
+    Chart,
+    Entry,
+    IncomeStatement,
+    Ledger,
+    Pipeline,
+    account_signs,
+    add_signed,
+    month,
+)
+
+__all__ = ["Column", "PeriodBalances", "ComparativeReport", "monthly_columns"]
+
+
+@dataclass
+class Column:
+    """Report column for periods from `start` to `end` inclusive.
+
+    Periods are strings like "2024-01" that sort in time order.
+    Balance sheet is at the end of `end` period, income statement
+    is for all periods from `start` to `end`.
+    """
+
+    label: str
+    start: str
+    end: str
+
+
+def monthly_columns(year: int) -> list[Column]:
+    """Columns for 12 months of `year`, year to date and previous year."""
+    months = [f"{year}-{m:02d}" for m in range(1, 13)]
+    return [
+        *[Column(month_abbr[int(m[5:])], m, m) for m in months],
+        Column("YTD", months[0], months[-1]),
+        Column(str(year - 1), f"{year - 1}-01", f"{year - 1}-12"),
+    ]
+
+
+@dataclass
+class PeriodBalances:
+    """Changes in account balances by period, debits positive and credits negative."""
+
+    chart: Chart
+    changes: dict[str, dict[str, Amount]] = field(default_factory=dict)
+
+    @classmethod
+    def from_entries(
+        cls,
+        chart: Chart,
+        entries: Iterable[Entry],
+        period: Callable[[Entry], str] = month,
+    ):
+        """Group entries by period in one pass. Entries to or from income summary
+        account are skipped, because closing is done for each column separately."""
+        isa = chart.income_summary_account
+        changes: dict[str, dict[str, Amount]] = {}
+        for entry in entries:
+            if entry.debit == isa or entry.credit == isa:
+                continue
+            add_signed(changes.setdefault(period(entry), {}), (entry,))
+        return cls(chart, changes)
+
+    def cumulative(
+        self, periods: Iterable[str], inclusive: bool = True
+    ) -> dict[str, dict[str, Amount]]:
+        """Return balances at the end of each of `periods`,
+        or at the start of each period if `inclusive` is False."""
+        keys = sorted(self.changes.keys())
+        result = {}
+        running: dict[str, Amount] = {}
+        i = 0
+        for p in sorted(set(periods)):
+            while i < len(keys) and (keys[i] <= p if inclusive else keys[i] < p):
+                for name, amount in self.changes[keys[i]].items():
+                    running[name] = running.get(name, 0) + amount
+                i += 1
+            result[p] = dict(running)
+        return result
+
+    def balances(self, signed: dict[str, Amount]) -> AccountBalances:
+        """Convert signed balances to account balances."""
+        signs = account_signs(self.chart.ledger())
+        try:
+            return AccountBalances(
+                {name: amount * signs[name] for name, amount in signed.items()}
+            )
+        except KeyError as e:
+            raise AbacusError(f"Account {e} not in chart.")
+
+
+def subtract(a: dict[str, Amount], b: dict[str, Amount]) -> dict[str, Amount]:
+    return {name: a.get(name, 0) - b.get(name, 0) for name in a.keys() | b.keys()}
+
+
+@dataclass
+class ComparativeReport:
+    """Balance sheets and income statements for several report columns."""
+
+    chart: Chart
+    period_balances: PeriodBalances
+    columns: list[Column]
+
+    @classmethod
+    def from_entries(cls, chart: Chart, entries: Iterable[Entry], columns):
+        return cls(chart, PeriodBalances.from_entries(chart, entries), columns)
+
+    def _ledgers(self) -> Iterable[tuple[Column, Ledger, Ledger]]:
+        pb = self.period_balances
+        ends = pb.cumulative(c.end for c in self.columns)
+        starts = pb.cumulative((c.start for c in self.columns), inclusive=False)
+        for c in self.columns:
+            flows = subtract(ends[c.end], starts[c.start])
+            yield (
+                c,
+                Ledger.new(self.chart, pb.balances(ends[c.end])),
+                Ledger.new(self.chart, pb.balances(flows)),
+            )
+
+    @cached_property
+    def statements(self) -> dict[str, tuple[BalanceSheet, IncomeStatement]]:
+        """Balance sheet and income statement by column label."""
+        result = {}
+        for column, closing, flows in self._ledgers():
+            b = Pipeline(self.chart, closing).close().ledger
+            i = Pipeline(self.chart, flows).close_first().ledger
+            result[column.label] = (BalanceSheet.new(b), IncomeStatement.new(i))
+        return result
+
+    @property
+    def balance_sheets(self) -> dict[str, BalanceSheet]:
+        return {k: b for k, (b, _) in self.statements.items()}
+
+    @property
+    def income_statements(self) -> dict[str, IncomeStatement]:
+        return {k: i for k, (_, i) in self.statements.items()}
+
+    @property
+    def balance_sheet_viewer(self):
+        from abacus.viewers import ComparativeViewer
+
+        return ComparativeViewer(self.balance_sheets, "Balance sheet")
+
+    @property
+    def income_statement_viewer(self):
+        from abacus.viewers import ComparativeViewer
+
+        return ComparativeViewer(self.income_statements, "Income statement")
@@ -0,0 +1,303 @@
+"""Match bank statement lines with ledger entries to a cash account.
+
+Amounts are signed from the bank point of view: deposits are positive
+(cash is debited) and withdrawals are negative (cash is credited).
+Matching runs in three passes, each pass uses an index instead of
+comparing every bank line with every entry:
+
+1. exact — same date and amount, hash index on `(date, amount)`;
+2. window — same amount within `window` days, entries of each amount
+   are sorted by date and searched with bisect;
+3. group — several entries that sum up to one bank line within
+   `window` days, for example a deposit of many cheques; only
+   `max_candidates` entries nearest by date are tried.
+
+Matched entries are skipped with `Alive` pointers instead of being
+deleted from sorted lists, so all passes take O(n log n) time.
+
+Bank lines left unmatched become adjusting entries against `suspense`
+account, or against account from `accounts` whose keyword is found in
+bank line description.
+
+Example:
+
+```python
+bank = read_bank_csv(open("bank.csv"), precision)
+result = Reconciler(window=3).match(bank, book_items("cash", store.yield_entries()))
+ledger.post_many(result.adjusting_entries("cash", "suspense", {"fee": "bank_charges"}))
+```
+"""
+
+import csv
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date as Date
+from itertools import combinations
+from typing import Iterable, TextIO
+
+from abacus.core import AbacusError, Amount, Entry, Precision
+
+__all__ = [
+    "BankLine",
+    "BookItem",
+    "Match",
+    "Reconciler",
+    "Reconciliation",
+    "book_items",
+    "read_bank_csv",
+]
+
+
+def ordinal(date: str) -> int:
+    return Date.fromisoformat(date).toordinal()
+
+
+@dataclass
+class BankLine:
+    date: str
+    amount: Amount
+    description: str = ""
+
+    def __post_init__(self):
+        self.day = ordinal(self.date)
+
+
+@dataclass
+class BookItem:
+    """Entry to cash account with signed amount, `index` is entry position."""
+
+    index: int
+    entry: Entry
+    amount: Amount
+
+    @property
+    def date(self) -> str | None:
+        return self.entry.date
+
+
+def read_bank_csv(file: TextIO, precision: Precision = Precision()) -> list[BankLine]:
+    """Read bank lines from CSV file with date, amount and optional
+    description columns. Amounts are in major units like "-10.50"."""
+    result = []
+    for i, row in enumerate(csv.DictReader(file), start=2):
+        try:
+            result.append(
+                BankLine(
+                    date=row["date"].strip(),
+                    amount=precision.to_amount(row["amount"].strip()),
+                    description=(row.get("description") or "").strip(),
+                )
+            )
+        except (KeyError, AttributeError, ValueError, AbacusError):
+            raise AbacusError(f"Cannot read bank line from line {i}: {row}")
+    return result
+
+
+def book_items(cash: str, entries: Iterable[Entry]) -> list[BookItem]:
+    """Entries that debit or credit `cash` account with signed amounts."""
+    result = []
+    for i, entry in enumerate(entries):
+        if entry.debit == cash and entry.credit != cash:
+            result.append(BookItem(i, entry, entry.amount))
+        elif entry.credit == cash and entry.debit != cash:
+            result.append(BookItem(i, entry, -entry.amount))
+    return result
+
+
+@dataclass
+class Match:
+    kind: str
+    bank: BankLine
+    book: list[BookItem]
+
+
+@dataclass
+class Reconciliation:
+    matches: list[Match] = field(default_factory=list)
+    unmatched_bank: list[BankLine] = field(default_factory=list)
+    unmatched_book: list[BookItem] = field(default_factory=list)
+
+    def difference(self) -> Amount:
+        """Bank total minus book total for unmatched items."""
+        bank = sum(line.amount for line in self.unmatched_bank)
+        book = sum(item.amount for item in self.unmatched_book)
+        return bank - book
+
+    def adjusting_entries(
+        self, cash: str, suspense: str, accounts: dict[str, str] | None = None
+    ) -> list[Entry]:
+        """Entries for unmatched bank lines, to be posted with `Ledger.post_many`.
+        `accounts` maps keywords in bank line description to account names,
+        lines without a keyword are posted against `suspense` account."""
+        accounts = {k.lower(): v for k, v in (accounts or {}).items()}
+        result = []
+        for line in self.unmatched_bank:
+            description = line.description.lower()
+            other = next((v for k, v in accounts.items() if k in description), suspense)
+            if line.amount > 0:
+                result.append(Entry(cash, other, line.amount, date=line.date))
+            elif line.amount < 0:
+                result.append(Entry(other, cash, -line.amount, date=line.date))
+        return result
+
+
+class Alive:
+    """Positions `0..n-1` of a sorted list that are not used yet.
+
+    Next and previous unused position are found by following pointers
+    over removed positions, with path compression, so removal and search
+    take amortized constant time and the list itself is never changed.
+    """
+
+    def __init__(self, n: int):
+        self._next = list(range(n + 1))
+        # previous pointers are shifted by one, 0 stands for position -1
+        self._prev = list(range(n + 1))
+
+    @staticmethod
+    def _find(pointers: list[int], k: int) -> int:
+        root = k
+        while pointers[root] != root:
+            root = pointers[root]
+        while pointers[k] != root:
+            pointers[k], k = root, pointers[k]
+        return root
+
+    def next(self, k: int) -> int:
+        """Smallest unused position from `k`, or n if there is none."""
+        return self._find(self._next, k)
+
+    def prev(self, k: int) -> int:
+        """Largest unused position up to `k`, or -1 if there is none."""
+        return self._find(self._prev, k + 1) - 1
+
+    def remove(self, k: int):
+        self._next[k] = k + 1
+        self._prev[k + 1] = k
+
+
+@dataclass
+class Reconciler:
+    """Match bank lines with book items, see module docstring for passes.
+
+    `max_group` limits the number of entries matched to one bank line
+    and `max_candidates` limits entries tried for a group match.
+    """
+
+    window: int = 3
+    max_group: int = 3
+    max_candidates: int = 20
+
+    def match(self, bank: list[BankLine], book: list[BookItem]) -> Reconciliation:
+        result = Reconciliation()
+        used: set[int] = set()
+        rest = self.match_exact(bank, book, result, used)
+        # day ordinals of dated book items, parsed once
+        dated = {i: ordinal(item.date) for i, item in enumerate(book) if item.date}
+        rest = self.match_window(rest, book, dated, result, used)
+        rest = self.match_group(rest, book, dated, result, used)
+        result.unmatched_bank = rest
+        result.unmatched_book = [x for i, x in enumerate(book) if i not in used]
+        return result
+
+    def match_exact(self, bank, book, result, used) -> list[BankLine]:
+        index: dict[tuple[str | None, Amount], list[int]] = {}
+        for i in reversed(range(len(book))):
+            index.setdefault((book[i].date, book[i].amount), []).append(i)
+        rest = []
+        for line in bank:
+            if candidates := index.get((line.date, line.amount)):
+                i = candidates.pop()
+                used.add(i)
+                result.matches.append(Match("exact", line, [book[i]]))
+            else:
+                rest.append(line)
+        return rest
+
+    def match_window(self, bank, book, dated, result, used) -> list[BankLine]:
+        # for every amount, sorted dates and positions of book items
+        days: dict[Amount, list[int]] = {}
+        positions: dict[Amount, list[int]] = {}
+        for i in sorted((i for i in dated if i not in used), key=dated.__getitem__):
+            days.setdefault(book[i].amount, []).append(dated[i])
+            positions.setdefault(book[i].amount, []).append(i)
+        alive = {amount: Alive(len(ds)) for amount, ds in days.items()}
+        rest = []
+        for line in bank:
+            if line.amount not in days:
+                rest.append(line)
+                continue
+            ds = days[line.amount]
+            found = self.nearest(ds, alive[line.amount], line.day, 1)
+            if not found:
+                rest.append(line)
+                continue
+            alive[line.amount].remove(found[0])
+            i = positions[line.amount][found[0]]
+            used.add(i)
+            result.matches.append(Match("window", line, [book[i]]))
+        return rest
+
+    def match_group(self, bank, book, dated, result, used) -> list[BankLine]:
+        if self.max_group < 2:
+            return bank
+        # deposits and withdrawals are searched separately
+        orders: dict[bool, list[int]] = {True: [], False: []}
+        for i in sorted((i for i in dated if i not in used), key=dated.__getitem__):
+            orders[book[i].amount > 0].append(i)
+        days = {sign: [dated[i] for i in order] for sign, order in orders.items()}
+        alive = {sign: Alive(len(order)) for sign, order in orders.items()}
+        rest = []
+        for line in bank:
+            sign = line.amount > 0
+            order = orders[sign]
+            nearest = self.nearest(
+                days[sign], alive[sign], line.day, self.max_candidates
+            )
+            position = {order[k]: k for k in nearest}
+            candidates = [
+                order[k]
+                for k in nearest
+                if abs(book[order[k]].amount) < abs(line.amount)
+            ]
+            if group := sorted(self.find_group(line.amount, candidates, book)):
+                for i in group:
+                    alive[sign].remove(position[i])
+                used.update(group)
+                result.matches.append(Match("group", line, [book[i] for i in group]))
+            else:
+                rest.append(line)
+        return rest
+
+    def nearest(self, ds: list[int], alive: "Alive", day: int, limit: int) -> list[int]:
+        """Positions in sorted `ds` of up to `limit` unused items within
+        `window` days from `day`, nearest first."""
+        start = bisect_left(ds, day)
+        right, left = alive.next(start), alive.prev(start - 1)
+        result: list[int] = []
+        while len(result) < limit:
+            has_right = right < len(ds) and ds[right] - day <= self.window
+            has_left = left >= 0 and day - ds[left] <= self.window
+            if has_right and (not has_left or ds[right] - day <= day - ds[left]):
+                result.append(right)
+                right = alive.next(right + 1)
+            elif has_left:
+                result.append(left)
+                left = alive.prev(left - 1)
+            else:
+                break
+        return result
+
+    def find_group(self, amount: Amount, candidates: list[int], book) -> list[int]:
+        """Return positions of book items that sum up to `amount`,
+        pairs are found with hash lookup, larger groups by search."""
+        seen: dict[Amount, int] = {}
+        for i in candidates:
+            if (j := seen.get(amount - book[i].amount)) is not None:
+                return [j, i]
+            seen.setdefault(book[i].amount, i)
+        for n in range(3, self.max_group + 1):
+            for group in combinations(candidates, n):
+                if sum(book[i].amount for i in group) == amount:
+                    return list(group)
+        return []
@@ -0,0 +1,113 @@
+"""Cache of computed statements keyed by chart and store state.
+
+Statements depend only on chart and posted entries, so a statement
+computed once can be returned again while nothing was posted.
+The key is made of chart hash, store state (like store file size and
+modification time, or number of entries in memory), rename dictionary
+and statement kind. Old keys are evicted in least recently used order.
+
+Example:
+
+```python
+cache = ReportCache(maxsize=16)
+key = cache.key(chart, len(entries), rename_dict, "balance_sheet")
+balance_sheet = cache.get(key, lambda: Report(chart, ledger).balance_sheet)
+```
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Hashable
+
+from abacus import signing
+from abacus.core import Chart, Statement
+
+__all__ = ["ReportCache", "ReportKey", "chart_digest"]
+
+
+def chart_digest(chart: Chart) -> str:
+    """Return hash of chart, equal for charts with the same accounts and settings."""
+    return hashlib.blake2b(repr(chart).encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class ReportKey:
+    chart: str
+    store: Hashable
+    rename: tuple[tuple[str, str], ...]
+    kind: str
+
+
+@dataclass
+class ReportCache:
+    """Statements by `ReportKey`, at most `maxsize` items.
+
+    If `path` is given, cache is read from this file on creation
+    and written back when new statement is added. The file is signed
+    (see `abacus.signing`), files not written by current user are ignored.
+    """
+
+    maxsize: int = 32
+    path: Path | None = None
+    items: OrderedDict[ReportKey, Statement] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+
+    def __post_init__(self):
+        if self.path is not None:
+            self.path = Path(self.path)
+            self.items = self.read(self.path)
+            self.evict()
+
+    @staticmethod
+    def key(
+        chart: Chart | str,
+        store: Hashable,
+        rename_dict: dict[str, str] | None,
+        kind: str,
+    ) -> ReportKey:
+        """Make cache key. `chart` is a chart or its hash."""
+        digest = chart if isinstance(chart, str) else chart_digest(chart)
+        rename = tuple(sorted((rename_dict or {}).items()))
+        return ReportKey(digest, store, rename, kind)
+
+    @staticmethod
+    def read(path: Path) -> OrderedDict:
+        try:
+            obj = signing.loads(path.read_bytes())
+        except Exception:
+            return OrderedDict()
+        return obj if isinstance(obj, OrderedDict) else OrderedDict()
+
+    def save(self):
+        if self.path is None:
+            return
+        try:
+            self.path.write_bytes(signing.dumps(self.items))
+        except OSError:
+            pass
+
+    def evict(self):
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def get(self, key: ReportKey, compute: Callable[[], Statement]) -> Statement:
+        """Return cached statement for `key` or compute and store it."""
+        try:
+            statement = self.items[key]
+        except KeyError:
+            self.misses += 1
+            statement = self.items[key] = compute()
+            self.evict()
+            self.save()
+            return statement
+        self.hits += 1
+        self.items.move_to_end(key)
+        return statement
+
+    def clear(self):
+        self.items.clear()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,144 @@
+"""What-if scenarios evaluated against one base ledger.
+
+Each scenario is a set of entries (budget, forecast, shock) added to the
+base ledger. Entries of all scenarios are summed in one pass into a matrix
+of account balance changes by scenario, so the base ledger is read once
+and no ledger is copied for a scenario. Statements for a scenario are made
+from condensed ledger with base balances plus scenario column, and closing
+runs on these balances only.
+
+Example:
+
+```python
+scenarios = Scenarios.from_ledger(chart, ledger)
+scenarios.add("optimistic", [Entry("cash", "sales", 100)])
+scenarios.add("pessimistic", [Entry("cash", "sales", 20)])
+scenarios.current_profit()  # {"optimistic": ..., "pessimistic": ...}
+scenarios.balance_sheets()  # {"optimistic": BalanceSheet(...), ...}
+```
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from abacus.core import (
+    PROFIT_TYPES,
+    AccountBalances,
+    Amount,
+    BalanceSheet,
+    Chart,
+    Entry,
+    IncomeStatement,
+    Ledger,
+    Pipeline,
+    account_signs,
+    add_signed,
+    check_accounts,
+    signed_ledger,
+)
+
+__all__ = ["Scenarios"]
+
+
+@dataclass
+class Scenarios:
+    """Base balances and balance changes by scenario.
+
+    Balances and changes are signed: debits are positive and credits
+    are negative. `deltas` holds a column of changes for every scenario.
+    """
+
+    chart: Chart
+    base: dict[str, Amount] = field(default_factory=dict)
+    deltas: dict[str, dict[str, Amount]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        ledger = self.chart.ledger()
+        # scenario ledgers are snapshots of this empty ledger
+        self._empty = ledger
+        self._signs = account_signs(ledger)
+        self._profit = [
+            name
+            for name, account in ledger.items()
+            if isinstance(account, PROFIT_TYPES)
+        ]
+
+    @classmethod
+    def from_ledger(cls, chart: Chart, ledger: Ledger):
+        """Use balances of unclosed `ledger` as base for all scenarios."""
+        scenarios = cls(chart)
+        for name, account in ledger.items():
+            if b := account.balance():
+                scenarios.base[name] = scenarios._signs[name] * b
+        return scenarios
+
+    def add(self, name: str, entries: Iterable[Entry]):
+        """Add scenario or add more entries to existing scenario."""
+        entries = list(entries)
+        check_accounts(entries, self._signs)
+        add_signed(self.deltas.setdefault(name, {}), entries)
+        return self
+
+    def add_many(self, scenarios: dict[str, Iterable[Entry]]):
+        for name, entries in scenarios.items():
+            self.add(name, entries)
+        return self
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.deltas.keys())
+
+    def matrix(self) -> dict[str, list[Amount]]:
+        """Account balance changes as rows by account and columns by scenario."""
+        names = self.names
+        rows: dict[str, list[Amount]] = {}
+        for j, name in enumerate(names):
+            for account, amount in self.deltas[name].items():
+                rows.setdefault(account, [0] * len(names))[j] = amount
+        return rows
+
+    def signed_balances(self, name: str) -> dict[str, Amount]:
+        result = dict(self.base)
+        for account, amount in self.deltas[name].items():
+            result[account] = result.get(account, 0) + amount
+        return result
+
+    def balances(self, name: str) -> AccountBalances:
+        """Account balances in scenario `name` before closing."""
+        return AccountBalances(
+            {
+                account: self._signs[account] * amount
+                for account, amount in self.signed_balances(name).items()
+            }
+        )
+
+    def current_profit(self) -> dict[str, Amount]:
+        """Current profit by scenario, computed without closing."""
+        base = -sum(self.base.get(name, 0) for name in self._profit)
+        return {
+            name: base - sum(delta.get(account, 0) for account in self._profit)
+            for name, delta in self.deltas.items()
+        }
+
+    def ledger(self, name: str) -> Ledger:
+        """Condensed ledger for scenario `name`, balances are posted
+        against null account as debits, positive or negative."""
+        return signed_ledger(
+            self.chart, self.signed_balances(name), self._empty.snapshot()
+        )
+
+    def statements(self) -> dict[str, tuple[BalanceSheet, IncomeStatement]]:
+        """Balance sheet and income statement by scenario."""
+        result = {}
+        for name in self.names:
+            ledger = self.ledger(name)
+            b = Pipeline(self.chart, ledger).close().ledger
+            i = Pipeline(self.chart, ledger).close_first().ledger
+            result[name] = (BalanceSheet.new(b), IncomeStatement.new(i))
+        return result
+
+    def balance_sheets(self) -> dict[str, BalanceSheet]:
+        return {k: b for k, (b, _) in self.statements().items()}
+
+    def income_statements(self) -> dict[str, IncomeStatement]:
+        return {k: i for k, (_, i) in self.statements().items()}
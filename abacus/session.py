@@ -0,0 +1,99 @@
+"""Ledger state for interactive use, updated with new entries only.
+
+`LiveReport` keeps running account balances instead of a list of postings,
+so posting an entry costs the same after thousands of entries. Statements
+are made from condensed ledger with these balances and are recomputed
+only after entries that affect them were posted.
+
+Example:
+
+```python
+live = LiveReport(chart)
+live.post_many([Entry("cash", "equity", 100)])  # {"trial_balance", "balance_sheet"}
+live.balance_sheet  # computed now
+live.balance_sheet  # same object, nothing was posted
+```
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from abacus.core import (
+    PROFIT_TYPES,
+    AbacusError,
+    Amount,
+    Chart,
+    Entry,
+    Ledger,
+    Report,
+    Statement,
+    account_signs,
+    add_signed,
+    check_accounts,
+    signed_ledger,
+)
+
+__all__ = ["LiveReport"]
+
+KINDS = ("trial_balance", "balance_sheet", "income_statement")
+
+
+@dataclass
+class LiveReport:
+    chart: Chart
+    # debit balances are positive and credit balances are negative
+    balances: dict[str, Amount] = field(default_factory=dict)
+    count: int = 0
+
+    def __post_init__(self):
+        ledger = self.chart.ledger()
+        self._signs = account_signs(ledger)
+        self._profit = {
+            name
+            for name, account in ledger.items()
+            if isinstance(account, PROFIT_TYPES)
+        }
+        self._statements: dict[str, Statement] = {}
+
+    def post_many(self, entries: Iterable[Entry]) -> set[str]:
+        """Post entries and return kinds of statements that changed."""
+        entries = list(entries)
+        check_accounts(entries, self._signs)
+        add_signed(self.balances, entries)
+        self.count += len(entries)
+        changed = set()
+        if entries:
+            changed = {"trial_balance", "balance_sheet"}
+        if any(e.debit in self._profit or e.credit in self._profit for e in entries):
+            changed.add("income_statement")
+        for kind in changed:
+            self._statements.pop(kind, None)
+        return changed
+
+    def post(self, debit: str, credit: str, amount: Amount) -> set[str]:
+        return self.post_many([Entry(debit, credit, amount)])
+
+    def ledger(self) -> Ledger:
+        """Condensed ledger with current balances."""
+        return signed_ledger(self.chart, self.balances)
+
+    def statement(self, kind: str) -> Statement:
+        """Return statement of `kind`, computed again only after changes."""
+        if kind not in KINDS:
+            raise AbacusError(f"Statement must be one of {KINDS}, got {kind}.")
+        if kind not in self._statements:
+            report = Report(self.chart, self.ledger())
+            self._statements[kind] = getattr(report, kind)
+        return self._statements[kind]
+
+    @property
+    def trial_balance(self):
+        return self.statement("trial_balance")
+
+    @property
+    def balance_sheet(self):
+        return self.statement("balance_sheet")
+
+    @property
+    def income_statement(self):
+        return self.statement("income_statement")
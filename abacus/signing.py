@@ -0,0 +1,60 @@
+"""Pickled cache files signed with a key kept in user home directory.
+
+Cache files are written next to chart and store files, so a project
+folder from an untrusted source may contain cache files made to run
+code when unpickled. A cache file is unpickled only if its HMAC
+matches the key of current user, so only files written by this user
+are trusted.
+
+Key file is `~/.cache/abacus/key`, or the path in `ABACUS_KEY_FILE`
+environment variable. It is created on first use.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+__all__ = ["dumps", "loads"]
+
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def key_path() -> Path:
+    if path := os.environ.get("ABACUS_KEY_FILE"):
+        return Path(path)
+    return Path.home() / ".cache" / "abacus" / "key"
+
+
+def key() -> bytes:
+    """Read signing key or create it. Raise OSError if key is not available."""
+    path = key_path()
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    new_key = os.urandom(32)
+    # key is readable by owner only, do not overwrite key made by other process
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(new_key)
+    return new_key
+
+
+def dumps(obj: Any) -> bytes:
+    """Pickle `obj` and prepend HMAC of the pickle."""
+    payload = pickle.dumps(obj)
+    return hmac.new(key(), payload, hashlib.sha256).digest() + payload
+
+
+def loads(data: bytes) -> Any:
+    """Unpickle data written by `dumps()`. Raise ValueError if HMAC does
+    not match, the data is not unpickled in this case."""
+    mac, payload = data[:DIGEST_SIZE], data[DIGEST_SIZE:]
+    expected = hmac.new(key(), payload, hashlib.sha256).digest()
+    if not hmac.compare_digest(mac, expected):
+        raise ValueError("Cache file signature does not match.")
+    return pickle.loads(payload)
@@ -0,0 +1,230 @@
+"""Receivable and payable sub-ledgers with open items by counterparty.
+
+Sub-ledger keeps invoices of every customer or vendor as open items and
+matches payments to them, oldest first. General ledger gets summary
+entries to the control account (like `ar` or `ap`) grouped by accounts
+and date, so counterparty detail does not add accounts or entries
+to `Ledger`.
+
+Example:
+
+```python
+ar = SubLedger("ar")
+ar.invoice("acme", 100, date="2024-01-05", document="INV-1")
+ar.payment("acme", 60, date="2024-01-20")
+ar.open_items("acme")  # [OpenItem("INV-1", "2024-01-05", 40, ...)]
+ledger.post_many(ar.summary_entries())  # Entry("ar", "sales", 100), Entry("cash", "ar", 60)
+```
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from abacus.core import AbacusError, Amount, Entry
+
+__all__ = ["OpenItem", "SubLedger"]
+
+
+@dataclass
+class OpenItem:
+    """Invoice with amount not yet paid."""
+
+    document: str
+    date: str
+    amount: Amount
+    due: str | None = None
+    original: Amount = 0
+
+    def __post_init__(self):
+        if not self.original:
+            self.original = self.amount
+
+    @property
+    def due_date(self) -> str:
+        return self.due or self.date
+
+
+@dataclass
+class SubLedger:
+    """Open items by counterparty for `control` account.
+
+    Receivable sub-ledger (`debit=True`) debits control account
+    on invoice and credits it on payment, payable sub-ledger does
+    the opposite. Amounts are positive, balance of a counterparty
+    is open invoices less unapplied payments.
+    """
+
+    control: str
+    debit: bool = True
+    # account credited on receivable invoice or debited on payable invoice
+    invoice_account: str = "sales"
+    payment_account: str = "cash"
+    items: dict[str, deque[OpenItem]] = field(default_factory=dict)
+    # payments not applied to invoices by counterparty
+    credits: dict[str, Amount] = field(default_factory=dict)
+    # changes of account balances waiting for `summary_entries()`
+    pending: dict[tuple[str, str, str | None], Amount] = field(default_factory=dict)
+
+    @classmethod
+    def receivable(cls, control: str = "ar", invoice_account: str = "sales"):
+        return cls(control, True, invoice_account)
+
+    @classmethod
+    def payable(cls, control: str = "ap", expense_account: str = "purchases"):
+        return cls(control, False, expense_account)
+
+    def _pending(self, debit: str, credit: str, date: str | None, amount: Amount):
+        key = (debit, credit, date)
+        self.pending[key] = self.pending.get(key, 0) + amount
+
+    def _increase(self, account: str, date: str | None, amount: Amount):
+        if self.debit:
+            self._pending(self.control, account, date, amount)
+        else:
+            self._pending(account, self.control, date, amount)
+
+    def _decrease(self, account: str, date: str | None, amount: Amount):
+        if self.debit:
+            self._pending(account, self.control, date, amount)
+        else:
+            self._pending(self.control, account, date, amount)
+
+    def invoice(
+        self,
+        counterparty: str,
+        amount: Amount,
+        date: str,
+        document: str = "",
+        due: str | None = None,
+        account: str | None = None,
+    ):
+        """Add open item, unapplied payments of counterparty are applied first."""
+        if amount <= 0:
+            raise AbacusError(f"Invoice amount must be positive, got {amount}.")
+        self._increase(account or self.invoice_account, date, amount)
+        open_amount = amount
+        if credit := self.credits.get(counterparty, 0):
+            applied = min(credit, amount)
+            self._set_credit(counterparty, credit - applied)
+            open_amount -= applied
+        if open_amount:
+            item = OpenItem(document, date, open_amount, due, amount)
+            self.items.setdefault(counterparty, deque()).append(item)
+        return self
+
+    def payment(
+        self,
+        counterparty: str,
+        amount: Amount,
+        date: str,
+        document: str | None = None,
+        account: str | None = None,
+    ) -> list[tuple[OpenItem, Amount]]:
+        """Apply payment to invoice `document` if given, then to oldest
+        open items. Return items and amounts applied to them, amount
+        left after all items are paid is kept as unapplied payment."""
+        if amount <= 0:
+            raise AbacusError(f"Payment amount must be positive, got {amount}.")
+        self._decrease(account or self.payment_account, date, amount)
+        queue = self.items.get(counterparty, deque())
+        applied = []
+        if document is not None:
+            for item in queue:
+                if item.document == document:
+                    paid = min(item.amount, amount)
+                    item.amount -= paid
+                    amount -= paid
+                    applied.append((item, paid))
+                    break
+        while amount and queue:
+            item = queue[0]
+            paid = min(item.amount, amount)
+            item.amount -= paid
+            amount -= paid
+            if paid:
+                applied.append((item, paid))
+            if not item.amount:
+                queue.popleft()
+        # invoice paid by document may be in the middle of the queue
+        if document is not None and any(not item.amount for item in queue):
+            self.items[counterparty] = deque(x for x in queue if x.amount)
+        if counterparty in self.items and not self.items[counterparty]:
+            del self.items[counterparty]
+        if amount:
+            self._set_credit(counterparty, self.credits.get(counterparty, 0) + amount)
+        return applied
+
+    def _set_credit(self, counterparty: str, amount: Amount):
+        if amount:
+            self.credits[counterparty] = amount
+        else:
+            self.credits.pop(counterparty, None)
+
+    @classmethod
+    def from_entries(
+        cls, control: str, entries: Iterable[Entry], by: str, debit: bool = True
+    ):
+        """Build sub-ledger from entries to `control` account that have
+        counterparty in `by` dimension, other entries are skipped.
+        Entries without date are skipped too, as open items need dates."""
+        ledger = cls(control, debit)
+        for entry in entries:
+            counterparty = (entry.dimensions or {}).get(by)
+            if counterparty is None or entry.date is None:
+                continue
+            increase = entry.debit if debit else entry.credit
+            decrease = entry.credit if debit else entry.debit
+            if increase == control:
+                other = entry.credit if debit else entry.debit
+                ledger.invoice(counterparty, entry.amount, entry.date, account=other)
+            elif decrease == control:
+                other = entry.debit if debit else entry.credit
+                ledger.payment(counterparty, entry.amount, entry.date, account=other)
+        # entries are already in general ledger
+        ledger.pending = {}
+        return ledger
+
+    def open_items(self, counterparty: str) -> list[OpenItem]:
+        return list(self.items.get(counterparty, []))
+
+    def all_open_items(self) -> Iterable[tuple[str, OpenItem]]:
+        for counterparty, queue in self.items.items():
+            for item in queue:
+                yield counterparty, item
+
+    def balance(self, counterparty: str) -> Amount:
+        open_amount = sum(item.amount for item in self.items.get(counterparty, []))
+        return open_amount - self.credits.get(counterparty, 0)
+
+    def balances(self) -> dict[str, Amount]:
+        names = list(self.items) + [n for n in self.credits if n not in self.items]
+        return {name: self.balance(name) for name in names}
+
+    def total(self) -> Amount:
+        """Sub-ledger total, equals control account balance if all
+        summary entries were posted."""
+        return sum(item.amount for _, item in self.all_open_items()) - sum(
+            self.credits.values()
+        )
+
+    def aging(
+        self, as_of: str, days: tuple[int, ...] = (30, 60, 90)
+    ) -> dict[str, list[Amount]]:
+        """Open amounts by counterparty in buckets of days past due date:
+        not due, 1 to 30 days, 31 to 60 days and so on, last bucket
+        is more than `days[-1]` days. Unapplied payments are not included.
+        See `abacus.aging` for cached reports."""
+        from abacus.aging import Aging
+
+        return Aging.from_subledger(self).report(as_of, days).rows
+
+    def summary_entries(self) -> list[Entry]:
+        """Return entries for general ledger, one entry for every pair of
+        accounts and date since last call."""
+        entries = [
+            Entry(debit, credit, amount, date=date)
+            for (debit, credit, date), amount in self.pending.items()
+        ]
+        self.pending = {}
+        return entries
@@ -0,0 +1,109 @@
+"""Account balances over time.
+
+Balances are computed in one pass over entries: changes of account balances
+are summed by period and cumulative sums give balances at period end.
+Entries without date are treated as opening balances.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable
+
+from abacus.core import AbacusError, Amount, Chart, Entry, account_signs
+
+__all__ = ["BalanceSeries", "balance_series"]
+
+FREQUENCIES = ("entry", "day", "month")
+
+
+@dataclass
+class BalanceSeries:
+    """Balances of accounts at the end of each period, stored as columns."""
+
+    periods: list[str]
+    columns: dict[str, list[Amount]]
+
+    def to_dict(self) -> dict[str, list]:
+        return {"period": self.periods, **self.columns}
+
+    def rows(self) -> Iterable[tuple]:
+        return zip(self.periods, *self.columns.values())
+
+    def __len__(self):
+        return len(self.periods)
+
+
+def period_key(entry: Entry, freq: str) -> str:
+    if entry.date is None:
+        return ""
+    if freq == "day":
+        return entry.date[:10]
+    return entry.date[:7]
+
+
+def next_period(period: str, freq: str) -> str:
+    if freq == "day":
+        return (date.fromisoformat(period) + timedelta(days=1)).isoformat()
+    year, month = map(int, period.split("-"))
+    return f"{year + month // 12}-{month % 12 + 1:02d}"
+
+
+def fill_periods(periods: list[str], freq: str) -> list[str]:
+    """Add periods without entries between first and last dated period."""
+    dated = [p for p in periods if p]
+    if not dated:
+        return periods
+    result = [""] if "" in periods else []
+    p = dated[0]
+    while p <= dated[-1]:
+        result.append(p)
+        p = next_period(p, freq)
+    return result
+
+
+def balance_series(
+    chart: Chart,
+    entries: Iterable[Entry],
+    accounts: Iterable[str],
+    freq: str = "day",
+    fill: bool = True,
+) -> BalanceSeries:
+    """Return balances of `accounts` after each entry (`freq="entry"`)
+    or at the end of each day or month (`freq="day"` or `freq="month"`).
+
+    With `fill=True` days or months without entries are included.
+    """
+    if freq not in FREQUENCIES:
+        raise AbacusError(f"Frequency must be one of {FREQUENCIES}, got {freq}.")
+    ledger = chart.ledger()
+    accounts = list(accounts)
+    for name in accounts:
+        if name not in ledger:
+            raise AbacusError(f"Account {name} not in chart.")
+    signs = {
+        name: sign for name, sign in account_signs(ledger).items() if name in accounts
+    }
+    changes: dict[str, dict[str, Amount]] = {}
+    for i, entry in enumerate(entries):
+        if entry.debit not in signs and entry.credit not in signs:
+            continue
+        key = str(i) if freq == "entry" else period_key(entry, freq)
+        delta = changes.setdefault(key, {})
+        if entry.debit in signs:
+            delta[entry.debit] = delta.get(entry.debit, 0) + entry.amount
+        if entry.credit in signs:
+            delta[entry.credit] = delta.get(entry.credit, 0) - entry.amount
+    if freq == "entry":
+        periods = list(changes.keys())
+    else:
+        periods = sorted(changes.keys())
+        if fill:
+            periods = fill_periods(periods, freq)
+    columns: dict[str, list[Amount]] = {name: [] for name in accounts}
+    running = dict.fromkeys(accounts, 0)
+    for period in periods:
+        for name, amount in changes.get(period, {}).items():
+            running[name] += amount
+        for name in accounts:
+            columns[name].append(signs[name] * running[name])
+    return BalanceSeries(periods, columns)
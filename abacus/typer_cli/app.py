@@ -1,15 +1,24 @@
 """Typer app, including Click subcommand."""
 import sys
+import functools
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 import typer
 from typing_extensions import Annotated
 
-from abacus.core import BalanceSheet, IncomeStatement, Pipeline, TrialBalance
+from abacus.core import (
+    AbacusError,
+    BalanceSheet,
+    IncomeStatement,
+    Pipeline,
+    TrialBalance,
+)
 from abacus.entries_store import LineJSON
 from abacus.typer_cli.base import (
     get_chart,
+    get_compiled_chart,
     get_ledger,
     get_ledger_income_statement,
     get_store,
@@ -18,7 +27,7 @@ from abacus.typer_cli.chart import chart
 from abacus.typer_cli.ledger import ledger
 from abacus.typer_cli.post import postx
 from abacus.typer_cli.show import show
-from abacus.user_chart import UserChart
+from abacus.user_chart import CompiledChart, UserChart
 
 app = typer.Typer(
     add_completion=False, help="A minimal yet valid double entry accounting system."
@@ -48,15 +57,17 @@ def init():
 @app.command(name="assert")
 def assert_(
     name: str,
-    balance: int,
+    balance: str,
     chart_file: Optional[Path] = None,
     ledger_file: Optional[Path] = None,
 ):
     """Verify account balance."""
+    precision = get_chart(chart_file).precision
     ledger = get_ledger(chart_file, ledger_file)
     fact = ledger.balances[name]
-    if not fact == balance:
-        sys.exit(f"Account {name} balance is {fact}, expected {balance}.")
+    if not fact == precision.to_amount(balance):
+        fact_str = precision.format(fact)
+        sys.exit(f"Account {name} balance is {fact_str}, expected {balance}.")
 
 
 @app.command()
@@ -86,32 +97,195 @@ def report(
     all_reports: Annotated[
         bool, typer.Option("--all", help="Show all statements.")
     ] = False,
-    json: bool = False,
+    json: Annotated[
+        bool, typer.Option("--json", help="Same as --format json.")
+    ] = False,
+    format: Annotated[
+        Optional[str],
+        typer.Option(help="Write statement as json, csv, arrow or parquet."),
+    ] = None,
+    output: Annotated[
+        Optional[Path],
+        typer.Option(help="File to write to, required for arrow and parquet."),
+    ] = None,
+    year: Annotated[
+        Optional[int],
+        typer.Option(help="Show monthly statements, year to date and previous year."),
+    ] = None,
+    budget: Annotated[
+        Optional[Path],
+        typer.Option(help="Compare actual amounts by month with budget JSON file."),
+    ] = None,
+    by: Annotated[
+        Optional[str],
+        typer.Option(help="Dimension of budget or aging, for example customer."),
+    ] = None,
+    aging: Annotated[
+        Optional[str],
+        typer.Option(help="Show aging of open items in receivable or payable account."),
+    ] = None,
+    as_of: Annotated[
+        Optional[str],
+        typer.Option(help="Aging date like 2024-03-31, today by default."),
+    ] = None,
+    keep_cache: Annotated[
+        bool, typer.Option("--cache", help="Keep statements in file next to store.")
+    ] = False,
 ):
     """Show reports."""
     from abacus.viewers import print_viewers
 
-    ledger = get_ledger().condense()
-    rename_dict = UserChart.load().rename_dict
-    t = TrialBalance.new(ledger)
-    b = BalanceSheet.new(ledger)
-    i = IncomeStatement.new(get_ledger_income_statement().condense())
-    if trial_balance and not all_reports:
-        t.viewer.print()
-    if balance_sheet and not all_reports:
-        b.viewer.use(rename_dict).print()
-    if income_statement and not all_reports:
-        if json:
-            ...
-        else:
-            i.viewer.use(rename_dict).print()
-    if all_reports:
+    if year is not None:
+        if json or format is not None or output is not None or trial_balance:
+            sys.exit(
+                "Use --year with -b, -i or --all flags only, export is not supported."
+            )
+        show_b = balance_sheet or all_reports or not income_statement
+        show_i = income_statement or all_reports or not balance_sheet
+        return comparative_report(year, show_b, show_i)
+    if budget is not None:
+        return variance_report(budget, by, "json" if json else format, output)
+    if aging is not None:
+        return aging_report(
+            aging, by, as_of, "json" if json else format, output, keep_cache
+        )
+    if not (trial_balance or balance_sheet or income_statement or all_reports):
+        sys.exit("No reports selected. Use -t, -b, -i or --all flags.")
+    compiled = get_compiled_chart()
+    rename_dict = compiled.rename_dict
+    precision = compiled.chart.precision
+    ledger = functools.cache(lambda: get_ledger().condense())
+    cached = StatementCache(compiled, persist=keep_cache)
+    t = b = i = None
+    if trial_balance or all_reports:
+        t = cached.get("trial_balance", lambda: TrialBalance.new(ledger()))
+    if balance_sheet or all_reports:
+        b = cached.get("balance_sheet", lambda: BalanceSheet.new(ledger()))
+    if income_statement or all_reports:
+        i = cached.get(
+            "income_statement",
+            lambda: IncomeStatement.new(get_ledger_income_statement().condense()),
+        )
+    statements = [s for s in (t, b, i) if s is not None]
+    if json:
+        format = "json"
+    if format is not None:
+        return export_report(statements, format, output, precision)
+    if all_reports and t is not None and b is not None and i is not None:
         tv = t.viewer
         bv = b.viewer.use(rename_dict)
         iv = i.viewer.use(rename_dict)
-        print_viewers({}, tv, bv, iv)
-    if not (trial_balance or balance_sheet or income_statement or all_reports):
-        sys.exit("No reports selected. Use -t, -b, -i or --all flags.")
+        return print_viewers({}, tv, bv, iv, precision)
+    if t is not None:
+        t.viewer.use_precision(precision).print()
+    if b is not None:
+        b.viewer.use(rename_dict).use_precision(precision).print()
+    if i is not None:
+        i.viewer.use(rename_dict).use_precision(precision).print()
+
+
+@dataclass
+class StatementCache:
+    """Statements computed again only if entries were posted or chart
+    changed. Statements are kept in file next to store if `persist` is set."""
+
+    compiled: CompiledChart
+    persist: bool = False
+
+    def __post_init__(self):
+        from abacus.report_cache import ReportCache
+
+        self.store = get_store()
+        path = self.store.reports_path if self.persist else None
+        self.cache = ReportCache(path=path)
+
+    def get(self, kind: str, compute):
+        key = self.cache.key(
+            self.compiled.digest, self.store.state(), self.compiled.rename_dict, kind
+        )
+        return self.cache.get(key, compute)
+
+
+def export_report(statements, format: str, output: Path | None, precision):
+    from abacus.export import write
+
+    if len(statements) != 1:
+        sys.exit("Choose one statement with -t, -b or -i flag to export.")
+    try:
+        write(statements[0], format, sys.stdout, output, precision)
+    except AbacusError as e:
+        sys.exit(str(e))
+
+
+def comparative_report(year: int, balance_sheet=True, income_statement=True):
+    from abacus.periods import ComparativeReport, monthly_columns
+
+    compiled = get_compiled_chart()
+    entries = get_store().yield_entries()
+    report = ComparativeReport.from_entries(
+        compiled.chart, entries, monthly_columns(year)
+    )
+    viewers = []
+    if income_statement:
+        viewers.append(report.income_statement_viewer)
+    if balance_sheet:
+        viewers.append(report.balance_sheet_viewer)
+    for viewer in viewers:
+        viewer.use(compiled.rename_dict).use_precision(compiled.chart.precision).print()
+
+
+def variance_report(path: Path, by: str | None, format, output: Path | None):
+    from abacus.budget import Budget, VarianceReport
+
+    compiled = get_compiled_chart()
+    precision = compiled.chart.precision
+    try:
+        budget = Budget.load(path, precision, by)
+        report = VarianceReport.from_entries(
+            compiled.chart, budget, get_store().yield_entries()
+        )
+    except AbacusError as e:
+        sys.exit(str(e))
+    if format is not None:
+        return export_report([report], format, output, precision)
+    report.viewer.use(compiled.rename_dict).use_precision(precision).print()
+
+
+def aging_report(
+    account: str,
+    by,
+    as_of: str | None,
+    format,
+    output: Path | None,
+    persist: bool = False,
+):
+    from datetime import date
+
+    from abacus.aging import Aging
+    from abacus.core import DebitAccount
+
+    if by is None:
+        sys.exit("Use --by to set counterparty dimension for aging.")
+    as_of = as_of or date.today().isoformat()
+    compiled = get_compiled_chart()
+    precision = compiled.chart.precision
+    if account not in (ledger := compiled.chart.ledger()):
+        sys.exit(f"Account {account} not in chart.")
+    debit = isinstance(ledger[account], DebitAccount)
+
+    def compute():
+        entries = get_store().yield_entries()
+        return Aging.from_entries(account, entries, by, debit).report(as_of)
+
+    try:
+        report = StatementCache(compiled, persist).get(
+            f"aging:{account}:{by}:{as_of}", compute
+        )
+    except (AbacusError, ValueError) as e:
+        sys.exit(str(e))
+    if format is not None:
+        return export_report([report], format, output, precision)
+    report.viewer.use(compiled.rename_dict).use_precision(precision).print()
 
 
 @app.command()
@@ -122,8 +296,10 @@ def unlink(
 ):
     """Permanently delete project files in current directory."""
     if yes:
-        UserChart.default()._path.unlink(missing_ok=True)
-        LineJSON.load().path.unlink(missing_ok=True)
+        path = UserChart.default()._path
+        path.unlink(missing_ok=True)
+        CompiledChart.cache_path(path).unlink(missing_ok=True)
+        LineJSON.load().unlink()
 
 
 combined_typer_click_app = typer.main.get_command(app)
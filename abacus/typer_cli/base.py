@@ -1,31 +1,70 @@
 """Navigation for CLI."""
 
-from abacus.core import Chart, Ledger
+from datetime import date
+
+from abacus.core import AbacusError, Amount, Chart, Ledger, Precision
 from abacus.entries_store import LineJSON
-from abacus.user_chart import UserChart
+from abacus.user_chart import CompiledChart, label_name
 
 
 def last(label: str) -> str:
-    return label.split(":")[-1]
+    return label_name(label)
+
+
+def parse_dimensions(items: list[str] | None) -> dict[str, str] | None:
+    """Convert strings like "region=EU" to dimensions dictionary."""
+    if not items:
+        return None
+    try:
+        return dict(item.split("=", 1) for item in items)  # type: ignore
+    except ValueError:
+        raise AbacusError(f"Dimensions must look like name=value, got {items}.")
+
+
+def parse_date(s: str | None) -> str | None:
+    """Check date is an ISO date string like 2024-01-31."""
+    if s is None:
+        return None
+    try:
+        return date.fromisoformat(s).isoformat()
+    except ValueError:
+        raise AbacusError(f"Date must look like 2024-01-31, got {s}.")
 
 
 def get_store(store_file=None) -> LineJSON:
     return LineJSON.load(store_file)
 
 
+def get_compiled_chart(chart_file=None) -> CompiledChart:
+    return CompiledChart.load(chart_file)
+
+
 def get_chart(chart_file=None) -> Chart:
-    return UserChart.load(chart_file).chart()
+    return get_compiled_chart(chart_file).chart
+
+
+def get_precision(chart_file=None) -> Precision:
+    try:
+        return get_chart(chart_file).precision
+    except FileNotFoundError:
+        return Precision()
+
+
+def to_amount(value: str, chart_file=None) -> Amount:
+    """Convert amount from command line to minor units using chart precision."""
+    return get_precision(chart_file).to_amount(value)
 
 
 def get_ledger(chart_file=None, store_file=None) -> Ledger:
-    chart = get_chart(chart_file)
+    compiled = get_compiled_chart(chart_file)
     store = get_store(store_file)
-    return chart.ledger().post_many(entries=store.yield_entries())
+    return compiled.ledger().post_many(entries=store.yield_entries())
 
 
 def get_ledger_income_statement(chart_file=None, store_file=None) -> Ledger:
-    chart = get_chart(chart_file)
+    compiled = get_compiled_chart(chart_file)
+    chart = compiled.chart
     store = get_store(store_file)
-    ledger = chart.ledger()
+    ledger = compiled.ledger()
     ledger.post_many(entries=store.yield_entries_for_income_statement(chart))
     return ledger
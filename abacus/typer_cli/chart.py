@@ -6,7 +6,9 @@ import typer
 from typing_extensions import Annotated
 
 from abacus.core import AbacusError
-from abacus.typer_cli.base import UserChart, last
+from abacus.entries_store import LineJSON
+from abacus.typer_cli.base import last
+from abacus.user_chart import CompiledChart, UserChart, read_rows, write_rows
 
 chart = typer.Typer(help="Modify chart of accounts.", add_completion=False)
 
@@ -90,10 +92,19 @@ def set(
     income_summary_account: Optional[str] = None,
     retained_earnings_account: Optional[str] = None,
     null_account: Optional[str] = None,
+    precision: Annotated[
+        Optional[int], typer.Option(help="Set number of decimal places in amounts.")
+    ] = None,
     chart_file: Optional[Path] = None,
+    store_file: Optional[Path] = None,
 ):
-    """Set income summary, retained earnings or null accounts."""
-    if not (income_summary_account or retained_earnings_account or null_account):
+    """Set income summary, retained earnings or null accounts and amount precision."""
+    if not (
+        income_summary_account
+        or retained_earnings_account
+        or null_account
+        or precision is not None
+    ):
         sys.exit("No changes made.")
     user_chart = UserChart.load(chart_file)
     if income_summary_account:
@@ -105,9 +116,23 @@ def set(
     if null_account:
         user_chart.set_null(null_account)
         print(f"New null account is {null_account}.")
+    if precision is not None:
+        if precision != user_chart.precision.places and has_entries(store_file):
+            # stored amounts are in minor units of current precision
+            sys.exit("Cannot change precision after entries were posted to ledger.")
+        try:
+            user_chart.set_precision(precision)
+        except AbacusError as e:
+            sys.exit(str(e))
+        print(f"Amounts will have {precision} decimal places.")
     user_chart.save()
 
 
+def has_entries(store_file: Optional[Path]) -> bool:
+    path = LineJSON.load(store_file).path
+    return path.exists() and path.stat().st_size > 0
+
+
 @chart.command()
 def name(account_name: str, title: str, chart_file: Optional[Path] = None):
     """Set account title."""
@@ -130,6 +155,29 @@ def offset(name: str, contra_names: list[str], chart_file: Optional[Path] = None
     print(f"Added contra account{s} for {name}:", spaced(contra_names))
 
 
+@chart.command(name="import")
+def import_(file: Path, chart_file: Optional[Path] = None):
+    """Import accounts from CSV or JSON file."""
+    assure_chart_file_exists(chart_file)
+    user_chart = UserChart.load(chart_file)
+    try:
+        user_chart.use_rows(read_rows(file)).save()
+    except AbacusError as e:
+        errors = e.args[0] if isinstance(e.args[0], list) else [e.args[0]]
+        for message in errors:
+            print(message)
+        sys.exit(f"Chart not changed, found {len(errors)} error(s) in {file}.")
+    print(f"Imported chart from {file}.")
+
+
+@chart.command()
+def export(file: Path, chart_file: Optional[Path] = None):
+    """Export accounts to CSV or JSON file."""
+    assure_chart_file_exists(chart_file)
+    write_rows(UserChart.load(chart_file).to_rows(), file)
+    print(f"Exported chart to {file}.")
+
+
 @chart.command()
 def show(chart_file: Optional[Path] = None):
     """Print chart."""
@@ -144,4 +192,6 @@ def unlink(
     """Permanently delete chart file in current directory."""
 
     if yes:
-        UserChart.default()._path.unlink(missing_ok=True)
+        path = UserChart.default()._path
+        path.unlink(missing_ok=True)
+        CompiledChart.cache_path(path).unlink(missing_ok=True)
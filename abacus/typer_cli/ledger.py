@@ -1,14 +1,21 @@
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 from typing_extensions import Annotated
 
-from abacus.core import AbacusError, AccountBalances, Amount, Entry, starting_entries
+from abacus.core import AbacusError, AccountBalances, Entry, starting_entries
 from abacus.entries_store import LineJSON
-from abacus.typer_cli.base import last
+from abacus.typer_cli.base import (
+    get_chart,
+    last,
+    parse_date,
+    parse_dimensions,
+    to_amount,
+)
 from abacus.user_chart import UserChart
+from abacus.validation import Validator
 
 A = Annotated[list[str], typer.Option()]
 ledger = typer.Typer(help="Modify ledger.", add_completion=False)
@@ -25,12 +32,13 @@ def assure_ledger_file_exists(store_file):
 @ledger.command()
 def init():
     """Initialize ledger file in current directory."""
-    store_path = LineJSON.load(None).path
-    if store_path.exists():
-        print(f"Ledger file ({store_path}) already exists.")
+    store = LineJSON.load(None)
+    if store.path.exists():
+        print(f"Ledger file ({store.path}) already exists.")
     else:
-        store_path.touch()
-        print(f"Created empty ledger file ({store_path}).")
+        store.path.touch()
+        store.index_path.touch()
+        print(f"Created empty ledger file ({store.path}).")
 
 
 @ledger.command()
@@ -40,24 +48,99 @@ def load(
     """Load starting balances to ledger from JSON file."""
     store = LineJSON.load(store_file)
     # FIXME: store must be empty for load() command
-    balances = AccountBalances.load(file)
     chart = UserChart.load(chart_file).chart()
-    entries = starting_entries(chart, balances)
+    balances = AccountBalances.load(file, chart.precision)
+    try:
+        entries = starting_entries(chart, balances)
+        validator = Validator.from_chart(chart, allow_zero=True, allow_negative=True)
+        validator.check(entries)
+    except (AbacusError, KeyError) as e:
+        sys.exit(str(e))
     store.append_many(entries)
     print("Posted starting balances to ledger:", entries)
 
 
 @ledger.command()
-def post(
-    debit: str,
-    credit: str,
-    amount: Amount,
-    title: Optional[str] = None,
+def ingest(
+    files: list[Path],
     chart_file: Optional[Path] = None,
     store_file: Optional[Path] = None,
+    batch_size: Annotated[
+        int, typer.Option(help="Entries written to ledger at once.")
+    ] = 1_000,
 ):
-    """Post double entry."""
+    """Post entries from several CSV or JSON lines files concurrently."""
+    import asyncio
+
+    from abacus.ingest import Ingestor, from_file
+
     assure_ledger_file_exists(store_file)
+    chart = UserChart.load(chart_file).chart()
+    ingestor = Ingestor(chart, LineJSON.load(store_file), batch_size=batch_size)
+    sources = [from_file(file, chart.precision) for file in files]
+    try:
+        metrics = asyncio.run(ingestor.run(*sources))
+    except (AbacusError, OSError, ValueError) as e:
+        sys.exit(str(e))
+    print(metrics)
+    for entry, reason in ingestor.rejected:
+        print("Rejected:", entry, reason)
+    if ingestor.rejected:
+        sys.exit(1)
+
+
+@ledger.command()
+def reconcile(
+    bank_file: Path,
+    cash: Annotated[str, typer.Option(help="Cash account in ledger.")] = "cash",
+    suspense: Annotated[
+        str, typer.Option(help="Account for unmatched bank lines.")
+    ] = "suspense",
+    window: Annotated[int, typer.Option(help="Days between bank and entry.")] = 3,
+    post: Annotated[
+        bool, typer.Option(help="Post adjusting entries for unmatched bank lines.")
+    ] = False,
+    chart_file: Optional[Path] = None,
+    store_file: Optional[Path] = None,
+):
+    """Match bank statement CSV file with entries to cash account."""
+    from abacus.reconciliation import Reconciler, book_items, read_bank_csv
+
+    assure_ledger_file_exists(store_file)
+    chart = UserChart.load(chart_file).chart()
+    store = LineJSON.load(store_file)
+    try:
+        with open(bank_file, "r", newline="", encoding="utf-8") as file:
+            bank = read_bank_csv(file, chart.precision)
+        book = book_items(cash, store.yield_entries())
+        result = Reconciler(window=window).match(bank, book)
+        entries = result.adjusting_entries(cash, suspense)
+        if post:
+            Validator.from_chart(chart).check(entries)
+    except (AbacusError, OSError) as e:
+        sys.exit(str(e))
+    fmt = chart.precision.format
+    print(f"Matched {len(result.matches)} of {len(bank)} bank lines.")
+    for line in result.unmatched_bank:
+        print("Unmatched bank line:", line.date, fmt(line.amount), line.description)
+    for item in result.unmatched_book:
+        print("Unmatched entry:", item.entry)
+    if post:
+        store.append_many(entries)
+        print("Posted adjusting entries:", entries)
+
+
+def make_entry(
+    debit: str,
+    credit: str,
+    amount: str,
+    chart_file: Optional[Path] = None,
+    dim: Optional[List[str]] = None,
+    date: Optional[str] = None,
+) -> Entry:
+    """Create entry from command line arguments. Accounts with labels
+    like "asset:cash" are added to chart. Raise AbacusError if amount,
+    dimensions or date cannot be parsed."""
     if ":" in debit:
         try:
             UserChart.load(chart_file).use(debit).save()
@@ -70,8 +153,46 @@ def post(
         except AbacusError:
             pass
         credit = last(credit)
-    LineJSON.load(store_file).append(Entry(debit, credit, amount))
-    print(f"Debited {debit} {amount} and credited {credit} {amount}.")
+    value = to_amount(amount, chart_file)
+    dimensions = parse_dimensions(dim)
+    return Entry(debit, credit, value, dimensions=dimensions, date=parse_date(date))
+
+
+def post_entries(entries: list[Entry], chart_file, store_file):
+    """Validate all entries and write them to store at once."""
+    try:
+        Validator.from_chart(get_chart(chart_file)).check(entries)
+    except FileNotFoundError:
+        sys.exit("Chart file not found. Use `chart init` command to create it.")
+    except AbacusError as e:
+        sys.exit(str(e))
+    LineJSON.load(store_file).append_many(entries)
+
+
+@ledger.command()
+def post(
+    debit: str,
+    credit: str,
+    amount: str,
+    title: Optional[str] = None,
+    chart_file: Optional[Path] = None,
+    store_file: Optional[Path] = None,
+    dim: Annotated[
+        Optional[List[str]],
+        typer.Option(help="Entry dimension like cost_centre=sales."),
+    ] = None,
+    date: Annotated[
+        Optional[str], typer.Option(help="Entry date like 2024-01-31.")
+    ] = None,
+):
+    """Post double entry."""
+    assure_ledger_file_exists(store_file)
+    try:
+        entry = make_entry(debit, credit, amount, chart_file, dim, date)
+    except AbacusError as e:
+        sys.exit(str(e))
+    post_entries([entry], chart_file, store_file)
+    print(f"Debited {entry.debit} {amount} and credited {entry.credit} {amount}.")
     # FIXME: title is discarded
     print("Title:", title)
 
@@ -91,4 +212,4 @@ def unlink(
 ):
     """Permanently delete ledger file in current directory."""
     if yes:
-        LineJSON.load().path.unlink(missing_ok=True)
+        LineJSON.load().unlink()
@@ -1,12 +1,19 @@
 """Post entries to ledger."""
+import sys
 from pathlib import Path
 
 import click
 
 from abacus.core import AbacusError, CompoundEntry
 from abacus.typer_cli.base import get_chart, get_store, last
-from abacus.typer_cli.ledger import load, post
+from abacus.typer_cli.ledger import (
+    assure_ledger_file_exists,
+    load,
+    make_entry,
+    post_entries,
+)
 from abacus.user_chart import UserChart
+from abacus.validation import Validator
 
 
 def post_compound(debits, credits, title, chart_file, store_file):
@@ -18,10 +25,15 @@ def post_compound(debits, credits, title, chart_file, store_file):
             except AbacusError:
                 pass
         user_chart.save()
-    debits = [(last(name), value) for name, value in debits]
-    credits = [(last(name), value) for name, value in credits]
-    compound_entry = CompoundEntry(debits=debits, credits=credits)
     chart = get_chart(chart_file)
+    try:
+        debits = [(last(name), chart.precision.to_amount(v)) for name, v in debits]
+        credits = [(last(name), chart.precision.to_amount(v)) for name, v in credits]
+    except AbacusError as e:
+        sys.exit(str(e))
+    if problems := Validator.from_chart(chart).compound_messages(debits, credits):
+        sys.exit("\n".join(problems))
+    compound_entry = CompoundEntry(debits=debits, credits=credits)
     entries = compound_entry.to_entries(chart.null_account)
     store = get_store(store_file)
     store.append_many(entries)
@@ -30,13 +42,13 @@ def post_compound(debits, credits, title, chart_file, store_file):
 
 
 @click.command(name="post")
-@click.option("--entry", type=(str, str, int), multiple=True, help="Post double entry,")
+@click.option("--entry", type=(str, str, str), multiple=True, help="Post double entry,")
 @click.option(
-    "--debit", type=(str, int), multiple=True, help="Debit records for compound entry."
+    "--debit", type=(str, str), multiple=True, help="Debit records for compound entry."
 )
 @click.option(
     "--credit",
-    type=(str, int),
+    type=(str, str),
     multiple=True,
     help="Credit records for compound entry.",
 )
@@ -72,9 +84,16 @@ def postx(
         print(f"Loading starting balances from {starting_balances_file}...")
         load(starting_balances_file, chart_file, store_file)
     if entry:
-        for item in entry:
-            dr, cr, amount = item
-            post(dr, cr, amount, title, chart_file, store_file)
+        assure_ledger_file_exists(store_file)
+        try:
+            entries = [make_entry(*item, chart_file=chart_file) for item in entry]
+        except AbacusError as e:
+            sys.exit(str(e))
+        # all entries are validated before any is written
+        post_entries(entries, chart_file, store_file)
+        for x, (_, _, amount) in zip(entries, entry):
+            print(f"Debited {x.debit} {amount} and credited {x.credit} {amount}.")
+        print("Title:", title)
     if debit or credit:
         post_compound(debit, credit, title, chart_file, store_file)
     if strict:
@@ -1,11 +1,22 @@
+import sys
 from json import dumps
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 from typing_extensions import Annotated
 
-from abacus.typer_cli.base import get_ledger
+from abacus.core import AbacusError, AccountBalances, DebitAccount
+from abacus.cube import Cube
+from abacus.hierarchy import Rollup
+from abacus.timeseries import balance_series
+from abacus.typer_cli.base import (
+    get_chart,
+    get_compiled_chart,
+    get_ledger,
+    get_store,
+    parse_dimensions,
+)
 
 A = Annotated[list[str], typer.Option()]
 
@@ -13,21 +24,101 @@ show = typer.Typer(help="Show chart and account information.", add_completion=Fa
 
 
 @show.command()
-def account(name: str):
-    """Show account information."""
+def account(
+    name: str,
+    chart_file: Optional[Path] = None,
+    store_file: Optional[Path] = None,
+):
+    """Show account postings, running balance and totals."""
+    compiled = get_compiled_chart(chart_file)
+    if name not in compiled.index:
+        sys.exit(f"Account {name} not in chart.")
+    is_debit = isinstance(compiled.index[name].t_account(), DebitAccount)
+    fmt = compiled.chart.precision.format
+    debits = credits = 0
+    print("Side", "Amount", "Balance", "Account", sep="\t")
+    for entry in get_store(store_file).yield_account_entries(name):
+        if entry.debit == name:
+            debits += entry.amount
+            side, other = "debit", entry.credit
+        else:
+            credits += entry.amount
+            side, other = "credit", entry.debit
+        balance = debits - credits if is_debit else credits - debits
+        print(side, fmt(entry.amount), fmt(balance), other, sep="\t")
+    balance = debits - credits if is_debit else credits - debits
+    print(f"Debits: {fmt(debits)}, credits: {fmt(credits)}, balance: {fmt(balance)}.")
 
 
 @show.command()
 def balances(
     json: bool = True,
     nonzero: bool = False,
+    depth: Annotated[
+        Optional[int], typer.Option(help="Show sub-account totals at this level.")
+    ] = None,
+    by: Annotated[
+        Optional[List[str]], typer.Option(help="Group balances by dimension.")
+    ] = None,
+    where: Annotated[
+        Optional[List[str]],
+        typer.Option(help="Use entries with dimension value like region=EU."),
+    ] = None,
     chart_file: Optional[Path] = None,
     store_file: Optional[Path] = None,
 ):
     """Show account balances."""
+    if by or where:
+        try:
+            show_cube(
+                by or [], parse_dimensions(where) or {}, nonzero, chart_file, store_file
+            )
+        except AbacusError as e:
+            sys.exit(str(e))
+        return
     ledger = get_ledger(chart_file, store_file)
-    if nonzero:
-        data = ledger.balances.nonzero().data
+    if depth is None:
+        account_balances = ledger.balances
     else:
-        data = ledger.balances.data
-    print(dumps(data))
+        chart = get_chart(chart_file)
+        account_balances = Rollup.from_ledger(chart, ledger).balances(depth)
+    if nonzero:
+        account_balances = account_balances.nonzero()
+    precision = get_chart(chart_file).precision
+    print(AccountBalances(account_balances).json(precision, indent=None))
+
+
+def show_cube(by, where, nonzero, chart_file, store_file):
+    dimensions = list(dict.fromkeys(list(by) + list(where.keys())))
+    entries = get_store(store_file).yield_entries()
+    chart = get_chart(chart_file)
+    cube = Cube.from_entries(chart, dimensions, entries)
+    items = []
+    for key, account_balances in cube.balances(by, where).items():
+        label = ",".join(f"{d}={v}" for d, v in zip(by, key))
+        if nonzero:
+            account_balances = account_balances.nonzero()
+        items.append(f"{dumps(label)}: {account_balances.json(chart.precision, None)}")
+    print("{" + ", ".join(items) + "}")
+
+
+@show.command()
+def series(
+    names: List[str],
+    freq: Annotated[
+        str, typer.Option(help="Balance after each entry, day or month.")
+    ] = "day",
+    fill: Annotated[
+        bool, typer.Option(help="Include days or months without entries.")
+    ] = True,
+    chart_file: Optional[Path] = None,
+    store_file: Optional[Path] = None,
+):
+    """Show account balances over time as JSON columns."""
+    chart = get_chart(chart_file)
+    entries = get_store(store_file).yield_entries()
+    try:
+        result = balance_series(chart, entries, names, freq, fill)
+    except AbacusError as e:
+        sys.exit(str(e))
+    print(dumps(result.to_dict()))
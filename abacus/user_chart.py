@@ -1,12 +1,17 @@
 """User-defined chart of accounts."""
 
-from dataclasses import dataclass, field
+import csv
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Iterable
+from typing import ClassVar, Iterable
 
 from pydantic import BaseModel, PrivateAttr
 
-from abacus.core import AbacusError, Account, Chart, T
+from abacus import signing
+from abacus.core import AbacusError, Account, Chart, Holder, Ledger, Precision, T
 
 
 @dataclass
@@ -56,6 +61,7 @@ def extract(
 
     - "asset:cash"
     - "asset:cash,ap,inventory"
+    - "asset:cash:bank_a:eur,usd" (sub-accounts "cash:bank_a:eur" and "cash:bank_a:usd")
     - "income:sales"
     - "contra:sales:refunds"
     - "contra:sales:refunds,voids"
@@ -71,16 +77,115 @@ def extract(
         case [composer.contra, name, contra_name]:
             for contra_name_part in contra_name.split(","):
                 yield Offset(name, contra_name_part)
+        case [prefix, *path, name] if prefix != composer.contra:
+            t = composer.select(prefix)
+            for name_part in name.split(","):
+                yield Label(t, ":".join(path + [name_part]))
         case _:
             raise AbacusError(f"Cannot parse label string: {input_string}.")
 
 
+def label_name(label: str, composer: Composer | None = None) -> str:
+    """Return account name from label string.
+
+    Examples: "asset:cash" -> "cash", "contra:sales:refunds" -> "refunds",
+    "asset:cash:bank_a" -> "cash:bank_a". Strings without a valid prefix
+    like "cash" or "cash:bank_a" are account names already.
+    """
+    try:
+        match list(extract(label, composer)):
+            case [*_, Label(_, name)]:
+                return name
+            case [*_, Offset(_, contra_name)]:
+                return contra_name
+    except (AbacusError, ValueError):
+        pass
+    return label
+
+
+@dataclass
+class ChartRow:
+    """Row of a tabular chart of accounts.
+
+    Regular accounts have `type` set to account type prefix (like "asset"),
+    contra accounts have `contra_of` set to the name of the account they offset.
+    A row with `title` only sets title for an existing account name.
+    """
+
+    name: str
+    type: str = ""
+    contra_of: str = ""
+    title: str = ""
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        return cls(**{f.name: d.get(f.name) or "" for f in fields(cls)})
+
+
+def read_rows(path: Path | str) -> list[ChartRow]:
+    """Read chart rows from CSV or JSON file.
+    Raise AbacusError if file cannot be read as chart rows."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise AbacusError(f"Cannot read chart from {path}, use .csv or .json.")
+    if not path.is_file():
+        raise AbacusError(f"File {path} not found.")
+    columns = [f.name for f in fields(ChartRow)]
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        if suffix == ".csv":
+            reader = csv.DictReader(file)
+            header = reader.fieldnames or []
+            if "name" not in header or not set(header) <= set(columns):
+                raise AbacusError(
+                    f"Cannot read chart from {path}, header must have name column "
+                    f"and may have only {', '.join(columns)} columns, got {header}."
+                )
+            items = list(reader)
+        else:
+            try:
+                items = json.load(file)
+            except json.JSONDecodeError as e:
+                raise AbacusError(f"Cannot read chart from {path}: {e}.")
+            if not isinstance(items, list):
+                raise AbacusError(f"Cannot read chart from {path}, expected a list.")
+    errors = []
+    for i, d in enumerate(items, start=1):
+        if not isinstance(d, dict):
+            errors.append(f"Row {i}: expected an object, got {d!r}.")
+        elif unknown := set(d) - set(columns):
+            errors.append(f"Row {i}: unknown keys {', '.join(sorted(unknown))}.")
+        elif not all(isinstance(v, str) or v is None for v in d.values()):
+            errors.append(f"Row {i}: values must be strings.")
+    if errors:
+        raise AbacusError(errors)
+    return [ChartRow.from_dict(d) for d in items]
+
+
+def write_rows(rows: Iterable[ChartRow], path: Path | str) -> None:
+    """Write chart rows to CSV or JSON file."""
+    path = Path(path)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        match path.suffix.lower():
+            case ".csv":
+                writer = csv.DictWriter(file, [f.name for f in fields(ChartRow)])
+                writer.writeheader()
+                writer.writerows(asdict(row) for row in rows)
+            case ".json":
+                json.dump(
+                    [asdict(row) for row in rows], file, indent=4, ensure_ascii=False
+                )
+            case _:
+                raise AbacusError(f"Cannot write chart to {path}, use .csv or .json.")
+
+
 class UserChart(BaseModel):
     income_summary_account: str
     retained_earnings_account: str
     null_account: str
     account_labels: dict[str, AccountLabel] = {}
     rename_dict: dict[str, str] = {}
+    precision: Precision = Precision()
     _path: Path = PrivateAttr(default=Path("./chart.json"))
 
     @classmethod
@@ -93,7 +198,7 @@ class UserChart(BaseModel):
 
     @staticmethod
     def last(name: str) -> str:
-        return name.split(":")[-1]
+        return label_name(name)
 
     def offset(self, name: str, contra_name: str):
         self.account_labels[self.last(name)].contra_names.append(contra_name)
@@ -154,6 +259,82 @@ class UserChart(BaseModel):
                 _ = self.add_one(obj)
         return self
 
+    def use_rows(self, rows: Iterable[ChartRow | dict]):
+        """Add accounts and titles from chart rows.
+
+        Rows are validated in one pass and all errors are collected
+        before raising `AbacusError`. Chart is not changed if there are errors.
+        Contra accounts may refer to accounts that appear later in `rows`.
+        """
+        names = set(self.names)
+        labels = {
+            name: AccountLabel(label.type, list(label.contra_names))
+            for name, label in self.account_labels.items()
+        }
+        titles = dict(self.rename_dict)
+        offsets = []
+        title_rows = []
+        errors = []
+        for i, row in enumerate(rows, start=1):
+            if isinstance(row, dict):
+                row = ChartRow.from_dict(row)
+            if not row.name:
+                errors.append(f"Row {i}: account name is missing.")
+                continue
+            if row.title:
+                titles[row.name] = row.title
+            if row.contra_of:
+                if row.type not in ("", "contra"):
+                    errors.append(
+                        f"Row {i}: contra account {row.name} must not have type {row.type}."
+                    )
+                offsets.append((i, row))
+            elif row.type:
+                try:
+                    labels[row.name] = AccountLabel(T(row.type), [])
+                except ValueError:
+                    errors.append(f"Row {i}: invalid account type {row.type}.")
+            elif not row.title:
+                errors.append(
+                    f"Row {i}: no type, contra account or title for {row.name}."
+                )
+                continue
+            else:
+                title_rows.append((i, row))
+                continue
+            if row.name in names:
+                errors.append(f"Row {i}: duplicate account name {row.name}.")
+            names.add(row.name)
+        for i, row in offsets:
+            try:
+                labels[row.contra_of].offset(row.name)
+            except KeyError:
+                errors.append(
+                    f"Row {i}: cannot offset {row.contra_of} because it is not in chart."
+                )
+        for i, row in title_rows:
+            if row.name not in names:
+                errors.append(f"Row {i}: cannot set title, {row.name} is not in chart.")
+        if errors:
+            raise AbacusError(errors)
+        self.account_labels = labels
+        self.rename_dict = titles
+        return self
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[ChartRow | dict]):
+        return cls.default().use_rows(rows)
+
+    def to_rows(self) -> Iterable[ChartRow]:
+        """Yield chart rows for accounts, contra accounts and titles."""
+        titles = dict(self.rename_dict)
+        for name, label in self.account_labels.items():
+            yield ChartRow(name, label.type.value, "", titles.pop(name, ""))
+            for contra_name in label.contra_names:
+                yield ChartRow(contra_name, "contra", name, titles.pop(contra_name, ""))
+        for name, title in titles.items():
+            yield ChartRow(name, title=title)
+
     def add_many(self, t: T, names: list[str]):
         for name in names:
             self.add_one(Label(t, name))
@@ -169,6 +350,11 @@ class UserChart(BaseModel):
     def set_null(self, name):
         self.null_account = name  # must check unique except this name itself
 
+    def set_precision(self, places: int):
+        if places < 0:
+            raise AbacusError(f"Precision must not be negative, got {places}.")
+        self.precision = Precision(places, self.precision.rounding)
+
     def accounts(self, t: T):
         return [
             Account(name, label.contra_names)
@@ -186,6 +372,7 @@ class UserChart(BaseModel):
             liabilities=self.accounts(T.Liability),  # type: ignore
             income=self.accounts(T.Income),  # type: ignore
             expenses=self.accounts(T.Expense),  # type: ignore
+            precision=self.precision,
         ).validate()
 
     def set_path(self, path: Path | None = None):
@@ -214,5 +401,86 @@ class UserChart(BaseModel):
         )
 
 
+@dataclass
+class CompiledChart:
+    """Validated chart with account name index, cached next to chart file.
+
+    The cache is keyed by modification time, size and hash of chart file.
+    When modification time is too close to the time cache was written,
+    the hash is checked, because file system time resolution can be coarse.
+    Cache file is signed, see `abacus.signing`.
+    """
+
+    chart: Chart
+    rename_dict: dict[str, str]
+    index: dict[str, Holder]
+    mtime_ns: int
+    size: int
+    digest: str
+    written_ns: int = 0
+    racy_ns: ClassVar[int] = 2_000_000_000
+
+    @staticmethod
+    def cache_path(path: Path) -> Path:
+        return path.with_name("." + path.name + ".cache")
+
+    @staticmethod
+    def hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    @classmethod
+    def from_user_chart(cls, user_chart: UserChart, content: bytes = b""):
+        chart = user_chart.chart()
+        return cls(
+            chart=chart,
+            rename_dict=dict(user_chart.rename_dict),
+            index=chart.to_dict(),
+            mtime_ns=0,
+            size=len(content),
+            digest=cls.hash(content),
+        )
+
+    def is_fresh(self, mtime_ns: int, size: int) -> bool:
+        return (
+            self.mtime_ns == mtime_ns
+            and self.size == size
+            and mtime_ns < self.written_ns - self.racy_ns
+        )
+
+    def ledger(self) -> Ledger:
+        """Create empty ledger using account name index."""
+        return Ledger({name: h.t_account() for name, h in self.index.items()})  # type: ignore
+
+    def save(self, path: Path):
+        self.written_ns = time.time_ns()
+        try:
+            self.cache_path(path).write_bytes(signing.dumps(self))
+        except OSError:
+            pass
+
+    @classmethod
+    def read(cls, path: Path) -> "CompiledChart | None":
+        try:
+            obj = signing.loads(cls.cache_path(path).read_bytes())
+        except Exception:
+            return None
+        return obj if isinstance(obj, cls) else None
+
+    @classmethod
+    def load(cls, path: Path | str | None = None) -> "CompiledChart":
+        """Load chart from cache or from chart file if the file has changed."""
+        path = Path(UserChart.default()._path if path is None else path)
+        stat = path.stat()
+        compiled = cls.read(path)
+        if compiled and compiled.is_fresh(stat.st_mtime_ns, stat.st_size):
+            return compiled
+        content = path.read_bytes()
+        if not (compiled and compiled.digest == cls.hash(content)):
+            compiled = cls.from_user_chart(UserChart.parse_raw(content), content)
+        compiled.mtime_ns, compiled.size = stat.st_mtime_ns, stat.st_size
+        compiled.save(path)
+        return compiled
+
+
 def make_user_chart(*args):
     return UserChart.default().use(*args)
@@ -0,0 +1,108 @@
+"""Check a batch of entries against chart before posting.
+
+All problems in a batch are found in one pass and reported together,
+so a file with bad lines is rejected before anything is written
+to store or posted to ledger.
+
+Example:
+
+```python
+validator = Validator.from_chart(chart)
+validator.problems([Entry("cash", "equity", 10), Entry("cash", "loan", 0)])
+# [Problem(2, ..., "Account loan not in chart."), Problem(2, ..., "Amount must be positive, got 0.")]
+validator.check(entries)  # raises AbacusError with all problems
+```
+"""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from abacus.core import AbacusError, Amount, Chart, CompoundEntry, Entry
+
+__all__ = ["Problem", "Validator"]
+
+
+@dataclass
+class Problem:
+    index: int
+    item: Entry | CompoundEntry | None
+    message: str
+
+    def __str__(self):
+        return f"Entry {self.index}: {self.message}"
+
+
+@dataclass
+class Validator:
+    """Validate entries against account names.
+
+    By default amounts must be positive, use `allow_zero` and
+    `allow_negative` to accept other amounts, for example for starting
+    balances with negative values.
+    """
+
+    accounts: set[str]
+    null_account: str = "_null"
+    allow_zero: bool = False
+    allow_negative: bool = False
+
+    @classmethod
+    def from_chart(cls, chart: Chart, **kwargs):
+        return cls(set(chart.ledger().keys()), chart.null_account, **kwargs)
+
+    def amount_problem(self, amount: Amount) -> str | None:
+        if not isinstance(amount, int):
+            return f"Amount must be integer, got {amount!r}."
+        if amount == 0 and not self.allow_zero:
+            return "Amount must be positive, got 0."
+        if amount < 0 and not self.allow_negative:
+            return f"Amount must be positive, got {amount}."
+        return None
+
+    def messages(self, names: Iterable[str], amounts: Iterable[Amount]) -> list[str]:
+        result = [f"Account {n} not in chart." for n in names if n not in self.accounts]
+        for amount in amounts:
+            if message := self.amount_problem(amount):
+                result.append(message)
+        return result
+
+    def compound_messages(
+        self, debits: list[tuple[str, Amount]], credits: list[tuple[str, Amount]]
+    ) -> list[str]:
+        pairs = debits + credits
+        result = self.messages([n for n, _ in pairs], [a for _, a in pairs])
+        debit_total = sum(a for _, a in debits)
+        credit_total = sum(a for _, a in credits)
+        if debit_total != credit_total:
+            result.append(
+                f"Debits ({debit_total}) do not match credits ({credit_total})."
+            )
+        return result
+
+    def problems(self, items: Iterable[Entry | CompoundEntry]) -> list[Problem]:
+        """Return all problems found in `items`, items are counted from 1."""
+        result: list[Problem] = []
+        for i, item in enumerate(items, start=1):
+            match item:
+                case Entry():
+                    messages = self.messages([item.debit, item.credit], [item.amount])
+                case CompoundEntry():
+                    messages = self.compound_messages(item.debits, item.credits)
+                case _:
+                    messages = [f"Cannot post {item!r}."]
+            result.extend(Problem(i, item, m) for m in messages)
+        return result
+
+    def check(self, items: Iterable[Entry | CompoundEntry]) -> list[Entry]:
+        """Return double entries for `items` if there are no problems,
+        otherwise raise AbacusError with all problems."""
+        items = list(items)
+        if problems := self.problems(items):
+            raise AbacusError([str(p) for p in problems])
+        entries: list[Entry] = []
+        for item in items:
+            if isinstance(item, CompoundEntry):
+                entries.extend(item.to_entries(self.null_account))
+            else:
+                entries.append(item)  # type: ignore
+        return entries
@@ -1,90 +1,96 @@
 """Viewers for trial balance, income statement, balance sheet reports."""
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Callable
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence, TextIO
 
 from rich.console import Console  # type: ignore
+from rich.table import Column as RichColumn  # type: ignore
 from rich.table import Table as RichTable  # type: ignore
 from rich.text import Text  # type: ignore
 
-from abacus.core import Amount, BalanceSheet, IncomeStatement
+from abacus.core import AbacusError, Amount, BalanceSheet, IncomeStatement, Precision
 
+if TYPE_CHECKING:
+    from abacus.aging import AgingReport
+    from abacus.budget import VarianceReport
+    from abacus.cashflow import CashFlowStatement
 
-@dataclass
-class TextColumn:
-    """Column for creating tables.
-    Methods to manipulate a column include align and concatenate."""
-
-    strings: list[str]
-
-    @property
-    def width(self):
-        return max(len(s) for s in self.strings)
-
-    def align(self, method: str, fill_char: str):
-        """Generic method to align all strings in the column."""
-        width = self.width  # avoid calculating width too many times
 
-        def f(s):
-            return getattr(s, method)(width, fill_char)
+def escape(s: str) -> str:
+    return s.replace("{", "{{").replace("}", "}}")
 
-        return self.__class__([f(s) for s in self.strings])
 
-    def align_left(self, fill_char=" "):
-        """Align all strings to the left."""
-        return self.align("ljust", fill_char)
-
-    def align_right(self, fill_char=" "):
-        """Align all strings to the right."""
-        return self.align("rjust", fill_char)
+@dataclass
+class LayoutColumn:
+    """Column of a `Layout`. Every row is `left + aligned string + right`,
+    `align` is "<" or ">" and `fill` is the padding character.
+    Header is centered over the whole column if `header_align` is "^",
+    otherwise it is aligned like the rows."""
+
+    strings: Sequence[str]
+    align: str = "<"
+    fill: str = " "
+    left: str = ""
+    right: str = ""
+    header: str | None = None
+    header_align: str = "^"
+
+    def __post_init__(self):
+        # the only pass over strings to find the width
+        self.inner = max(map(len, self.strings), default=0)
+        if self.header is not None:
+            extra = len(self.left) + len(self.right) if self.header_align == "^" else 0
+            self.inner = max(self.inner, len(self.header) - extra)
 
-    def align_center(self):
-        """Align all strings to center."""
-        return self.align("center", " ")
+    @property
+    def width(self) -> int:
+        return len(self.left) + self.inner + len(self.right)
 
-    def empty(self, n: int = 1):
-        """Create a new column filled with `n` spaces."""
-        return self.refill(" " * n)
+    def format_spec(self, i: int) -> str:
+        return f"{escape(self.left)}{{{i}:{self.fill}{self.align}{self.inner}}}{escape(self.right)}"
 
-    def add_right(self, string: str):
-        """Add `string` to the right of the column."""
-        return self + self.refill(string)
+    def header_cell(self) -> str:
+        header = self.header or ""
+        if self.header_align == "^":
+            return header.center(self.width)
+        return f"{self.left}{header:{self.header_align}{self.inner}}{self.right}"
 
-    def add_space(self, n: int = 1):
-        """Add `n` spaces to the right of the column."""
-        return self + self.empty(n)
 
-    def add_space_left(self, n: int = 1):
-        """Add `n` spaces to the left of the column."""
-        return self.empty(n) + self
+@dataclass
+class Layout:
+    """Table made of columns of strings with widths computed once.
 
-    def refill(self, text):
-        """Create a new column where all strings are replaced by `text`."""
-        return self.__class__([text] * len(self.strings))
+    Rows are produced one at a time by `lines()` or written to a stream
+    by `write()`, so large tables are not copied for every alignment step.
+    """
 
-    def merge(self, column):
-        """Merge two columns into one."""
-        return self.__class__([a + b for a, b in zip(self.strings, column.strings)])  # type: ignore
+    columns: list[LayoutColumn]
 
-    def __add__(self, column):
-        return self.merge(column)
+    @property
+    def width(self) -> int:
+        return sum(c.width for c in self.columns)
 
-    def insert_top(self, text):
-        """Insert text at the top of the column."""
-        return self.__class__([text] + self.strings)
+    @property
+    def has_header(self) -> bool:
+        return any(c.header is not None for c in self.columns)
 
-    def insert_bottom(self, text):
-        """Insert text at the bottom of the column."""
-        return self.__class__(self.strings + [text])
+    def lines(self) -> Iterator[str]:
+        if self.has_header:
+            yield "".join(c.header_cell() for c in self.columns)
+        row_format = "".join(c.format_spec(i) for i, c in enumerate(self.columns))
+        for cells in zip(*(c.strings for c in self.columns)):
+            yield row_format.format(*cells)
 
-    def header(self, text):
-        """Add a header line to the column."""
-        return self.insert_top(text.center(self.width))
+    def write(self, stream: TextIO):
+        for line in self.lines():
+            stream.write(line)
+            stream.write("\n")
 
     def __str__(self):
-        """Return a string representation of the column, ready to print ot screen."""
-        return "\n".join(self.strings)
+        return "\n".join(self.lines())
 
 
 @dataclass
@@ -101,12 +107,13 @@ class String:
 @dataclass
 class Number:
     n: Amount
+    precision: Precision = Precision()
 
     def __str__(self):
-        return str(self.n)
+        return self.precision.format(self.n)
 
     def rich(self):
-        return red(self.n)
+        return red(self.n, self.precision)
 
 
 @dataclass
@@ -160,17 +167,20 @@ class Cell:
 
 EMPTY = Cell(String(""))
 
+# rows in one rich table printed to terminal
+PAGE_SIZE = 500
+
 
 def maps(f, xs):
     return list(map(f, xs))
 
 
-def red(t: Amount) -> Text:
+def red(t: Amount, precision: Precision = Precision()) -> Text:
     """Make digit red if negative."""
     if t < 0:
-        return Text(str(t), style="red")
+        return Text(precision.format(t), style="red")
     else:
-        return Text(str(t))
+        return Text(precision.format(t))
 
 
 def bold(s: Text | str) -> Text:
@@ -190,31 +200,35 @@ class PairColumn:
         return len(self.xs)
 
     @classmethod
-    def from_dict(cls, d: dict):
+    def from_dict(cls, d: dict, precision: Precision = Precision()):
         xs = []
         ys = []
         for k, vs in d.items():
             n = sum(vs.values())
             xs.append(Cell(String(k), [BOLD]))
-            ys.append(Cell(Number(n), [BOLD]))
+            ys.append(Cell(Number(n, precision), [BOLD]))
             for name, value in vs.items():
                 xs.append(Cell(String(name), [OFFSET]))
-                ys.append(Cell(Number(value)))
+                ys.append(Cell(Number(value, precision)))
         return cls(xs, ys)
 
-    def text_table(self):
-        a = TextColumn(maps(str, self.xs)).align_left().add_space(2)
-        b = TextColumn(maps(str, self.ys)).align_right()
-        return a + b
+    def layout_columns(self) -> list[LayoutColumn]:
+        return [
+            LayoutColumn(maps(str, self.xs), "<", right="  "),
+            LayoutColumn(maps(str, self.ys), ">"),
+        ]
+
+    def text_table(self) -> Layout:
+        return Layout(self.layout_columns())
 
     def append_empty(self, n):
         for _ in range(n):
             self.xs.append(EMPTY)
             self.ys.append(EMPTY)
 
-    def add_footer(self, s: str, n: Amount):
+    def add_footer(self, s: str, n: Amount, precision: Precision = Precision()):
         self.xs.append(Cell(String(s), [BOLD]))
-        self.ys.append(Cell(Number(n), [BOLD]))
+        self.ys.append(Cell(Number(n, precision), [BOLD]))
 
     def rename(self, rename_dict=None):
         rename_dict = rename_dict or {}
@@ -239,28 +253,99 @@ class Viewer(ABC):
         self.rename_dict.update(rename_dict)  # type: ignore
         return self
 
+    def use_precision(self, precision: Precision):
+        self.precision = precision  # type: ignore
+        return self
+
     @abstractmethod
     def text_table(self):
         ...
 
     @abstractmethod
-    def rich_table(self, width):
+    def rich_columns(self) -> list[RichColumn]:
         ...
 
-    def print(self, width: int | None = None):
-        """Rich printing to console."""
-        t = self.rich_table(width)
-        Console().print(t)
+    @abstractmethod
+    def rich_rows(self) -> Iterable[tuple[Text, ...]]:
+        ...
 
-    def __str__(self):
-        prefix = ""
+    @property
+    def show_header(self) -> bool:
+        return any(c.header for c in self.rich_columns())
+
+    def _rich_table(self, rows, width, widths=None, first=True) -> RichTable:
+        columns = self.rich_columns()
+        if widths is not None:
+            for column, w in zip(columns, widths):
+                column.width, column.no_wrap = w, True
+        table = RichTable(
+            *columns,
+            title=self.title if first else None,  # type: ignore
+            box=None,
+            width=width,
+            show_header=self.show_header and first,
+        )
+        for row in rows:
+            table.add_row(*row)
+        return table
+
+    def rich_table(self, width: int | None = None) -> RichTable:
+        """Rich table with all rows of the statement."""
+        return self._rich_table(self.rich_rows(), width)
+
+    def pages(self, width: int | None = None, page_size: int = PAGE_SIZE):
+        """Yield rich tables of `page_size` rows. Column widths are taken
+        from text layout, so that the pages line up when printed one after
+        another."""
+        if page_size < 1:
+            raise AbacusError(f"Page size must be positive, got {page_size}.")
+        widths = [max(c.inner, len(c.header or "")) for c in self.text_table().columns]
+        rows = iter(self.rich_rows())
+        first = True
+        while True:
+            chunk = list(islice(rows, page_size))
+            if chunk or first:
+                yield self._rich_table(chunk, width, widths, first)
+            if len(chunk) < page_size:
+                return
+            first = False
+
+    def print(
+        self,
+        width: int | None = None,
+        plain: bool | None = None,
+        page_size: int = PAGE_SIZE,
+    ):
+        """Print to console page by page. Plain text is printed if `plain`
+        is True or, by default, if standard output is not a terminal."""
+        console = Console()
+        if plain is None:
+            plain = not console.is_terminal
+        if plain:
+            self.write(sys.stdout)
+            return
+        for table in self.pages(width, page_size):
+            console.print(table)
+
+    def lines(self) -> Iterable[str]:
         if self.title:  # type: ignore
-            prefix = self.title + "\n"  # type: ignore
-        return prefix + str(self.text_table())
+            yield self.title  # type: ignore
+        yield from self.text_table().lines()
+
+    def write(self, stream: TextIO):
+        """Write text table to `stream` line by line."""
+        for line in self.lines():
+            stream.write(line)
+            stream.write("\n")
+
+    def __str__(self):
+        return "\n".join(self.lines())
 
     @property
     def width(self):
-        return max(map(len, str(self).split("\n")))
+        """Width of text table, found without rendering the rows."""
+        title = self.title or ""  # type: ignore
+        return max(len(title), self.text_table().width)
 
 
 @dataclass
@@ -268,28 +353,28 @@ class IncomeStatementViewer(Viewer):
     statement: IncomeStatement
     title: str = "Income Statement"
     rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
 
     def to_dict(self):
         return dict(income=self.statement.income, expenses=self.statement.expenses)
 
     @property
     def pair_column(self):
-        pi = PairColumn.from_dict(self.to_dict())
-        pi.add_footer("current profit", self.statement.current_profit())
+        pi = PairColumn.from_dict(self.to_dict(), self.precision)
+        pi.add_footer("current profit", self.statement.current_profit(), self.precision)
         pi.rename(self.rename_dict)
         return pi
 
     def text_table(self):
         return self.pair_column.text_table()
 
-    def rich_table(self, width):
-        table = RichTable(title=self.title, box=None, width=width, show_header=False)
-        table.add_column()
-        table.add_column(justify="right", style="green")
+    def rich_columns(self):
+        return [RichColumn(), RichColumn(justify="right", style="green")]
+
+    def rich_rows(self):
         p = self.pair_column
         for a, b in zip(p.xs, p.ys):
-            table.add_row(a.rich(), b.rich())
-        return table
+            yield a.rich(), b.rich()
 
 
 @dataclass
@@ -297,6 +382,14 @@ class BalanceSheetViewer(Viewer):
     statement: BalanceSheet
     title: str = "Balance sheet"
     rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
+
+    def to_dict(self):
+        return dict(
+            assets=self.statement.assets,
+            capital=self.statement.capital,
+            liabilities=self.statement.liabilities,
+        )
 
     def to_dicts(self):
         return [
@@ -309,33 +402,238 @@ class BalanceSheetViewer(Viewer):
     @property
     def pair_columns(self):
         d1, d2 = self.to_dicts()
-        p1 = PairColumn.from_dict(d1)
-        p2 = PairColumn.from_dict(d2)
+        p1 = PairColumn.from_dict(d1, self.precision)
+        p2 = PairColumn.from_dict(d2, self.precision)
         equalize_length(p1, p2)
-        p1.add_footer("total", sum(self.statement.assets.values()))
+        p1.add_footer("total", sum(self.statement.assets.values()), self.precision)
         _s = self.statement
         p2.add_footer(
             "total",
             sum(_s.capital.values()) + sum(_s.liabilities.values()),
+            self.precision,
         )
         p1.rename(self.rename_dict)
         p2.rename(self.rename_dict)
         return p1, p2
 
-    def text_table(self):
+    def text_table(self) -> Layout:
         p1, p2 = self.pair_columns
-        return p1.text_table().add_space(2) + p2.text_table()
-
-    def rich_table(self, width=None):
-        table = RichTable(title=self.title, box=None, width=width, show_header=False)
-        table.add_column()
-        table.add_column(justify="right", style="green")
-        table.add_column()
-        table.add_column(justify="right", style="green")
+        a, b = p1.layout_columns()
+        b.right = "  "
+        return Layout([a, b, *p2.layout_columns()])
+
+    def rich_columns(self):
+        return [
+            RichColumn(),
+            RichColumn(justify="right", style="green"),
+            RichColumn(),
+            RichColumn(justify="right", style="green"),
+        ]
+
+    def rich_rows(self):
         p1, p2 = self.pair_columns
         for a, b, c, d in zip(p1.xs, p1.ys, p2.xs, p2.ys):
-            table.add_row(a.rich(), b.rich(), c.rich(), d.rich())
-        return table
+            yield a.rich(), b.rich(), c.rich(), d.rich()
+
+
+@dataclass
+class CashFlowViewer(Viewer):
+    statement: "CashFlowStatement"
+    title: str = "Cash flow statement"
+    rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
+
+    def to_dict(self):
+        return dict(
+            operating_activities=self.statement.operating,
+            investing_activities=self.statement.investing,
+            financing_activities=self.statement.financing,
+        )
+
+    @property
+    def pair_column(self):
+        p = PairColumn.from_dict(self.to_dict(), self.precision)
+        p.add_footer("net change in cash", self.statement.net_change(), self.precision)
+        p.rename(self.rename_dict)
+        return p
+
+    def text_table(self):
+        return self.pair_column.text_table()
+
+    def rich_columns(self):
+        return [RichColumn(), RichColumn(justify="right", style="green")]
+
+    def rich_rows(self):
+        p = self.pair_column
+        for a, b in zip(p.xs, p.ys):
+            yield a.rich(), b.rich()
+
+
+@dataclass
+class ComparativeViewer(Viewer):
+    """Balance sheets or income statements side by side, one column per period."""
+
+    statements: dict[str, BalanceSheet | IncomeStatement]
+    title: str = "Comparative statement"
+    rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
+
+    @property
+    def pair_columns(self) -> list[PairColumn]:
+        result = []
+        for statement in self.statements.values():
+            p = PairColumn.from_dict(statement.viewer.to_dict(), self.precision)
+            if isinstance(statement, IncomeStatement):
+                p.add_footer(
+                    "current profit", statement.current_profit(), self.precision
+                )
+            p.rename(self.rename_dict)
+            result.append(p)
+        return result
+
+    def text_table(self) -> Layout:
+        ps = self.pair_columns
+        columns = [LayoutColumn(maps(str, ps[0].xs), "<", header="")]
+        for label, p in zip(self.statements.keys(), ps):
+            columns.append(
+                LayoutColumn(
+                    maps(str, p.ys), ">", left="  ", header=label, header_align=">"
+                )
+            )
+        return Layout(columns)
+
+    def rich_columns(self):
+        return [RichColumn(header="")] + [
+            RichColumn(header=label, justify="right", style="green")
+            for label in self.statements.keys()
+        ]
+
+    def rich_rows(self):
+        ps = self.pair_columns
+        for i, x in enumerate(ps[0].xs):
+            yield x.rich(), *[p.ys[i].rich() for p in ps]
+
+
+@dataclass
+class VarianceViewer(Viewer):
+    """Budget, actual amount and variance, one row per period and account."""
+
+    statement: "VarianceReport"
+    title: str = "Budget variance"
+    rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
+
+    @property
+    def headers(self) -> list[str]:
+        headers = ["Period", "Account", "Budget", "Actual", "Variance"]
+        if self.statement.by:
+            headers.insert(0, self.statement.by.replace("_", " ").capitalize())
+        return headers
+
+    def label_columns(self) -> list[list[str]]:
+        rows = self.statement.rows
+        columns = [
+            [r.period for r in rows],
+            [self.rename_dict.get(r.account, r.account) for r in rows],
+        ]
+        if self.statement.by:
+            columns.insert(0, [r.group or "" for r in rows])
+        return columns
+
+    def text_table(self) -> Layout:
+        fmt = self.precision.format
+        rows = self.statement.rows
+        labels = self.label_columns()
+        amounts = [
+            [fmt(r.budget) for r in rows],
+            [fmt(r.actual) for r in rows],
+            [fmt(r.variance) for r in rows],
+        ]
+        headers = iter(self.headers)
+        columns = [
+            LayoutColumn(
+                strings, "<", right="  ", header=next(headers), header_align="<"
+            )
+            for strings in labels
+        ] + [
+            LayoutColumn(
+                strings, ">", left="  ", header=next(headers), header_align=">"
+            )
+            for strings in amounts
+        ]
+        return Layout(columns)
+
+    def rich_columns(self):
+        n = len(self.headers) - 3
+        return [RichColumn(header=h) for h in self.headers[:n]] + [
+            RichColumn(header=h, justify="right") for h in self.headers[n:]
+        ]
+
+    def rich_rows(self):
+        p = self.precision
+        for *labels, r in zip(*self.label_columns(), self.statement.rows):
+            yield (
+                *map(Text, labels),
+                Text(p.format(r.budget)),
+                Text(p.format(r.actual)),
+                red(r.variance, p),
+            )
+
+
+@dataclass
+class AgingViewer(Viewer):
+    """Open amounts by counterparty and aging bucket with total row."""
+
+    statement: "AgingReport"
+    title: str = "Aging"
+    rename_dict: dict[str, str] = field(default_factory=dict)
+    precision: Precision = Precision()
+
+    def __post_init__(self):
+        self.title = f"{self.title} as of {self.statement.as_of}"
+
+    @property
+    def headers(self) -> list[str]:
+        return ["Counterparty", *self.statement.labels, "Total"]
+
+    def amount_rows(self) -> list[list[Amount]]:
+        rows = [[*b, sum(b)] for b in self.statement.rows.values()]
+        return rows + [[*self.statement.totals, self.statement.total()]]
+
+    def names(self) -> list[str]:
+        names = [self.rename_dict.get(n, n) for n in self.statement.rows]
+        return names + ["total"]
+
+    def text_table(self) -> Layout:
+        fmt = self.precision.format
+        headers = self.headers
+        columns = [
+            LayoutColumn(
+                self.names(), "<", right="  ", header=headers[0], header_align="<"
+            )
+        ]
+        for k, amounts in enumerate(zip(*self.amount_rows()), start=1):
+            columns.append(
+                LayoutColumn(
+                    maps(fmt, amounts),
+                    ">",
+                    left="  ",
+                    header=headers[k],
+                    header_align=">",
+                )
+            )
+        return Layout(columns)
+
+    def rich_columns(self):
+        return [RichColumn(header=self.headers[0])] + [
+            RichColumn(header=h, justify="right") for h in self.headers[1:]
+        ]
+
+    def rich_rows(self):
+        rows = list(zip(self.names(), self.amount_rows()))
+        for i, (name, amounts) in enumerate(rows):
+            cells = [Text(name), *(Text(self.precision.format(a)) for a in amounts)]
+            yield tuple(bold(c) for c in cells) if i == len(rows) - 1 else tuple(cells)
 
 
 @dataclass
@@ -344,46 +642,47 @@ class TrialBalanceViewer(Viewer):
     rename_dict: dict[str, str] = field(default_factory=dict)
     headers: tuple[str, str, str] = "Account", "Debit", "Credit"
     title: str = "Trial balance"
+    precision: Precision = Precision()
 
     @property
     def debits(self) -> list[str]:
-        return [str(d) for (d, _) in self.statement.values()]
+        return [self.precision.format(d) for (d, _) in self.statement.values()]
 
     @property
     def credits(self) -> list[str]:
-        return [str(c) for (_, c) in self.statement.values()]
+        return [self.precision.format(c) for (_, c) in self.statement.values()]
 
     @property
     def account_names(self):
         return list(self.statement.keys())
 
-    def account_names_column(self, header: str):
-        return (
-            TextColumn(strings=self.account_names)
-            .add_space(1)
-            .align_left(".")
-            .add_right("...")
-            .header(header)
-        )
+    def account_names_column(self, header: str) -> LayoutColumn:
+        names = [name + " " for name in self.statement.keys()]
+        return LayoutColumn(names, "<", fill=".", right="...", header=header)
 
-    def numeric_column(self, values, header):
-        return TextColumn(values).align_right().add_space_left(3).header(header)
+    def numeric_column(self, values, header) -> LayoutColumn:
+        return LayoutColumn(values, ">", left="   ", header=header)
 
-    def text_table(self) -> TextColumn:
-        return (
-            self.account_names_column(self.headers[0])
-            + self.numeric_column(self.debits, self.headers[1])
-            + self.numeric_column(self.credits, self.headers[2])
+    def text_table(self) -> Layout:
+        return Layout(
+            [
+                self.account_names_column(self.headers[0]),
+                self.numeric_column(self.debits, self.headers[1]),
+                self.numeric_column(self.credits, self.headers[2]),
+            ]
         )
 
-    def rich_table(self, width=None) -> RichTable:
-        table = RichTable(title=self.title, box=None, width=width, show_header=True)
-        table.add_column(header=self.headers[0])
-        table.add_column(header=self.headers[1], justify="right", style="green")
-        table.add_column(header=self.headers[2], justify="right", style="green")
-        for a, b, c in zip(self.account_names, self.debits, self.credits):
-            table.add_row(Text(a), red(Amount(b)), red(Amount(c)))
-        return table
+    def rich_columns(self):
+        return [
+            RichColumn(header=self.headers[0]),
+            RichColumn(header=self.headers[1], justify="right", style="green"),
+            RichColumn(header=self.headers[2], justify="right", style="green"),
+        ]
+
+    def rich_rows(self):
+        p = self.precision
+        for a, (b, c) in self.statement.items():
+            yield Text(a), red(b, p), red(c, p)
 
 
 def print_viewers(
@@ -391,8 +690,13 @@ def print_viewers(
     tv: TrialBalanceViewer,
     bv: BalanceSheetViewer,
     iv: IncomeStatementViewer,
+    precision: Precision | None = None,
 ):
-    # +2 for padding and boundaries in RichTable
+    if precision is not None:
+        for viewer in (tv, bv, iv):
+            viewer.use_precision(precision)
+    # +2 for padding and boundaries in RichTable,
+    # widths come from layouts and do not render the tables
     width = 2 + max(bv.width, iv.width, tv.width)
     tv.print(width)
     bv.use(rename_dict).print(width)
@@ -3,13 +3,34 @@
 # pip install -e .
 # streamlit run streamlit_app.py
 
+from io import StringIO
+
 import streamlit as st
 
-from abacus import Chart, Report
-from abacus.core import Entry
+from abacus import Chart
+from abacus.core import AbacusError, Entry
+from abacus.entries_store import read_csv
+from abacus.session import LiveReport
 
-if "entries" not in st.session_state:
-    st.session_state["entries"] = []
+chart = Chart(
+    assets=["cash", "ar", "inventory"],
+    capital=["equity"],
+    income=["sales"],
+    expenses=["cogs", "sga"],
+)
+rename_dict = dict(
+    ar="Accounts receivable",
+    cogs="Cost of sales",
+    sga="Selling, general and adm.expenses",
+)
+
+# ledger state lives in session and is updated with new entries only,
+# rendered statements are kept until entries that affect them are posted
+if "live" not in st.session_state:
+    st.session_state["live"] = LiveReport(chart)
+    st.session_state["texts"] = {}
+live: LiveReport = st.session_state["live"]
+texts: dict[str, str] = st.session_state["texts"]
 
 
 def as_integer(a: str):
@@ -19,6 +40,14 @@ def as_integer(a: str):
         return None
 
 
+def post(entries):
+    try:
+        for kind in live.post_many(entries):
+            texts.pop(kind, None)
+    except AbacusError as e:
+        st.warning(f"Cannot post entries: {e}")
+
+
 labels = ["cash", "ar", "inventory", "equity", "sales", "cogs", "sga"]
 with st.sidebar:
     st.header("Post double entry :abacus:")
@@ -29,53 +58,54 @@ with st.sidebar:
         submit = st.form_submit_button(label="Post entry")
         if submit:
             st.caption(f"Last posted: {dr}, {cr}, {a}")
+    st.header("Upload entries")
+    with st.form("upload_entries", clear_on_submit=True):
+        uploaded = st.file_uploader(
+            "CSV file with debit, credit and amount columns", type="csv"
+        )
+        upload = st.form_submit_button(label="Post entries from file")
 
 if submit:
     if v := as_integer(a):
-        st.session_state["entries"] += [Entry(dr, cr, v)]
+        post([Entry(dr, cr, v)])
     else:
         st.warning(f"Cannot process value: {a}")
 
+if upload and uploaded is not None:
+    try:
+        entries = list(read_csv(StringIO(uploaded.getvalue().decode("utf-8"))))
+    except AbacusError as e:
+        st.warning(str(e))
+    else:
+        post(entries)
+        st.caption(f"Posted {len(entries)} entries from {uploaded.name}.")
+
 st.header("Accounting with `abacus` :star:")
 
 """Use sidebar to post double entries and see how they affect financial reports."""
 
 
-chart = Chart(
-    assets=["cash", "ar", "inventory"],
-    capital=["equity"],
-    income=["sales"],
-    expenses=["cogs", "sga"],
-)
-rename_dict = dict(
-    ar="Accounts receivable",
-    cogs="Cost of sales",
-    sga="Selling, general and adm.expenses",
-)
-
-
-def live_reports():
-    ledger = chart.ledger().post_many(st.session_state["entries"])
-    report = Report(chart, ledger.condense())
-    return (
-        report.balance_sheet.viewer.use(rename_dict),
-        report.income_statement.viewer.use(rename_dict),
-        report.trial_balance,
-    )
+def text(kind: str) -> str:
+    if kind not in texts:
+        viewer = live.statement(kind).viewer
+        if kind != "trial_balance":
+            viewer = viewer.use(rename_dict)
+        texts[kind] = str(viewer)
+    return texts[kind]
 
 
 tab1, tab2, tab3 = st.tabs(["Balance sheet", "Income statement", "Trial balance"])
 
-b, i, t = live_reports()
-
 with tab1:
-    st.text(b)
+    st.text(text("balance_sheet"))
 
 with tab2:
-    st.text(i)
+    st.text(text("income_statement"))
 
 with tab3:
-    st.text(t)
+    st.text(text("trial_balance"))
+
+st.caption(f"Entries posted: {live.count}")
 
 st.caption(
     """
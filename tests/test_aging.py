@@ -0,0 +1,105 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+
+from abacus.aging import Aging, bucket_labels
+from abacus.core import AbacusError, Entry
+from abacus.export import write
+from abacus.subledger import SubLedger
+
+
+def ar_entry(customer, amount, date):
+    return Entry("ar", "sales", amount, dimensions={"customer": customer}, date=date)
+
+
+def cash_entry(customer, amount, date):
+    return Entry("cash", "ar", amount, dimensions={"customer": customer}, date=date)
+
+
+@pytest.fixture
+def aging():
+    entries = [
+        ar_entry("acme", 100, "2023-12-01"),
+        ar_entry("acme", 50, "2024-02-20"),
+        ar_entry("zeta", 70, "2024-03-10"),
+        ar_entry("zeta", 30, "2024-04-05"),
+        cash_entry("acme", 40, "2024-03-01"),
+    ]
+    return Aging.from_entries("ar", entries, by="customer")
+
+
+@pytest.mark.unit
+def test_bucket_labels():
+    assert bucket_labels() == ["current", "1-30", "31-60", "61-90", "90+"]
+
+
+@pytest.mark.unit
+def test_aging_report(aging):
+    report = aging.report("2024-03-31")
+    assert report.rows == {"acme": [0, 0, 50, 0, 60], "zeta": [30, 70, 0, 0, 0]}
+    assert report.totals == [30, 70, 50, 0, 60]
+    assert report.total() == 210
+
+
+@pytest.mark.unit
+def test_bucket_bounds_are_inclusive(aging):
+    # acme invoice of 2024-02-20 is 30 days past due on 2024-03-21
+    assert aging.report("2024-03-21").rows["acme"][1] == 50
+    assert aging.report("2024-03-22").rows["acme"][2] == 50
+
+
+@pytest.mark.unit
+def test_reports_are_cached_by_as_of(aging):
+    assert aging.report("2024-03-31") is aging.report("2024-03-31")
+    assert aging.report("2024-03-31") is not aging.report("2024-03-31", (15, 45))
+
+
+def plain_aging(subledger, as_of, days):
+    """Aging with date difference for every open item."""
+    end = date.fromisoformat(as_of)
+    rows = {name: [0] * (len(days) + 2) for name in subledger.items}
+    for name, item in subledger.all_open_items():
+        past = (end - date.fromisoformat(item.due_date)).days
+        k = 0 if past <= 0 else 1 + sum(past > d for d in days)
+        rows[name][k] += item.amount
+    return rows
+
+
+@pytest.mark.unit
+def test_matches_subledger_loop():
+    ar = SubLedger.receivable()
+    for i in range(1, 200):
+        ar.invoice(
+            f"c{i % 7}", i, f"2024-01-{i % 28 + 1:02d}", due=f"2024-0{i % 5 + 1}-15"
+        )
+    for i in range(7):
+        ar.payment(f"c{i}", 100 * i + 5, "2024-04-01")
+    days = (10, 40, 75)
+    for as_of in ["2024-01-15", "2024-03-25", "2024-04-30", "2024-06-01"]:
+        assert ar.aging(as_of, days) == plain_aging(ar, as_of, days)
+
+
+@pytest.mark.unit
+def test_days_must_increase(aging):
+    with pytest.raises(AbacusError):
+        aging.report("2024-03-31", (60, 30))
+
+
+@pytest.mark.unit
+def test_days_must_not_be_empty(aging):
+    with pytest.raises(AbacusError):
+        aging.report("2024-03-31", ())
+    with pytest.raises(AbacusError):
+        bucket_labels(())
+
+
+@pytest.mark.unit
+def test_aging_viewer_and_export(aging):
+    report = aging.report("2024-03-31")
+    text = str(report.viewer)
+    assert "Aging as of 2024-03-31" in text
+    assert "90+" in text
+    stream = StringIO()
+    write(report, "csv", stream)
+    assert "acme,0,0,50,0,60,110" in stream.getvalue()
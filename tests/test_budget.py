@@ -0,0 +1,105 @@
+from io import StringIO
+
+import pytest
+
+from abacus.budget import Budget, VarianceReport, VarianceRow
+from abacus.core import AbacusError, Chart, Entry, Pipeline, Precision
+from abacus.export import write
+
+
+@pytest.fixture
+def chart():
+    return Chart(
+        assets=["cash"], capital=["equity"], income=["sales"], expenses=["rent"]
+    )
+
+
+@pytest.fixture
+def entries():
+    return [
+        Entry("cash", "equity", 500, date="2024-01-01"),
+        Entry("cash", "sales", 120, date="2024-01-10", dimensions={"shop": "a"}),
+        Entry("rent", "cash", 30, date="2024-01-15", dimensions={"shop": "a"}),
+        Entry("cash", "sales", 80, date="2024-02-10", dimensions={"shop": "b"}),
+    ]
+
+
+@pytest.mark.unit
+def test_variance_by_period(chart, entries):
+    budget = Budget.from_dict({"2024-01": {"sales": 100, "rent": 30}})
+    report = VarianceReport.from_entries(chart, budget, entries)
+    rows = {r.account: r for r in report.rows}
+    assert rows["sales"] == VarianceRow(None, "2024-01", "sales", 100, 120)
+    assert rows["sales"].variance == 20
+    assert rows["rent"].variance == 0
+    # unbudgeted accounts with actual amounts are shown too
+    assert rows["equity"].actual == 500
+
+
+@pytest.mark.unit
+def test_variance_by_dimension(chart, entries):
+    budget = Budget.from_dict(
+        {"a": {"2024-01": {"sales": 100}}, "b": {"2024-02": {"sales": 100}}},
+        by="shop",
+    )
+    report = VarianceReport.from_entries(chart, budget, entries)
+    sales = [(r.group, r.actual) for r in report.rows if r.account == "sales"]
+    assert sales == [("a", 120), ("b", 80)]
+    assert report.fields()[0] == "shop"
+
+
+@pytest.mark.unit
+def test_closing_entries_are_skipped(chart, entries):
+    closing = Pipeline(chart, chart.ledger().post_many(entries)).close()
+    dated = [
+        Entry(e.debit, e.credit, e.amount, date="2024-01-31")
+        for e in closing.closing_entries
+    ]
+    budget = Budget.from_dict({"2024-01": {"sales": 100}})
+    report = VarianceReport.from_entries(chart, budget, entries + dated)
+    assert report.rows[0].actual == 120
+
+
+@pytest.mark.unit
+def test_budget_account_not_in_chart(chart):
+    budget = Budget.from_dict({"2024-01": {"salaries": 100}})
+    with pytest.raises(AbacusError):
+        VarianceReport.from_entries(chart, budget, [])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", [None, "{", "[1, 2]", '{"2024-01": 5}'])
+def test_budget_load_errors(tmp_path, text):
+    path = tmp_path / "budget.json"
+    if text is not None:
+        path.write_text(text)
+    with pytest.raises(AbacusError):
+        Budget.load(path)
+
+
+@pytest.mark.unit
+def test_entry_account_not_in_chart(chart, entries):
+    budget = Budget.from_dict({"2024-01": {"sales": 100}})
+    entries.append(Entry("cash", "grants", 10, date="2024-01-20"))
+    with pytest.raises(AbacusError, match="grants"):
+        VarianceReport.from_entries(chart, budget, entries)
+
+
+@pytest.mark.unit
+def test_budget_decimals(tmp_path):
+    path = tmp_path / "budget.json"
+    path.write_text('{"2024-01": {"sales": 10.50}}')
+    budget = Budget.load(path, Precision(2))
+    assert budget.items[(None, "2024-01")] == {"sales": 1050}
+
+
+@pytest.mark.unit
+def test_variance_viewer_and_export(chart, entries):
+    budget = Budget.from_dict({"2024-01": {"sales": 100}})
+    report = VarianceReport.from_entries(chart, budget, entries)
+    text = str(report.viewer)
+    assert "Variance" in text
+    assert "2024-01  sales" in text
+    stream = StringIO()
+    write(report, "csv", stream)
+    assert "2024-01,sales,100,120,20" in stream.getvalue()
@@ -0,0 +1,75 @@
+import pytest
+
+from abacus.cashflow import CashFlow, CashFlowStatement
+from abacus.core import AbacusError, Account, Chart, Entry
+
+
+@pytest.fixture
+def chart():
+    return Chart(
+        assets=["cash", "ar", "ppe"],
+        capital=["equity"],
+        liabilities=["loan"],
+        income=[Account("sales", ["refunds"])],
+        expenses=["salaries"],
+    )
+
+
+@pytest.fixture
+def cash_flow(chart):
+    entries = [
+        Entry("cash", "equity", 100),
+        Entry("cash", "loan", 50),
+        Entry("ppe", "cash", 80),
+        Entry("ar", "sales", 40),
+        Entry("cash", "ar", 30),
+        Entry("refunds", "cash", 5),
+        Entry("salaries", "cash", 20),
+    ]
+    cf = CashFlow(chart, cash=["cash"], investing=["ppe"], financing=["loan"])
+    ledger = chart.ledger().post_many(cf.observe(entries))
+    assert ledger["cash"].balance() == 75
+    return cf
+
+
+@pytest.mark.unit
+def test_direct_cash_flow(cash_flow):
+    assert cash_flow.direct() == CashFlowStatement(
+        operating={"ar": 30, "refunds": -5, "salaries": -20},
+        investing={"ppe": -80},
+        financing={"equity": 100, "loan": 50},
+    )
+
+
+@pytest.mark.unit
+def test_indirect_cash_flow(cash_flow):
+    statement = cash_flow.indirect()
+    assert statement == CashFlowStatement(
+        operating={"current_profit": 15, "ar": -10},
+        investing={"ppe": -80},
+        financing={"equity": 100, "loan": 50},
+    )
+    assert statement.net_change() == cash_flow.direct().net_change() == 75
+
+
+@pytest.mark.unit
+def test_cash_flow_viewer(cash_flow):
+    assert "NET CHANGE IN CASH" in str(cash_flow.direct())
+    cash_flow.indirect().print()
+
+
+@pytest.mark.unit
+def test_cash_flow_unknown_account_raises(chart):
+    with pytest.raises(AbacusError):
+        CashFlow(chart, cash=["bank"])
+
+
+@pytest.mark.unit
+def test_rejected_batch_is_not_observed(chart, cash_flow):
+    before = cash_flow.direct()
+    ledger = chart.ledger()
+    with pytest.raises(AbacusError):
+        ledger.post_many(
+            cash_flow.observe([Entry("cash", "sales", 10), Entry("bank", "cash", 5)])
+        )
+    assert cash_flow.direct() == before
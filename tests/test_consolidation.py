@@ -0,0 +1,86 @@
+import pytest
+
+from abacus.consolidation import Consolidation, Elimination, Entity
+from abacus.core import AbacusError, Chart, Entry, Report
+from abacus.entries_store import LineJSON
+
+
+@pytest.fixture
+def group():
+    return Chart(
+        assets=["cash", "due_from"],
+        capital=["equity"],
+        liabilities=["due_to"],
+        income=["sales", "ic_sales"],
+        expenses=["cogs", "ic_purchases"],
+    )
+
+
+@pytest.fixture
+def parent():
+    chart = Chart(assets=["cash", "loan_to_sub"], capital=["equity"], income=["sales"])
+    entries = [
+        Entry("cash", "equity", 1000),
+        Entry("loan_to_sub", "cash", 300),
+        Entry("cash", "sales", 200),
+    ]
+    return Entity("parent", chart, entries, mapping={"loan_to_sub": "due_from"})
+
+
+@pytest.fixture
+def sub():
+    chart = Chart(assets=["bank"], liabilities=["loan_from_parent"], expenses=["costs"])
+    entries = [Entry("bank", "loan_from_parent", 250), Entry("costs", "bank", 40)]
+    return Entity(
+        "sub",
+        chart,
+        entries,
+        mapping={"bank": "cash", "loan_from_parent": "due_to", "costs": "cogs"},
+    )
+
+
+@pytest.fixture
+def consolidation(group, parent, sub):
+    return Consolidation(group, [parent, sub], [Elimination("due_from", "due_to")])
+
+
+@pytest.mark.unit
+def test_eliminations(consolidation):
+    result = consolidation.run(max_workers=1)
+    assert result.eliminating_entries == [Entry("due_to", "due_from", 250)]
+    assert result.unmatched == {"due_from/due_to": 50}
+    assert result.balances()["due_from"] == 50
+    assert result.balances()["due_to"] == 0
+
+
+@pytest.mark.unit
+def test_consolidated_statements_match_single_ledger(group, consolidation):
+    entries = [
+        Entry("cash", "equity", 1000),
+        Entry("due_from", "cash", 300),
+        Entry("cash", "sales", 200),
+        Entry("cash", "due_to", 250),
+        Entry("cogs", "cash", 40),
+        Entry("due_to", "due_from", 250),
+    ]
+    report = Report(group, group.ledger().post_many(entries))
+    result = consolidation.run(max_workers=1)
+    assert result.balance_sheet == report.balance_sheet
+    assert result.income_statement == report.income_statement
+
+
+@pytest.mark.unit
+def test_worker_processes_and_store_files(tmp_path, consolidation):
+    for entity in consolidation.entities:
+        store = LineJSON(tmp_path / f"{entity.name}.linejson")
+        store.append_many(entity.entries)
+        entity.entries = store.path
+    parallel = consolidation.run(max_workers=2)
+    assert parallel.entities == consolidation.run(max_workers=1).entities
+
+
+@pytest.mark.unit
+def test_mapping_to_account_not_in_group_chart(consolidation):
+    consolidation.entities[1].mapping["costs"] = "salaries"
+    with pytest.raises(AbacusError):
+        consolidation.run(max_workers=1)
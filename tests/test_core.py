@@ -1,4 +1,5 @@
 from copy import deepcopy
+from decimal import Decimal
 
 import pytest
 
@@ -17,6 +18,7 @@ from abacus.core import (
     IncomeStatement,
     Ledger,
     Pipeline,
+    Precision,
     Report,
     contra_pairs,
 )
@@ -298,3 +300,141 @@ def test_print_all():
     # Print trial balance, balance sheet and income statement
     report = Report(chart, ledger).rename("re", "Retained earnings")
     assert report.print_all() is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value,amount",
+    [("10.505", 1051), ("-10.505", -1051), (10, 1000), (0.1, 10), ("7", 700)],
+)
+def test_precision_to_amount(value, amount):
+    assert Precision(2).to_amount(value) == amount
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value", ["nan", "inf", "-Infinity", "abc", "1e100"])
+def test_precision_invalid_amount(value):
+    with pytest.raises(AbacusError):
+        Precision(2).to_amount(value)
+
+
+@pytest.mark.unit
+def test_precision_format():
+    assert Precision(2).format(-5) == "-0.05"
+    assert Precision(2).to_decimal(1050) == Decimal("10.50")
+    assert Precision().format(1050) == "1050"
+
+
+@pytest.mark.unit
+def test_account_balances_load_decimals(tmp_path):
+    path = tmp_path / "balances.json"
+    path.write_text('{"cash": 10.5, "equity": 10.50}')
+    assert AccountBalances.load(path, Precision(2)) == {"cash": 1050, "equity": 1050}
+
+
+@pytest.mark.regression
+def test_post_many_is_atomic():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    entries = [Entry("cash", "equity", 10), Entry("cash", "loan", 5)]
+    with pytest.raises(AbacusError):
+        ledger.post_many(entries)
+    assert ledger["cash"].debits == []
+    assert ledger["equity"].credits == []
+
+
+@pytest.mark.unit
+def test_ledger_transaction_rolls_back():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    ledger.post("cash", "equity", 10)
+    with pytest.raises(AbacusError):
+        with ledger.transaction():
+            ledger.post("cash", "equity", 20)
+            ledger.post("cash", "loan", 30)
+    assert ledger.balances.nonzero() == {"cash": 10, "equity": 10}
+
+
+@pytest.mark.unit
+def test_ledger_nested_transaction():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    with ledger.transaction():
+        ledger.post("cash", "equity", 10)
+        try:
+            with ledger.transaction():
+                ledger.post("cash", "equity", 20)
+                raise ValueError
+        except ValueError:
+            pass
+        ledger.post("cash", "equity", 5)
+    assert ledger["cash"].debits == [10, 5]
+
+
+@pytest.mark.unit
+def test_savepoint_records_changed_accounts_only():
+    ledger = Chart(assets=["cash", "ar"], capital=["equity"]).ledger()
+    ledger.post("cash", "equity", 10)
+    savepoint = ledger.savepoint()
+    ledger.post("cash", "equity", 5)
+    ledger["extra"] = ledger["ar"].empty()
+    assert list(savepoint.accounts) == ["cash", "equity", "extra"]
+    assert savepoint.accounts["extra"] is None
+    ledger.rollback(savepoint)
+    assert "extra" not in ledger
+    assert ledger.balances.nonzero() == {"cash": 10, "equity": 10}
+    ledger.post("ar", "equity", 1)
+    assert "ar" not in savepoint.accounts
+
+
+@pytest.mark.unit
+def test_rollback_restores_replaced_and_deleted_accounts():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    ledger.post("cash", "equity", 10)
+    savepoint = ledger.savepoint()
+    ledger["cash"] = Asset(debits=[1, 2, 3, 4])
+    del ledger["equity"]
+    ledger.rollback(savepoint)
+    assert ledger["cash"].debits == [10]
+    assert ledger["equity"].credits == [10]
+
+
+@pytest.mark.unit
+def test_rollback_does_not_change_snapshot_made_after_savepoint():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    savepoint = ledger.savepoint()
+    ledger.post("cash", "equity", 10)
+    snapshot = ledger.snapshot()
+    ledger.rollback(savepoint)
+    assert ledger["cash"].debits == []
+    assert snapshot["cash"].debits == [10]
+
+
+@pytest.mark.unit
+def test_ledger_snapshot_copies_on_write():
+    ledger = Chart(assets=["cash", "ar"], capital=["equity"]).ledger()
+    ledger.post("cash", "equity", 10)
+    snapshot = ledger.snapshot()
+    assert snapshot["ar"] is ledger["ar"]
+    snapshot.post("cash", "equity", 5)
+    ledger.post("ar", "equity", 1)
+    assert snapshot["cash"] is not ledger["cash"]
+    assert ledger.balances.nonzero() == {"cash": 10, "ar": 1, "equity": 11}
+    assert snapshot.balances.nonzero() == {"cash": 15, "equity": 15}
+
+
+@pytest.mark.unit
+def test_snapshot_rollback_does_not_touch_parent():
+    ledger = Chart(assets=["cash"], capital=["equity"]).ledger()
+    ledger.post("cash", "equity", 10)
+    snapshot = ledger.snapshot()
+    with pytest.raises(AbacusError):
+        with snapshot.transaction():
+            snapshot.post("cash", "equity", 5)
+            snapshot.post("cash", "loan", 1)
+    assert snapshot["cash"].debits == ledger["cash"].debits == [10]
+
+
+@pytest.mark.unit
+def test_account_balances_save_and_load(tmp_path):
+    path = tmp_path / "balances.json"
+    balances = AccountBalances({"cash": 1050, "loan": -5})
+    balances.save(path, Precision(2))
+    assert AccountBalances.load(path, Precision(2)) == balances
@@ -0,0 +1,59 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry, IncomeStatement, Report
+from abacus.cube import Cube
+
+
+@pytest.fixture
+def cube():
+    chart = Chart(
+        assets=["cash"], capital=["equity"], income=["sales"], expenses=["rent"]
+    )
+    return Cube.from_entries(
+        chart,
+        ["cost_centre", "region"],
+        [
+            Entry("cash", "equity", 100),
+            Entry(
+                "cash", "sales", 30, dimensions=dict(cost_centre="shop", region="EU")
+            ),
+            Entry("cash", "sales", 20, dimensions=dict(cost_centre="web", region="US")),
+            Entry("rent", "cash", 10, dimensions=dict(cost_centre="shop")),
+        ],
+    )
+
+
+@pytest.mark.unit
+def test_entry_dimensions_serialisation():
+    e = Entry("cash", "sales", 1, dimensions=dict(project="x"))
+    assert Entry.from_string(e.to_json()) == e
+
+
+@pytest.mark.unit
+def test_cube_balances_by_dimension(cube):
+    b = cube.balances(by=["cost_centre"])
+    assert b[("shop",)] == {"cash": 20, "sales": 30, "rent": 10}
+    assert b[("web",)] == {"cash": 20, "sales": 20}
+    assert b[(None,)] == {"cash": 100, "equity": 100}
+
+
+@pytest.mark.e2e
+def test_cube_filtered_statement(cube):
+    ledger = cube.ledger(where={"cost_centre": "shop"})
+    assert Report(cube.chart, ledger).income_statement == IncomeStatement(
+        income={"sales": 30}, expenses={"rent": 10}
+    )
+
+
+@pytest.mark.unit
+def test_cube_unknown_dimension_raises(cube):
+    with pytest.raises(AbacusError):
+        cube.balances(by=["project"])
+
+
+@pytest.mark.unit
+def test_cube_rejected_batch_leaves_cells_unchanged(cube):
+    cells = dict(cube.cells)
+    with pytest.raises(AbacusError):
+        cube.post_many([Entry("cash", "sales", 5), Entry("cash", "loan", 5)])
+    assert cube.cells == cells
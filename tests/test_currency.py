@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry, Precision, Report
+from abacus.currency import MultiCurrencyLedger
+
+
+@pytest.fixture
+def mcl():
+    chart = Chart(
+        assets=["cash"],
+        capital=["equity"],
+        liabilities=["loan"],
+        income=["fx"],
+        precision=Precision(2),
+    )
+    return MultiCurrencyLedger(chart, "USD").post_many(
+        [
+            Entry("cash", "equity", 100_00),
+            Entry("cash", "equity", 50_00, "EUR"),
+            Entry("cash", "loan", 10_000, "JPY"),
+        ]
+    )
+
+
+@pytest.mark.unit
+def test_balances_by_currency(mcl):
+    assert mcl.balances()["cash"] == {"USD": 100_00, "EUR": 50_00, "JPY": 10_000}
+
+
+@pytest.mark.unit
+def test_post_many_is_atomic_across_currencies(mcl):
+    before = mcl.balances()
+    with pytest.raises(AbacusError):
+        mcl.post_many(
+            [
+                Entry("cash", "equity", 1_00, "EUR"),
+                Entry("cash", "equity", 1_00, "GBP"),
+                Entry("cash", "unknown", 1_00, "JPY"),
+            ]
+        )
+    assert mcl.balances() == before
+    assert "GBP" not in mcl.ledgers
+
+
+@pytest.mark.unit
+def test_entry_currency_serialisation():
+    e = Entry("cash", "equity", 1, "EUR")
+    assert (
+        e.to_json()
+        == '{"debit": "cash", "credit": "equity", "amount": 1, "currency": "EUR"}'
+    )
+    assert Entry.from_string(e.to_json()) == e
+
+
+@pytest.mark.e2e
+def test_revaluation(mcl):
+    mcl.precisions["JPY"] = Precision(0)
+    book_rates = dict(EUR="1.10", JPY="0.0070")
+    rates = dict(EUR=Decimal("1.20"), JPY="0.0065")
+    r = mcl.revalue(rates, "fx", book_rates)
+    assert r.balances == {"cash": 225_00, "equity": 155_00, "loan": 70_00, "fx": 0}
+    # cash gains 5 on EUR and loses 5 on JPY, loan in JPY decreases by 5
+    assert r.entries == [Entry("loan", "fx", 5_00)]
+    report = Report(mcl.chart, r.ledger(mcl.chart))
+    assert report.balance_sheet.assets == {"cash": 225_00}
+    assert report.balance_sheet.liabilities == {"loan": 65_00}
+    assert report.income_statement.income == {"fx": 5_00}
+
+
+@pytest.mark.unit
+def test_revaluation_fails_without_rate(mcl):
+    with pytest.raises(AbacusError):
+        mcl.revalue(dict(EUR=1), "fx")
@@ -1,9 +1,11 @@
+import os
+from io import StringIO
 from pathlib import Path
 
 import pytest
 
-from abacus.core import Chart, Entry
-from abacus.entries_store import LineJSON
+from abacus.core import AbacusError, Chart, Entry, Precision
+from abacus.entries_store import LineJSON, read_csv
 
 
 @pytest.fixture
@@ -28,3 +30,50 @@ def test_yield_entries_for_income_statement(path):
     store.append(e2)
     chart = Chart("isa", "re", "null")
     assert list(store.yield_entries_for_income_statement(chart)) == [e1]
+
+
+def test_posting_index_is_maintained_on_append(path):
+    store = LineJSON(path)
+    path.touch()
+    store.index_path.touch()
+    e1, e2 = Entry("cash", "equity", 10), Entry("rent", "cash", 3)
+    store.append_many([e1, e2])
+    assert list(store.yield_account_entries("rent")) == [e2]
+    assert list(store.yield_account_entries("cash")) == [e1, e2]
+    assert store.index().end == path.stat().st_size
+
+
+def test_posting_index_catches_up_and_rebuilds(path):
+    store = LineJSON(path)
+    e1, e2 = Entry("cash", "equity", 10), Entry("rent", "cash", 3)
+    store.append(e1)
+    assert not store.index_path.exists()
+    assert list(store.yield_account_entries("cash")) == [e1]
+    store.append(e2)
+    assert list(store.yield_account_entries("rent")) == [e2]
+    path.write_text(e2.to_json() + "\n")
+    assert list(store.yield_account_entries("equity")) == []
+
+
+def test_posting_index_is_rebuilt_after_rewrite_of_same_size(path):
+    store = LineJSON(path)
+    store.append(Entry("cash", "equity", 10))
+    assert list(store.yield_account_entries("cash")) != []
+    mtime = path.stat().st_mtime_ns
+    e = Entry("bank", "income", 10)
+    path.write_text(e.to_json() + "\n")
+    os.utime(path, ns=(mtime, mtime + 1_000_000_000))
+    assert list(store.yield_account_entries("cash")) == []
+    assert list(store.yield_account_entries("bank")) == [e]
+
+
+def test_read_csv():
+    file = StringIO("debit,credit,amount,date\ncash,equity,10.50,2024-01-31\n")
+    assert list(read_csv(file, Precision(2))) == [
+        Entry("cash", "equity", 1050, date="2024-01-31")
+    ]
+
+
+def test_read_csv_raises_on_bad_amount():
+    with pytest.raises(AbacusError):
+        list(read_csv(StringIO("debit,credit,amount\ncash,equity,ten\n")))
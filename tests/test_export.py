@@ -0,0 +1,59 @@
+import json
+from io import StringIO
+
+import pytest
+
+from abacus.core import AbacusError
+from abacus.core import AccountBalances as AB
+from abacus.core import BalanceSheet, IncomeStatement, Precision, TrialBalance
+from abacus.export import records, write
+
+
+@pytest.fixture
+def balance_sheet():
+    return BalanceSheet(
+        assets=AB(cash=1050), capital=AB(equity=1000), liabilities=AB(loan=50)
+    )
+
+
+@pytest.mark.unit
+def test_records_of_income_statement():
+    i = IncomeStatement(income=AB(sales=40), expenses=AB(rent=25))
+    assert list(records(i)) == [("income", "sales", 40), ("expenses", "rent", 25)]
+
+
+@pytest.mark.unit
+def test_write_json(balance_sheet):
+    stream = StringIO()
+    write(balance_sheet, "json", stream, precision=Precision(2))
+    assert json.loads(stream.getvalue()) == {
+        "assets": {"cash": 10.5},
+        "capital": {"equity": 10.0},
+        "liabilities": {"loan": 0.5},
+    }
+
+
+@pytest.mark.unit
+def test_write_trial_balance_json_and_csv():
+    tb = TrialBalance(dict(cash=(5, 0), equity=(0, 5)))
+    stream = StringIO()
+    write(tb, "json", stream)
+    assert json.loads(stream.getvalue()) == {"cash": [5, 0], "equity": [0, 5]}
+    stream = StringIO()
+    write(tb, "csv", stream)
+    assert stream.getvalue() == "account,debit,credit\ncash,5,0\nequity,0,5\n"
+
+
+@pytest.mark.unit
+def test_write_unknown_format_raises(balance_sheet):
+    with pytest.raises(AbacusError):
+        write(balance_sheet, "xml", StringIO())
+
+
+@pytest.mark.unit
+def test_write_parquet(balance_sheet, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "balance_sheet.parquet"
+    write(balance_sheet, "parquet", path=path, precision=Precision(2))
+    table = pq.read_table(path)
+    assert table.column("account").to_pylist() == ["cash", "equity", "loan"]
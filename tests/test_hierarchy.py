@@ -0,0 +1,83 @@
+import pytest
+
+from abacus.core import AbacusError, Account, BalanceSheet, Chart, Entry, T
+from abacus.hierarchy import Rollup, parents
+from abacus.user_chart import Label, extract
+
+
+@pytest.fixture
+def rollup():
+    chart = Chart(
+        assets=[
+            "cash:bank_a:eur",
+            "cash:bank_a:usd",
+            "cash:bank_b",
+            Account("ppe:building", ["ppe:depreciation"]),
+        ],
+        capital=["equity"],
+        income=[Account("sales", ["refunds:online", "refunds:store"])],
+    )
+    return Rollup.new(chart).post_many(
+        [
+            Entry("cash:bank_a:eur", "equity", 100),
+            Entry("cash:bank_a:usd", "equity", 50),
+            Entry("cash:bank_b", "sales", 30),
+            Entry("refunds:online", "cash:bank_b", 5),
+            Entry("ppe:building", "equity", 200),
+            Entry("ppe:depreciation", "ppe:building", 0),
+            Entry("equity", "ppe:depreciation", 20),
+        ]
+    )
+
+
+@pytest.mark.unit
+def test_parents():
+    assert parents("a:b:c") == ["a", "a:b", "a:b:c"]
+
+
+@pytest.mark.unit
+def test_extract_sub_account_label():
+    assert list(extract("asset:cash:bank_a:eur,usd")) == [
+        Label(T.Asset, "cash:bank_a:eur"),
+        Label(T.Asset, "cash:bank_a:usd"),
+    ]
+
+
+@pytest.mark.unit
+def test_rollup_balances_at_depth(rollup):
+    assert rollup.balances(2).nonzero() == {
+        "cash:bank_a": 150,
+        "cash:bank_b": 25,
+        "ppe:building": 200,
+        "ppe:depreciation": 20,
+        "equity": 330,
+        "sales": 30,
+        "refunds:online": 5,
+    }
+    assert rollup.balances(1).nonzero() == {
+        "cash": 175,
+        "ppe": 180,
+        "equity": 330,
+        "sales": 30,
+        "refunds": 5,
+    }
+
+
+@pytest.mark.e2e
+def test_rollup_report_at_depth(rollup):
+    assert rollup.report(1).balance_sheet == BalanceSheet(
+        assets={"cash": 175, "ppe": 180},
+        capital={"equity": 330, "retained_earnings": 25},
+        liabilities={},
+    )
+
+
+@pytest.mark.unit
+def test_rollup_from_ledger_matches_posting(rollup):
+    assert Rollup.from_ledger(rollup.chart, rollup.ledger).totals == rollup.totals
+
+
+@pytest.mark.unit
+def test_leaf_with_sub_accounts_raises():
+    with pytest.raises(AbacusError):
+        Rollup.new(Chart(assets=["cash", "cash:bank_a"]))
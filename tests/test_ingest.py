@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from abacus.core import Chart, Entry
+from abacus.entries_store import LineJSON
+from abacus.ingest import Ingestor, from_file, from_iterable, from_queue
+
+
+@pytest.fixture
+def chart():
+    return Chart(assets=["cash", "ar"], capital=["equity"], income=["sales"])
+
+
+@pytest.mark.unit
+def test_ingest_from_many_sources(chart, tmp_path):
+    csv_path = tmp_path / "pos.csv"
+    csv_path.write_text("debit,credit,amount\ncash,sales,7\nar,sales,3\n")
+    store = LineJSON(tmp_path / "entries.linejson")
+    ledger = chart.ledger()
+    ingestor = Ingestor(chart, store, ledger, maxsize=2, batch_size=3)
+    bank = [Entry("cash", "equity", 1)] * 10
+
+    async def main():
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in [Entry("cash", "ar", 2), Entry("cash", "loan", 1), None]:
+            queue.put_nowait(entry)
+        return await ingestor.run(
+            from_iterable(bank), from_file(csv_path), from_queue(queue)
+        )
+
+    metrics = asyncio.run(main())
+    assert (metrics.received, metrics.posted, metrics.rejected) == (14, 13, 1)
+    assert metrics.max_queue_depth <= 2
+    assert metrics.batches >= 5
+    assert ingestor.rejected == [
+        (Entry("cash", "loan", 1), "Account loan not in chart.")
+    ]
+    assert ledger.balances["cash"] == 10 + 7 + 2
+    assert len(list(store.yield_entries())) == 13
+
+
+@pytest.mark.unit
+def test_ingest_writes_entries_received_before_producer_failed(chart):
+    ledger = chart.ledger()
+
+    async def broken():
+        yield Entry("cash", "equity", 5)
+        raise ValueError("feed closed")
+
+    with pytest.raises(ValueError):
+        asyncio.run(Ingestor(chart, ledger=ledger).run(broken()))
+    assert ledger.balances["cash"] == 5
+
+
+@pytest.mark.unit
+def test_ingest_stops_other_producers_after_failure(chart):
+    ledger = chart.ledger()
+    ingestor = Ingestor(chart, ledger=ledger, flush_interval=0.01)
+
+    async def broken():
+        yield Entry("cash", "equity", 5)
+        raise ValueError("feed closed")
+
+    async def slow():
+        while True:
+            yield Entry("cash", "equity", 1)
+            await asyncio.sleep(0.001)
+
+    with pytest.raises(ValueError):
+        asyncio.run(ingestor.run(broken(), slow()))
+    assert ingestor.metrics.received == ingestor.metrics.posted
+    assert ledger.balances["cash"] == 5 + ingestor.metrics.posted - 1
+
+
+@pytest.mark.unit
+def test_ingest_rejects_amounts_that_ledger_post_rejects(chart):
+    ingestor = Ingestor(chart)
+    entries = [Entry("cash", "equity", 0), Entry("cash", "equity", -1)]
+    metrics = asyncio.run(ingestor.run(from_iterable(entries)))
+    assert metrics.rejected == 2
@@ -0,0 +1,66 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry, IncomeStatement, Report
+from abacus.periods import Column, ComparativeReport, monthly_columns
+
+
+@pytest.fixture
+def chart():
+    return Chart(
+        assets=["cash"], capital=["equity"], income=["sales"], expenses=["rent"]
+    )
+
+
+@pytest.fixture
+def entries():
+    return [
+        Entry("cash", "equity", 100),
+        Entry("cash", "sales", 40, date="2023-06-15"),
+        Entry("cash", "sales", 30, date="2024-01-10"),
+        Entry("rent", "cash", 10, date="2024-01-20"),
+        Entry("cash", "sales", 25, date="2024-02-05"),
+    ]
+
+
+@pytest.fixture
+def report(chart, entries):
+    return ComparativeReport.from_entries(chart, entries, monthly_columns(2024))
+
+
+@pytest.mark.unit
+def test_monthly_columns():
+    columns = monthly_columns(2024)
+    assert len(columns) == 14
+    assert columns[-1] == Column("2023", "2023-01", "2023-12")
+
+
+@pytest.mark.e2e
+def test_comparative_income_statements(report):
+    i = report.income_statements
+    assert i["Jan"] == IncomeStatement(income={"sales": 30}, expenses={"rent": 10})
+    assert i["Feb"] == IncomeStatement(income={"sales": 25}, expenses={"rent": 0})
+    assert i["YTD"].current_profit() == 45
+    assert i["2023"].current_profit() == 40
+
+
+@pytest.mark.e2e
+def test_comparative_balance_sheets(report):
+    b = report.balance_sheets
+    assert b["Jan"].assets == {"cash": 160}
+    assert b["Jan"].capital == {"equity": 100, "retained_earnings": 60}
+    assert b["YTD"].assets == {"cash": 185}
+    assert b["2023"].capital == {"equity": 100, "retained_earnings": 40}
+
+
+@pytest.mark.e2e
+def test_comparative_matches_report(chart, entries, report):
+    ledger = chart.ledger().post_many(entries)
+    assert report.balance_sheets["YTD"] == Report(chart, ledger).balance_sheet
+
+
+@pytest.mark.unit
+def test_unknown_account_raises(chart):
+    with pytest.raises(AbacusError):
+        ComparativeReport.from_entries(
+            chart, [Entry("bank", "equity", 1)], monthly_columns(2024)
+        ).statements
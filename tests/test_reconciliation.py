@@ -0,0 +1,129 @@
+from io import StringIO
+
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry, Precision
+from abacus.reconciliation import (
+    Alive,
+    BankLine,
+    Reconciler,
+    book_items,
+    read_bank_csv,
+)
+
+
+@pytest.fixture
+def entries():
+    return [
+        Entry("cash", "equity", 1000, date="2024-01-01"),
+        Entry("rent", "cash", 200, date="2024-01-03"),
+        Entry("cash", "sales", 30, date="2024-01-10"),
+        Entry("cash", "sales", 45, date="2024-01-11"),
+        Entry("rent", "equity", 5, date="2024-01-11"),
+    ]
+
+
+@pytest.fixture
+def bank():
+    return [
+        BankLine("2024-01-01", 1000),
+        BankLine("2024-01-05", -200),
+        BankLine("2024-01-12", 75, "deposit"),
+        BankLine("2024-01-31", -7, "Monthly fee"),
+    ]
+
+
+@pytest.mark.unit
+def test_book_items_are_signed(entries):
+    items = book_items("cash", entries)
+    assert [x.amount for x in items] == [1000, -200, 30, 45]
+    assert [x.index for x in items] == [0, 1, 2, 3]
+
+
+@pytest.mark.unit
+def test_match_passes(bank, entries):
+    result = Reconciler(window=3).match(bank, book_items("cash", entries))
+    kinds = [(m.kind, [x.index for x in m.book]) for m in result.matches]
+    assert kinds == [("exact", [0]), ("window", [1]), ("group", [2, 3])]
+    assert result.unmatched_bank == [bank[3]]
+    assert result.unmatched_book == []
+    assert result.difference() == -7
+
+
+@pytest.mark.unit
+def test_window_picks_nearest_date():
+    book = book_items(
+        "cash",
+        [
+            Entry("cash", "sales", 10, date="2024-01-01"),
+            Entry("cash", "sales", 10, date="2024-01-04"),
+        ],
+    )
+    result = Reconciler(window=3).match([BankLine("2024-01-05", 10)], book)
+    assert result.matches[0].book[0].index == 1
+
+
+@pytest.mark.unit
+def test_outside_window_is_unmatched():
+    book = book_items("cash", [Entry("cash", "sales", 10, date="2024-01-01")])
+    result = Reconciler(window=3).match([BankLine("2024-01-10", 10)], book)
+    assert result.matches == []
+    assert len(result.unmatched_book) == 1
+
+
+@pytest.mark.unit
+def test_adjusting_entries_post_to_ledger(bank, entries):
+    chart = Chart(
+        assets=["cash"],
+        capital=["equity"],
+        income=["sales"],
+        expenses=["rent", "bank_charges", "suspense"],
+    )
+    result = Reconciler().match(bank, book_items("cash", entries))
+    adjusting = result.adjusting_entries("cash", "suspense", {"fee": "bank_charges"})
+    assert adjusting == [Entry("bank_charges", "cash", 7, date="2024-01-31")]
+    ledger = chart.ledger().post_many(entries + adjusting)
+    assert ledger["cash"].balance() == 1000 - 200 + 75 - 7
+
+
+@pytest.mark.unit
+def test_read_bank_csv():
+    file = StringIO("date,amount,description\n2024-01-02,-10.50,Fee\n")
+    assert read_bank_csv(file, Precision(2)) == [BankLine("2024-01-02", -1050, "Fee")]
+    with pytest.raises(AbacusError):
+        read_bank_csv(StringIO("date,amount\n2024-13-01,1\n"))
+
+
+@pytest.mark.unit
+def test_group_candidates_are_nearest_by_date():
+    far = [Entry("cash", "sales", 1, date="2024-01-01") for _ in range(5)]
+    near = [
+        Entry("cash", "sales", 40, date="2024-01-04"),
+        Entry("cash", "sales", 60, date="2024-01-04"),
+    ]
+    book = book_items("cash", far + near)
+    reconciler = Reconciler(window=3, max_candidates=2)
+    result = reconciler.match([BankLine("2024-01-04", 100)], book)
+    assert [x.index for x in result.matches[0].book] == [5, 6]
+
+
+@pytest.mark.unit
+def test_alive_skips_removed_positions():
+    alive = Alive(5)
+    for k in (1, 2, 3):
+        alive.remove(k)
+    assert alive.next(1) == 4
+    assert alive.prev(3) == 0
+    alive.remove(0)
+    assert alive.prev(3) == -1
+    alive.remove(4)
+    assert alive.next(0) == 5
+
+
+@pytest.mark.unit
+def test_repeated_amounts_scale():
+    n = 20_000
+    entries = [Entry("cash", "sales", 10, date="2024-01-01") for _ in range(n)]
+    bank = [BankLine("2024-01-02", 10) for _ in range(n)]
+    result = Reconciler().match(bank, book_items("cash", entries))
+    assert len(result.matches) == n
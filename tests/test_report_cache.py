@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from abacus import signing
+from abacus.core import Chart, Entry, Report
+from abacus.report_cache import ReportCache
+
+
+@pytest.fixture(autouse=True)
+def signing_key(tmp_path, monkeypatch):
+    """Keep cache signing key out of user home directory."""
+    monkeypatch.setenv("ABACUS_KEY_FILE", str(tmp_path / "key"))
+
+
+@pytest.fixture
+def chart():
+    return Chart(assets=["cash"], capital=["equity"], income=["sales"])
+
+
+def balance_sheet(chart, entries):
+    return Report(chart, chart.ledger().post_many(entries)).balance_sheet
+
+
+@pytest.mark.unit
+def test_report_cache_hit_and_miss(chart):
+    cache = ReportCache()
+    entries = [Entry("cash", "equity", 10)]
+    key = cache.key(chart, len(entries), {}, "balance_sheet")
+    b1 = cache.get(key, lambda: balance_sheet(chart, entries))
+    b2 = cache.get(key, lambda: pytest.fail("must not compute again"))
+    assert b1 is b2
+    entries.append(Entry("cash", "sales", 5))
+    key = cache.key(chart, len(entries), {}, "balance_sheet")
+    assert cache.get(key, lambda: balance_sheet(chart, entries)).assets == {"cash": 15}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.unit
+def test_report_cache_evicts_least_recently_used(chart):
+    cache = ReportCache(maxsize=2)
+    keys = [cache.key(chart, n, {}, "balance_sheet") for n in range(3)]
+    cache.get(keys[0], lambda: balance_sheet(chart, []))
+    cache.get(keys[1], lambda: balance_sheet(chart, []))
+    cache.get(keys[0], lambda: balance_sheet(chart, []))
+    cache.get(keys[2], lambda: balance_sheet(chart, []))
+    assert list(cache.items.keys()) == [keys[0], keys[2]]
+
+
+@pytest.mark.unit
+def test_report_cache_on_disk(chart, tmp_path):
+    path = tmp_path / "reports"
+    key = ReportCache.key(chart, 0, {"cash": "Cash"}, "balance_sheet")
+    ReportCache(path=path).get(key, lambda: balance_sheet(chart, []))
+    cache = ReportCache(path=path)
+    cache.get(key, lambda: pytest.fail("must be read from disk"))
+    assert cache.hits == 1
+
+
+class Unsafe:
+    def __reduce__(self):
+        return (pytest.fail, ("cache file must not be unpickled",))
+
+
+@pytest.mark.unit
+def test_report_cache_file_is_signed(chart, tmp_path):
+    path = tmp_path / "reports"
+    cache = ReportCache(path=path)
+    key = cache.key(chart, 0, {}, "balance_sheet")
+    cache.get(key, lambda: balance_sheet(chart, []))
+    assert key in ReportCache(path=path).items
+    data = bytearray(path.read_bytes())
+    data[-2] ^= 1
+    path.write_bytes(bytes(data))
+    assert ReportCache(path=path).items == {}
+
+
+@pytest.mark.unit
+def test_report_cache_ignores_unsigned_file(tmp_path):
+    path = tmp_path / "reports"
+    path.write_bytes(pickle.dumps(Unsafe()))
+    assert ReportCache(path=path).items == {}
+    with pytest.raises(ValueError):
+        signing.loads(path.read_bytes())
@@ -0,0 +1,71 @@
+import pytest
+
+from abacus.core import AbacusError, Account, Chart, Entry, Report
+from abacus.scenarios import Scenarios
+
+
+@pytest.fixture
+def chart():
+    return Chart(
+        assets=["cash"],
+        capital=["equity"],
+        income=[Account("sales", ["refunds"])],
+        expenses=["rent"],
+    )
+
+
+@pytest.fixture
+def base_entries():
+    return [Entry("cash", "equity", 100), Entry("cash", "sales", 50)]
+
+
+@pytest.fixture
+def scenarios(chart, base_entries):
+    ledger = chart.ledger().post_many(base_entries)
+    return Scenarios.from_ledger(chart, ledger).add_many(
+        {
+            "high": [Entry("cash", "sales", 30)],
+            "low": [Entry("refunds", "cash", 10), Entry("rent", "cash", 20)],
+        }
+    )
+
+
+@pytest.mark.unit
+def test_scenarios_match_full_report(chart, base_entries, scenarios):
+    low = base_entries + [Entry("refunds", "cash", 10), Entry("rent", "cash", 20)]
+    report = Report(chart, chart.ledger().post_many(low))
+    b, i = scenarios.statements()["low"]
+    assert b == report.balance_sheet
+    assert i == report.income_statement
+
+
+@pytest.mark.unit
+def test_scenarios_current_profit(scenarios):
+    assert scenarios.current_profit() == {"high": 80, "low": 20}
+    assert {
+        k: i.current_profit() for k, i in scenarios.income_statements().items()
+    } == {
+        "high": 80,
+        "low": 20,
+    }
+
+
+@pytest.mark.unit
+def test_scenarios_matrix(scenarios):
+    assert scenarios.matrix() == {
+        "cash": [30, -30],
+        "sales": [-30, 0],
+        "refunds": [0, 10],
+        "rent": [0, 20],
+    }
+
+
+@pytest.mark.unit
+def test_rejected_scenario_is_not_added(scenarios):
+    high = dict(scenarios.deltas["high"])
+    with pytest.raises(AbacusError):
+        scenarios.add("high", [Entry("cash", "sales", 5), Entry("cash", "loan", 5)])
+    with pytest.raises(AbacusError):
+        scenarios.add("bad", [Entry("cash", "loan", 5)])
+    assert scenarios.deltas["high"] == high
+    assert "bad" not in scenarios.names
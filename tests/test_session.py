@@ -0,0 +1,43 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry, Report
+from abacus.session import LiveReport
+
+
+@pytest.fixture
+def chart():
+    return Chart(assets=["cash"], capital=["equity"], income=["sales"])
+
+
+@pytest.mark.unit
+def test_live_report_matches_report(chart):
+    entries = [Entry("cash", "equity", 100), Entry("cash", "sales", 30)]
+    live = LiveReport(chart)
+    live.post_many(entries[:1])
+    live.post_many(entries[1:])
+    report = Report(chart, chart.ledger().post_many(entries))
+    assert live.balance_sheet == report.balance_sheet
+    assert live.income_statement == report.income_statement
+    assert live.trial_balance["cash"] == (130, 0)
+
+
+@pytest.mark.unit
+def test_live_report_recomputes_changed_statements_only(chart):
+    live = LiveReport(chart)
+    assert live.post("cash", "sales", 10) == {
+        "trial_balance",
+        "balance_sheet",
+        "income_statement",
+    }
+    i = live.income_statement
+    assert live.post("cash", "equity", 5) == {"trial_balance", "balance_sheet"}
+    assert live.income_statement is i
+    assert live.count == 2
+
+
+@pytest.mark.unit
+def test_live_report_does_not_post_if_entry_fails(chart):
+    live = LiveReport(chart)
+    with pytest.raises(AbacusError):
+        live.post_many([Entry("cash", "equity", 5), Entry("cash", "loan", 5)])
+    assert live.balances == {}
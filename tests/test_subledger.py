@@ -0,0 +1,90 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry
+from abacus.subledger import SubLedger
+
+
+@pytest.fixture
+def ar():
+    ar = SubLedger.receivable("ar")
+    ar.invoice("acme", 100, "2024-01-05", "INV-1")
+    ar.invoice("acme", 50, "2024-01-10", "INV-2")
+    ar.invoice("zeta", 70, "2024-01-10", "INV-3", due="2024-02-10")
+    return ar
+
+
+@pytest.mark.unit
+def test_payment_is_applied_to_oldest_invoice_first(ar):
+    applied = ar.payment("acme", 120, "2024-01-20")
+    assert [(item.document, paid) for item, paid in applied] == [
+        ("INV-1", 100),
+        ("INV-2", 20),
+    ]
+    assert [(x.document, x.amount) for x in ar.open_items("acme")] == [("INV-2", 30)]
+    assert ar.balance("acme") == 30
+
+
+@pytest.mark.unit
+def test_payment_by_document(ar):
+    ar.payment("acme", 50, "2024-01-20", document="INV-2")
+    assert [x.document for x in ar.open_items("acme")] == ["INV-1"]
+
+
+@pytest.mark.unit
+def test_overpayment_is_applied_to_next_invoice(ar):
+    ar.payment("zeta", 100, "2024-01-20")
+    assert ar.balance("zeta") == -30
+    ar.invoice("zeta", 40, "2024-01-25", "INV-4")
+    assert [(x.document, x.amount) for x in ar.open_items("zeta")] == [("INV-4", 10)]
+    assert ar.credits == {}
+
+
+@pytest.mark.unit
+def test_summary_entries_match_subledger_total(ar):
+    ar.payment("acme", 60, "2024-01-20")
+    ar.payment("acme", 10, "2024-01-20")
+    entries = ar.summary_entries()
+    assert Entry("cash", "ar", 70, date="2024-01-20") in entries
+    assert len(entries) == 3
+    assert ar.summary_entries() == []
+    chart = Chart(assets=["cash", "ar"], income=["sales"])
+    ledger = chart.ledger().post_many(entries)
+    assert ledger["ar"].balance() == ar.total() == 150
+
+
+@pytest.mark.unit
+def test_payable_subledger():
+    ap = SubLedger.payable("ap", "inventory")
+    ap.invoice("supplier", 80, "2024-01-02")
+    ap.payment("supplier", 30, "2024-01-15")
+    assert ap.summary_entries() == [
+        Entry("inventory", "ap", 80, date="2024-01-02"),
+        Entry("ap", "cash", 30, date="2024-01-15"),
+    ]
+    assert ap.balances() == {"supplier": 50}
+
+
+@pytest.mark.unit
+def test_from_entries():
+    entries = [
+        Entry("ar", "sales", 100, dimensions={"customer": "acme"}, date="2024-01-05"),
+        Entry("cash", "ar", 40, dimensions={"customer": "acme"}, date="2024-01-09"),
+        Entry("cash", "equity", 500, date="2024-01-01"),
+    ]
+    ar = SubLedger.from_entries("ar", entries, by="customer")
+    assert ar.balances() == {"acme": 60}
+    assert ar.summary_entries() == []
+
+
+@pytest.mark.unit
+def test_aging(ar):
+    assert ar.aging("2024-02-15") == {
+        "acme": [0, 0, 150, 0, 0],
+        "zeta": [0, 70, 0, 0, 0],
+    }
+
+
+@pytest.mark.unit
+def test_amount_must_be_positive(ar):
+    with pytest.raises(AbacusError):
+        ar.payment("acme", 0, "2024-01-20")
@@ -0,0 +1,47 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, Entry
+from abacus.timeseries import balance_series
+
+
+@pytest.fixture
+def chart():
+    return Chart(assets=["cash"], capital=["equity"], expenses=["rent"])
+
+
+@pytest.fixture
+def entries():
+    return [
+        Entry("cash", "equity", 100),
+        Entry("rent", "cash", 10, date="2024-01-30"),
+        Entry("rent", "cash", 5, date="2024-02-01"),
+        Entry("cash", "equity", 20, date="2024-01-30"),
+    ]
+
+
+@pytest.mark.unit
+def test_daily_balance_series(chart, entries):
+    s = balance_series(chart, entries, ["cash", "equity"], "day")
+    assert s.to_dict() == {
+        "period": ["", "2024-01-30", "2024-01-31", "2024-02-01"],
+        "cash": [100, 110, 110, 105],
+        "equity": [100, 120, 120, 120],
+    }
+
+
+@pytest.mark.unit
+def test_monthly_balance_series(chart, entries):
+    s = balance_series(chart, entries, ["rent"], "month")
+    assert list(s.rows()) == [("2024-01", 10), ("2024-02", 15)]
+
+
+@pytest.mark.unit
+def test_balance_series_by_entry(chart, entries):
+    s = balance_series(chart, entries, ["rent"], "entry")
+    assert s.to_dict() == {"period": ["1", "2"], "rent": [10, 15]}
+
+
+@pytest.mark.unit
+def test_balance_series_raises_on_unknown_account(chart, entries):
+    with pytest.raises(AbacusError):
+        balance_series(chart, entries, ["bank"])
@@ -1,3 +1,4 @@
+import json
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -11,6 +12,12 @@ from abacus.typer_cli.app import app
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def signing_key(tmp_path, monkeypatch):
+    """Keep cache signing key out of user home directory."""
+    monkeypatch.setenv("ABACUS_KEY_FILE", str(tmp_path / "key"))
+
+
 @pytest.mark.cli
 @pytest.mark.parametrize(
     "word", ["assert", "chart", "init", "ledger", "report", "show", "unlink"]
@@ -188,3 +195,232 @@ def test_ledger_create_and_delete_files():
         result = runner.invoke(app, ["ledger", "unlink", "--yes"])
         assert result.exit_code == 0
         assert not b.exists()
+
+
+@pytest.mark.cli
+def test_chart_import_and_export():
+    with runner.isolated_filesystem() as f:
+        Path(f, "accounts.csv").write_text(
+            "name,type,contra_of,title\ncash,asset,,\nsales,income,,\nrefunds,,sales,\n"
+        )
+        runner.invoke(app, ["chart", "init"])
+        result = runner.invoke(app, ["chart", "import", "accounts.csv"])
+        assert result.exit_code == 0
+        result = runner.invoke(app, ["chart", "export", "accounts.json"])
+        assert result.exit_code == 0
+        assert "refunds" in Path(f, "accounts.json").read_text()
+        result = runner.invoke(app, ["chart", "import", "accounts.csv"])
+        assert result.exit_code == 1
+        assert "duplicate account name cash" in result.stdout
+
+
+@pytest.mark.cli
+def test_post_with_decimal_amounts():
+    with runner.isolated_filesystem():
+        for line in [
+            "init",
+            "chart set --precision 2",
+            "ledger post asset:cash capital:equity 10.50",
+            "ledger post cash equity 0.25",
+            "assert cash 10.75",
+        ]:
+            result = runner.invoke(app, split(line))
+            assert result.exit_code == 0
+        result = runner.invoke(app, split("report -t"))
+        assert "10.75" in result.stdout
+        result = runner.invoke(app, split("report -b --json"))
+        assert json.loads(result.stdout)["assets"] == {"cash": 10.75}
+        result = runner.invoke(app, split("report -t --format csv"))
+        assert "cash,10.75,0.00" in result.stdout
+
+
+@pytest.mark.cli
+def test_report_is_cached_until_next_post():
+    with runner.isolated_filesystem():
+        for line in ["init", "ledger post asset:cash capital:equity 10", "report -b"]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        assert not Path(".entries.linejson.reports").exists()
+        assert runner.invoke(app, split("report -b --cache")).exit_code == 0
+        assert Path(".entries.linejson.reports").exists()
+        runner.invoke(app, split("ledger post cash equity 5"))
+        result = runner.invoke(app, split("report -b --json --cache"))
+        assert json.loads(result.stdout)["assets"] == {"cash": 15}
+
+
+@pytest.mark.cli
+def test_show_balances_by_dimension():
+    with runner.isolated_filesystem():
+        for line in [
+            "init",
+            "ledger post asset:cash capital:equity 10 --dim cost_centre=shop",
+            "ledger post cash equity 5 --dim cost_centre=web",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("show balances --by cost_centre --nonzero"))
+        assert '"cost_centre=web": {"cash": 5, "equity": 5}' in result.stdout
+
+
+@pytest.mark.cli
+def test_ledger_ingest():
+    with runner.isolated_filesystem():
+        Path("bank.csv").write_text("debit,credit,amount\ncash,equity,10\n")
+        Path("pos.csv").write_text("debit,credit,amount\ncash,equity,5\n")
+        for line in ["init", "chart add asset:cash capital:equity"]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("ledger ingest bank.csv pos.csv"))
+        assert "Posted 2 of 2 entries" in result.stdout
+        result = runner.invoke(app, split("assert cash 15"))
+        assert result.exit_code == 0
+
+
+@pytest.mark.cli
+def test_post_validates_accounts_before_writing():
+    with runner.isolated_filesystem():
+        assert runner.invoke(app, split("init")).exit_code == 0
+        result = runner.invoke(app, split("ledger post cash equity 10"))
+        assert result.exit_code == 1
+        assert Path("entries.linejson").read_text() == ""
+
+
+@pytest.mark.cli
+def test_post_entries_are_atomic():
+    from click.testing import CliRunner as ClickRunner
+
+    from abacus.typer_cli.app import combined_typer_click_app as bx
+
+    click_runner = ClickRunner()
+    with click_runner.isolated_filesystem():
+        for line in ["init", "chart add asset:cash capital:equity"]:
+            assert click_runner.invoke(bx, split(line)).exit_code == 0
+        line = "post --entry cash equity 10 --entry cash nope 5"
+        result = click_runner.invoke(bx, split(line))
+        assert result.exit_code == 1
+        assert "Entry 2: Account nope not in chart." in str(result.exception)
+        assert Path("entries.linejson").read_text() == ""
+        line = "post --entry cash equity 10 --entry cash equity 5"
+        assert click_runner.invoke(bx, split(line)).exit_code == 0
+        assert len(Path("entries.linejson").read_text().splitlines()) == 2
+
+
+@pytest.mark.cli
+def test_report_needs_statement_flag():
+    with runner.isolated_filesystem():
+        for line in ["init", "ledger post asset:cash capital:equity 10"]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("report"))
+        assert result.exit_code == 1
+        assert "No reports selected" in str(result.exception)
+        result = runner.invoke(app, split("report --all --json"))
+        assert "Choose one statement" in str(result.exception)
+
+
+@pytest.mark.cli
+def test_report_budget():
+    with runner.isolated_filesystem():
+        Path("budget.json").write_text('{"2024-01": {"sales": 10}}')
+        for line in [
+            "init",
+            "chart add asset:cash capital:equity income:sales",
+            "ledger post cash sales 12 --date 2024-01-05",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("report --budget budget.json --json"))
+        assert json.loads(result.stdout)[0]["variance"] == 2
+        result = runner.invoke(app, split("report --budget missing.json"))
+        assert result.exit_code == 1
+        assert "Cannot read budget file missing.json" in str(result.exception)
+
+
+@pytest.mark.cli
+def test_ledger_reconcile():
+    with runner.isolated_filesystem():
+        Path("bank.csv").write_text("date,amount\n2024-01-02,10\n2024-01-03,-1\n")
+        for line in [
+            "init",
+            "chart add asset:cash capital:equity expense:suspense",
+            "ledger post cash equity 10 --date 2024-01-01",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("ledger reconcile bank.csv --post"))
+        assert "Matched 1 of 2 bank lines." in result.stdout
+        assert runner.invoke(app, split("assert cash 9")).exit_code == 0
+
+
+@pytest.mark.cli
+def test_report_aging():
+    with runner.isolated_filesystem():
+        for line in [
+            "init",
+            "chart add asset:cash asset:ar income:sales",
+            "ledger post ar sales 10 --date 2024-01-05 --dim customer=acme",
+            "ledger post cash ar 4 --date 2024-02-01 --dim customer=acme",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(
+            app, split("report --aging ar --by customer --as-of 2024-03-01 --json")
+        )
+        assert not Path(".entries.linejson.reports").exists()
+        assert json.loads(result.stdout) == [
+            {
+                "counterparty": "acme",
+                "current": 0,
+                "1-30": 0,
+                "31-60": 6,
+                "61-90": 0,
+                "90+": 0,
+                "total": 6,
+            }
+        ]
+
+
+@pytest.mark.cli
+def test_show_balances_round_trip_with_ledger_load():
+    with runner.isolated_filesystem():
+        for line in [
+            "init",
+            "chart set --precision 2",
+            "ledger post asset:cash capital:equity 10.50",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("show balances --nonzero"))
+        Path("balances.json").write_text(result.stdout)
+        for line in ["ledger unlink --yes", "ledger init", "ledger load balances.json"]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        assert runner.invoke(app, split("assert cash 10.50")).exit_code == 0
+
+
+@pytest.mark.cli
+def test_chart_set_precision_is_checked():
+    with runner.isolated_filesystem():
+        assert runner.invoke(app, split("init")).exit_code == 0
+        assert runner.invoke(app, split("chart set --precision -1")).exit_code == 1
+        for line in ["chart set --precision 2", "ledger post asset:cash capital:eq 1"]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("chart set --precision 0"))
+        assert result.exit_code == 1
+        assert "Cannot change precision" in result.stdout
+        assert runner.invoke(app, split("assert cash 1.00")).exit_code == 0
+
+
+@pytest.mark.cli
+def test_post_nan_amount():
+    with runner.isolated_filesystem():
+        assert runner.invoke(app, split("init")).exit_code == 0
+        result = runner.invoke(app, split("ledger post asset:cash capital:eq nan"))
+        assert result.exit_code == 1
+        assert "Invalid amount: nan" in result.stdout
+
+
+@pytest.mark.cli
+def test_report_year_options():
+    with runner.isolated_filesystem():
+        for line in [
+            "init",
+            "ledger post asset:cash capital:equity 10 --date 2024-01-05",
+        ]:
+            assert runner.invoke(app, split(line)).exit_code == 0
+        result = runner.invoke(app, split("report --year 2024 -b"))
+        assert result.exit_code == 0
+        assert "Jan" in result.stdout
+        assert runner.invoke(app, split("report --year 2024 --json")).exit_code == 1
+        assert runner.invoke(app, split("report --year 2024 -t")).exit_code == 1
@@ -2,7 +2,23 @@ import pytest
 
 import abacus.core as core
 from abacus.core import AbacusError, Account, T
-from abacus.user_chart import Composer, Label, Offset, extract, make_user_chart
+from abacus.user_chart import (
+    CompiledChart,
+    Composer,
+    Label,
+    Offset,
+    UserChart,
+    extract,
+    make_user_chart,
+    read_rows,
+    write_rows,
+)
+
+
+@pytest.fixture(autouse=True)
+def signing_key(tmp_path, monkeypatch):
+    """Keep cache signing key out of user home directory."""
+    monkeypatch.setenv("ABACUS_KEY_FILE", str(tmp_path / "key"))
 
 
 def test_extract_label():
@@ -82,3 +98,90 @@ def test_capital_property(chart1):
 def test_no_account_for_offset_raises():
     with pytest.raises(AbacusError):
         make_user_chart("isa", "re", "null").use("contra:equity:ts")
+
+
+@pytest.fixture
+def chart_rows():
+    return [
+        dict(name="cash", type="asset"),
+        dict(name="refunds", contra_of="sales", title="Sales refunds"),
+        dict(name="sales", type="income"),
+        dict(name="equity", type="capital", title="Shareholder equity"),
+    ]
+
+
+@pytest.mark.unit
+def test_user_chart_from_rows(chart_rows):
+    uc = UserChart.from_rows(chart_rows)
+    assert uc.chart().income == [Account("sales", contra_accounts=["refunds"])]
+    assert uc.rename_dict == dict(refunds="Sales refunds", equity="Shareholder equity")
+
+
+@pytest.mark.unit
+def test_user_chart_from_rows_collects_all_errors():
+    rows = [
+        dict(name="cash", type="asset"),
+        dict(name="cash", type="asset"),
+        dict(name="ar", type="assets"),
+        dict(name="ts", contra_of="equity"),
+    ]
+    with pytest.raises(AbacusError) as e:
+        UserChart.from_rows(rows)
+    assert len(e.value.args[0]) == 3
+
+
+@pytest.mark.parametrize("filename", ["chart.csv", "chart.json"])
+@pytest.mark.unit
+def test_chart_rows_roundtrip(tmp_path, chart_rows, filename):
+    uc = UserChart.from_rows(chart_rows).name("retained_earnings", "Profit")
+    path = tmp_path / filename
+    write_rows(uc.to_rows(), path)
+    assert UserChart.from_rows(read_rows(path)) == uc
+
+
+@pytest.mark.parametrize(
+    "filename,content",
+    [
+        ("chart.txt", "name,type\ncash,asset\n"),
+        ("chart.csv", "account,type\ncash,asset\n"),
+        ("chart.json", '["cash"]'),
+        ("chart.json", '{"name": "cash"}'),
+        ("chart.json", "[{"),
+    ],
+)
+@pytest.mark.unit
+def test_read_rows_raises_abacus_error(tmp_path, filename, content):
+    path = tmp_path / filename
+    path.write_text(content)
+    with pytest.raises(AbacusError):
+        read_rows(path)
+    with pytest.raises(AbacusError):
+        read_rows(tmp_path / "missing.csv")
+
+
+@pytest.mark.unit
+def test_title_for_unknown_account_raises():
+    with pytest.raises(AbacusError):
+        UserChart.from_rows([dict(name="cash", title="Cash")])
+
+
+@pytest.mark.unit
+def test_compiled_chart_is_cached_and_invalidated(tmp_path):
+    path = tmp_path / "chart.json"
+    make_user_chart("asset:cash", "capital:equity").set_path(path).save()
+    compiled = CompiledChart.load(path)
+    assert CompiledChart.cache_path(path).exists()
+    assert compiled.ledger() == compiled.chart.ledger()
+    assert CompiledChart.load(path).digest == compiled.digest
+    UserChart.load(path).use("income:sales").save()
+    assert "sales" in CompiledChart.load(path).index
+
+
+@pytest.mark.unit
+def test_compiled_chart_cache_signed_by_other_key_is_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "chart.json"
+    make_user_chart("asset:cash", "capital:equity").set_path(path).save()
+    CompiledChart.load(path)
+    assert CompiledChart.read(path) is not None
+    monkeypatch.setenv("ABACUS_KEY_FILE", str(tmp_path / "other_key"))
+    assert CompiledChart.read(path) is None
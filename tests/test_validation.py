@@ -0,0 +1,47 @@
+import pytest
+
+from abacus.core import AbacusError, Chart, CompoundEntry, Entry
+from abacus.validation import Problem, Validator
+
+
+@pytest.fixture
+def validator():
+    return Validator.from_chart(Chart(assets=["cash"], capital=["equity"]))
+
+
+@pytest.mark.unit
+def test_validator_reports_all_problems(validator):
+    entries = [
+        Entry("cash", "equity", 10),
+        Entry("cash", "loan", 0),
+        Entry("bank", "equity", -5),
+    ]
+    assert [(p.index, p.message) for p in validator.problems(entries)] == [
+        (2, "Account loan not in chart."),
+        (2, "Amount must be positive, got 0."),
+        (3, "Account bank not in chart."),
+        (3, "Amount must be positive, got -5."),
+    ]
+
+
+@pytest.mark.unit
+def test_validator_compound_messages(validator):
+    assert validator.compound_messages([("cash", 10)], [("equity", 8)]) == [
+        "Debits (10) do not match credits (8)."
+    ]
+
+
+@pytest.mark.unit
+def test_validator_check_returns_double_entries(validator):
+    compound = CompoundEntry(debits=[("cash", 10)], credits=[("equity", 10)])
+    assert validator.check([compound]) == [
+        Entry("cash", "_null", 10),
+        Entry("_null", "equity", 10),
+    ]
+    with pytest.raises(AbacusError):
+        validator.check([Entry("cash", "loan", 1)])
+
+
+@pytest.mark.unit
+def test_problem_str():
+    assert str(Problem(1, None, "Oops.")) == "Entry 1: Oops."
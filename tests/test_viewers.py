@@ -1,8 +1,17 @@
+from io import StringIO
+
 import pytest
 
 from abacus.core import AccountBalances as AB
-from abacus.core import BalanceSheet, IncomeStatement
-from abacus.viewers import BalanceSheetViewer, IncomeStatementViewer, TrialBalanceViewer
+from abacus.core import AbacusError, BalanceSheet, IncomeStatement, Precision
+from abacus.viewers import (
+    BalanceSheetViewer,
+    ComparativeViewer,
+    IncomeStatementViewer,
+    Layout,
+    LayoutColumn,
+    TrialBalanceViewer,
+)
 
 
 @pytest.fixture
@@ -56,3 +65,66 @@ def test_trial_balance_viewer():
     assert "cash" in str(vtb)
     vtb.print()
     vtb.print(80)
+
+
+@pytest.mark.unit
+def test_trial_balance_viewer_with_precision():
+    vtb = TrialBalanceViewer(dict(cash=(1050, 0), equity=(0, 1050)))
+    assert "10.50" in str(vtb.use_precision(Precision(2)))
+
+
+@pytest.mark.unit
+def test_comparative_viewer():
+    i1 = IncomeStatement(income=AB(sales=40), expenses=AB(rent=25))
+    i2 = IncomeStatement(income=AB(sales=50), expenses=AB(rent=20))
+    viewer = ComparativeViewer({"2023": i1, "2024": i2})
+    assert "CURRENT PROFIT    15    30" in str(viewer)
+    viewer.print()
+
+
+@pytest.mark.unit
+def test_layout():
+    layout = Layout(
+        [
+            LayoutColumn(["cash ", "equity "], "<", fill=".", right="...", header="A"),
+            LayoutColumn(["5", "10"], ">", left="  ", header="Amount"),
+        ]
+    )
+    assert layout.width == 16
+    assert str(layout) == "    A     Amount\ncash .....     5\nequity ...    10"
+
+
+@pytest.mark.unit
+def test_trial_balance_viewer_writes_to_stream():
+    n = 100_000
+    vtb = TrialBalanceViewer({f"account_{i}": (i, 0) for i in range(n)})
+    stream = StringIO()
+    vtb.write(stream)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == n + 2
+    assert lines[-1] == "account_99999 ...   99999     0"
+    assert vtb.width == len(lines[-1])
+
+
+@pytest.mark.unit
+def test_trial_balance_viewer_pages():
+    vtb = TrialBalanceViewer({f"a{i}": (i, 0) for i in range(1200)})
+    pages = list(vtb.pages(page_size=500))
+    assert [p.row_count for p in pages] == [500, 500, 200]
+    assert pages[0].title == "Trial balance" and pages[1].title is None
+    assert [c.width for c in pages[0].columns] == [c.width for c in pages[2].columns]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_page_size_must_be_positive(page_size):
+    vtb = TrialBalanceViewer({"cash": (1, 0)})
+    with pytest.raises(AbacusError):
+        list(vtb.pages(page_size=page_size))
+
+
+@pytest.mark.callable
+def test_viewer_print_plain_and_paged(income_statement_viewer, capsys):
+    income_statement_viewer.print(plain=True)
+    assert capsys.readouterr().out == str(income_statement_viewer) + "\n"
+    income_statement_viewer.print(plain=False, page_size=2)